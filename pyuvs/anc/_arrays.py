@@ -1,5 +1,7 @@
 """The arrays module contains classes to read in external arrays.
 """
+import json
+import threading
 import numpy as np
 from pathlib import Path
 
@@ -13,10 +15,13 @@ class _AncillaryArray(np.ndarray):
         The ancillary array.
     path
         The absolute path to the ancillary array.
+    copy
+        Copy the array so it can be modified. Otherwise, the array is the
+        read-only view given by the registry of ancillary files.
 
     """
-    def __new__(cls, array, path):
-        obj = np.asarray(array).view(cls)
+    def __new__(cls, array, path, copy: bool = False):
+        obj = (np.array(array) if copy else np.asarray(array)).view(cls)
         obj.path = path
         return obj
 
@@ -26,13 +31,106 @@ class _AncillaryArray(np.ndarray):
         self.path = getattr(obj, 'path', None)
 
 
+class _AncillaryRegistry:
+    """Hold every ancillary file loaded by this process.
+
+    Each file is only read once per process. Later requests for the same file
+    get read-only views of the arrays that were already read, so the
+    ancillary classes can be made as often as is convenient.
+
+    """
+    def __init__(self) -> None:
+        self.__arrays = {}
+        self.__dicts = {}
+        self.__lock = threading.Lock()
+
+    def array(self, path: Path, mmap: bool = False) -> np.ndarray:
+        """Get the array stored in a plain .npy file.
+
+        Parameters
+        ----------
+        path
+            The absolute path of the file.
+        mmap
+            Memory-map the file instead of reading it. The operating system
+            then shares the file's pages between all the processes that map
+            it.
+
+        """
+        key = (str(path), mmap)
+        with self.__lock:
+            if key not in self.__arrays:
+                self.__arrays[key] = _read_only(
+                    np.load(str(path), mmap_mode='r' if mmap else None))
+            return self.__arrays[key].view()
+
+    def dict(self, path: Path) -> dict:
+        """Get the dict stored as a directory of plain arrays.
+
+        The directory holds one .npy file per key and a manifest of them (see
+        :mod:`pyuvs.anc.conversion`). The arrays are memory-mapped, so they
+        are neither unpickled nor copied.
+
+        Parameters
+        ----------
+        path
+            The absolute path of the directory.
+
+        """
+        key = str(path)
+        with self.__lock:
+            if key not in self.__dicts:
+                contents = _load_converted_dict(Path(path))
+                self.__dicts[key] = {k: _read_only(v) if
+                                     isinstance(v, np.ndarray) else v
+                                     for k, v in contents.items()}
+            return {k: v.view() if isinstance(v, np.ndarray) else v
+                    for k, v in self.__dicts[key].items()}
+
+    def clear(self) -> None:
+        """Forget every file that was loaded.
+
+        """
+        with self.__lock:
+            self.__arrays.clear()
+            self.__dicts.clear()
+
+
+_manifest_name = 'manifest.json'
+
+
+def _load_converted_dict(directory: Path) -> dict:
+    # The manifest maps each key of the original dict to the .npy file that
+    # holds its value. Scalars are stored as 0-d arrays.
+    with open(directory / _manifest_name) as file:
+        manifest = json.load(file)
+    contents = {}
+    for key, entry in manifest['arrays'].items():
+        array = np.asarray(np.load(str(directory / entry['file']),
+                                   mmap_mode='r'))
+        contents[key] = array[()] if entry['scalar'] else array
+    return contents
+
+
+def _read_only(array: np.ndarray) -> np.ndarray:
+    array.flags.writeable = False
+    return array
+
+
+_registry = _AncillaryRegistry()
+
+
 class _AncillaryFileLoader:
     """Create the path of an ancillary file from a filename.
 
+    Files are loaded through the process-wide registry of ancillary files, so
+    each file is only read once and the arrays it gives are read-only.
+
     Attributes
     ----------
     filename
-        The filename of a file to load in.
+        The filename of a file to load in. Plain arrays are .npy files and
+        dicts of arrays are directories.
 
     """
     def __init__(self, filename: str) -> None:
@@ -42,11 +140,11 @@ class _AncillaryFileLoader:
     def __make_file_path(filename: str) -> Path:
         return Path.joinpath(Path(__file__).parents[0], 'files', filename)
 
-    def load_array(self) -> np.ndarray:
-        return np.load(str(self.__file_path))
+    def load_array(self, mmap: bool = False) -> np.ndarray:
+        return _registry.array(self.__file_path, mmap)
 
     def load_dict(self) -> dict:
-        return np.load(str(self.__file_path), allow_pickle=True).item()
+        return _registry.dict(self.__file_path)
 
     @property
     def path(self) -> Path:
@@ -0,0 +1,73 @@
+"""The conversion module converts pickled ancillary files to plain arrays.
+
+Ancillary files that hold several arrays used to be pickled dicts saved as
+.npy files, which can only be loaded by unpickling all of them. This module
+stores each value of such a dict in its own plain .npy file, next to a
+manifest that records which file holds which key. The converted files are put
+in a directory named after the pickled file (:code:`muv_templates.npy` is
+converted to :code:`muv_templates/`), which is what
+:class:`~pyuvs.anc._arrays._AncillaryFileLoader` loads. Only the converted
+directories are kept in the ancillary file directory.
+
+Run this module with the paths of pickled files to convert them.
+
+"""
+import json
+import sys
+from pathlib import Path
+import numpy as np
+from pyuvs.anc._arrays import _manifest_name
+
+
+def convert_pickled_file(path: str, directory: str = None) -> Path:
+    """Convert a pickled dict of arrays to one plain .npy file per key.
+
+    Parameters
+    ----------
+    path
+        The absolute path of the pickled .npy file.
+    directory
+        The absolute path of the directory to put the converted files in. If
+        None, they go in a directory named after the file, next to it.
+
+    Returns
+    -------
+    Path
+        The directory holding the converted files.
+
+    Raises
+    ------
+    ValueError
+        Raised if the file does not hold a dict, or if a value in it cannot be
+        stored as a plain array.
+
+    """
+    contents = np.load(path, allow_pickle=True)
+    if contents.dtype != object or not isinstance(contents.item(), dict):
+        message = f'{path} does not hold a pickled dict.'
+        raise ValueError(message)
+    contents = contents.item()
+
+    directory = Path(path).with_suffix('') if directory is None else \
+        Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    manifest = {'source': Path(path).name, 'arrays': {}}
+    for key, value in contents.items():
+        array = np.asarray(value)
+        if array.dtype == object:
+            message = f'The value of {key} in {path} cannot be stored ' \
+                      f'without pickling it.'
+            raise ValueError(message)
+        filename = f'{key}.npy'
+        np.save(str(directory / filename), array, allow_pickle=False)
+        manifest['arrays'][key] = {'file': filename,
+                                   'scalar': not isinstance(value, np.ndarray)}
+    # Write the manifest last so a partial conversion is never used
+    with open(directory / _manifest_name, 'w') as file:
+        json.dump(manifest, file, indent=2)
+    return directory
+
+
+if __name__ == '__main__':
+    for pickled_file in sys.argv[1:]:
+        print(f'Converted {convert_pickled_file(pickled_file)}')
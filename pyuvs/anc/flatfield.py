@@ -9,6 +9,12 @@ class Flatfield(_AncillaryArray):
     This class will read in the standard MUV flatfield used with IUVS data.
     It otherwise acts like a numpy.ndarray.
 
+    Parameters
+    ----------
+    copy
+        Return a writable copy of the array. By default, every instance in
+        this process shares one read-only array.
+
     Notes
     -----
     This file is only designed to be used with level 1B data. To calibrate the
@@ -16,10 +22,10 @@ class Flatfield(_AncillaryArray):
     flatfield are stored in :class:`FlatfieldWavelengths`.
 
     """
-    def __new__(cls):
-        anc = _AncillaryFileLoader('mvn_iuv_flatfield.npy')
+    def __new__(cls, copy: bool = False):
+        anc = _AncillaryFileLoader('mvn_iuv_flatfield')
         array = anc.load_dict()['flatfield']
-        return super().__new__(cls, array, anc.path)
+        return super().__new__(cls, array, anc.path, copy)
 
 
 class FlatfieldWavelengths(_AncillaryArray):
@@ -28,8 +34,14 @@ class FlatfieldWavelengths(_AncillaryArray):
     This class will read in the wavelengths used when creating the standard MUV
     flatfield. It otherwise acts like a numpy.ndarray.
 
+    Parameters
+    ----------
+    copy
+        Return a writable copy of the array. By default, every instance in
+        this process shares one read-only array.
+
     """
-    def __new__(cls):
-        anc = _AncillaryFileLoader('mvn_iuv_flatfield.npy')
+    def __new__(cls, copy: bool = False):
+        anc = _AncillaryFileLoader('mvn_iuv_flatfield')
         array = anc.load_dict()['wavelengths']
-        return super().__new__(cls, array, anc.path)
+        return super().__new__(cls, array, anc.path, copy)
@@ -9,11 +9,20 @@ class SurfaceGeographyMap(_AncillaryArray):
     This class will read in the standard geographic map used with IUVS data.
     It otherwise acts like a numpy.ndarray.
 
+    Parameters
+    ----------
+    mmap
+        Memory-map the map instead of reading it into memory. Processes that
+        map it share a single copy.
+    copy
+        Return a writable copy of the array. By default, every instance in
+        this process shares one read-only array.
+
     """
-    def __new__(cls):
+    def __new__(cls, mmap: bool = False, copy: bool = False):
         anc = _AncillaryFileLoader('mars_surface_map.npy')
-        array = anc.load_array()
-        return super().__new__(cls, array, anc.path)
+        array = anc.load_array(mmap)
+        return super().__new__(cls, array, anc.path, copy)
 
 
 class ClosedMagneticFieldMap(_AncillaryArray):
@@ -22,11 +31,20 @@ class ClosedMagneticFieldMap(_AncillaryArray):
     This class will read in the standard closed magnetic field map used with
     IUVS data. It otherwise acts like a numpy.ndarray.
 
+    Parameters
+    ----------
+    mmap
+        Memory-map the map instead of reading it into memory. Processes that
+        map it share a single copy.
+    copy
+        Return a writable copy of the array. By default, every instance in
+        this process shares one read-only array.
+
     """
-    def __new__(cls):
+    def __new__(cls, mmap: bool = False, copy: bool = False):
         anc = _AncillaryFileLoader('magnetic_field_closed_probability.npy')
-        array = anc.load_array()
-        return super().__new__(cls, array, anc.path)
+        array = anc.load_array(mmap)
+        return super().__new__(cls, array, anc.path, copy)
 
 
 class OpenMagneticFieldMap(_AncillaryArray):
@@ -35,8 +53,17 @@ class OpenMagneticFieldMap(_AncillaryArray):
     This class will read in the standard open magnetic field map used with
     IUVS data. It otherwise acts like a numpy.ndarray.
 
+    Parameters
+    ----------
+    mmap
+        Memory-map the map instead of reading it into memory. Processes that
+        map it share a single copy.
+    copy
+        Return a writable copy of the array. By default, every instance in
+        this process shares one read-only array.
+
     """
-    def __new__(cls):
+    def __new__(cls, mmap: bool = False, copy: bool = False):
         anc = _AncillaryFileLoader('magnetic_field_open_probability.npy')
-        array = anc.load_array()
-        return super().__new__(cls, array, anc.path)
+        array = anc.load_array(mmap)
+        return super().__new__(cls, array, anc.path, copy)
@@ -11,16 +11,22 @@ class FUVCurve(_AncillaryArray):
     This class will read in the standard FUV sensitivity curve. It otherwise
     acts like a numpy.ndarray.
 
+    Parameters
+    ----------
+    copy
+        Return a writable copy of the array. By default, every instance in
+        this process shares one read-only array.
+
     Notes
     -----
     The wavelengths associated with this curve are stored in
     :class:`FUVWavelengths`. This curve was created on 2014-06-09.
 
     """
-    def __new__(cls):
-        anc = _AncillaryFileLoader('mvn_iuv_sensitivity-fuv.npy')
+    def __new__(cls, copy: bool = False):
+        anc = _AncillaryFileLoader('mvn_iuv_sensitivity-fuv')
         array = anc.load_dict()['sensitivity']
-        return super().__new__(cls, array, anc.path)
+        return super().__new__(cls, array, anc.path, copy)
 
 
 class FUVWavelengths(_AncillaryArray):
@@ -29,11 +35,17 @@ class FUVWavelengths(_AncillaryArray):
     This class will read in the standard FUV sensitivity curve wavelengths.
     It otherwise acts like a numpy.ndarray.
 
+    Parameters
+    ----------
+    copy
+        Return a writable copy of the array. By default, every instance in
+        this process shares one read-only array.
+
     """
-    def __new__(cls):
-        anc = _AncillaryFileLoader('mvn_iuv_sensitivity-fuv.npy')
+    def __new__(cls, copy: bool = False):
+        anc = _AncillaryFileLoader('mvn_iuv_sensitivity-fuv')
         array = anc.load_dict()['wavelength']
-        return super().__new__(cls, array, anc.path)
+        return super().__new__(cls, array, anc.path, copy)
 
 
 class MUVCurve(_AncillaryArray):
@@ -42,16 +54,22 @@ class MUVCurve(_AncillaryArray):
     This class will read in the standard MUV sensitivity curve. It otherwise
     acts like a numpy.ndarray.
 
+    Parameters
+    ----------
+    copy
+        Return a writable copy of the array. By default, every instance in
+        this process shares one read-only array.
+
     Notes
     -----
     The wavelengths associated with this curve are stored in
     :class:`MUVWavelengths`. This curve was created on 2018-10-19.
 
     """
-    def __new__(cls):
-        anc = _AncillaryFileLoader('mvn_iuv_sensitivity-muv.npy')
+    def __new__(cls, copy: bool = False):
+        anc = _AncillaryFileLoader('mvn_iuv_sensitivity-muv')
         array = anc.load_dict()['sensitivity']
-        return super().__new__(cls, array, anc.path)
+        return super().__new__(cls, array, anc.path, copy)
 
 
 class MUVWavelengths(_AncillaryArray):
@@ -60,11 +78,17 @@ class MUVWavelengths(_AncillaryArray):
     This class will read in the standard MUV sensitivity curve wavelengths.
     It otherwise acts like a numpy.ndarray.
 
+    Parameters
+    ----------
+    copy
+        Return a writable copy of the array. By default, every instance in
+        this process shares one read-only array.
+
     """
-    def __new__(cls):
-        anc = _AncillaryFileLoader('mvn_iuv_sensitivity-muv.npy')
+    def __new__(cls, copy: bool = False):
+        anc = _AncillaryFileLoader('mvn_iuv_sensitivity-muv')
         array = anc.load_dict()['wavelength']
-        return super().__new__(cls, array, anc.path)
+        return super().__new__(cls, array, anc.path, copy)
 
 
 class PipelineMUVCurve(_AncillaryArray):
@@ -76,6 +100,12 @@ class PipelineMUVCurve(_AncillaryArray):
     calibration) but is included for legacy purposes. It otherwise acts like a
     numpy.ndarray.
 
+    Parameters
+    ----------
+    copy
+        Return a writable copy of the array. By default, every instance in
+        this process shares one read-only array.
+
     Warnings
     --------
     UserWarning
@@ -88,11 +118,11 @@ class PipelineMUVCurve(_AncillaryArray):
     :class:`PipelineMUVWavelengths`. This curve was created on 2014-06-09.
 
     """
-    def __new__(cls):
+    def __new__(cls, copy: bool = False):
         cls.__warn_this_is_deprecated()
-        anc = _AncillaryFileLoader('mvn_iuv_sensitivity-muv-pipeline.npy')
+        anc = _AncillaryFileLoader('mvn_iuv_sensitivity-muv-pipeline')
         array = anc.load_dict()['sensitivity']
-        return super().__new__(cls, array, anc.path)
+        return super().__new__(cls, array, anc.path, copy)
 
     @staticmethod
     def __warn_this_is_deprecated():
@@ -108,6 +138,12 @@ class PipelineMUVWavelengths(_AncillaryArray):
     This class will read in the pipeline MUV sensitivity curve wavelengths.
     It otherwise acts like a numpy.ndarray.
 
+    Parameters
+    ----------
+    copy
+        Return a writable copy of the array. By default, every instance in
+        this process shares one read-only array.
+
     Warnings
     --------
     UserWarning
@@ -115,11 +151,11 @@ class PipelineMUVWavelengths(_AncillaryArray):
         the improved calibration.
 
     """
-    def __new__(cls):
+    def __new__(cls, copy: bool = False):
         cls.__warn_this_is_deprecated()
-        anc = _AncillaryFileLoader('mvn_iuv_sensitivity-muv-pipeline.npy')
+        anc = _AncillaryFileLoader('mvn_iuv_sensitivity-muv-pipeline')
         array = anc.load_dict()['wavelength']
-        return super().__new__(cls, array, anc.path)
+        return super().__new__(cls, array, anc.path, copy)
 
     @staticmethod
     def __warn_this_is_deprecated():
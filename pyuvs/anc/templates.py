@@ -9,16 +9,22 @@ class CO2PlusFDB(_AncillaryArray):
     This class will read in the template. It otherwise acts like a
     numpy.ndarray.
 
+    Parameters
+    ----------
+    copy
+        Return a writable copy of the array. By default, every instance in
+        this process shares one read-only array.
+
     Notes
     -----
     The wavelengths where this template is defined can be found in
     :class:`MUVWavelengthCenters`.
 
     """
-    def __new__(cls):
-        anc = _AncillaryFileLoader('muv_templates.npy')
+    def __new__(cls, copy: bool = False):
+        anc = _AncillaryFileLoader('muv_templates')
         array = anc.load_dict()['co2p_fdb']
-        return super().__new__(cls, array, anc.path)
+        return super().__new__(cls, array, anc.path, copy)
 
 
 class CO2PlusUltravioletDoublet(_AncillaryArray):
@@ -27,16 +33,22 @@ class CO2PlusUltravioletDoublet(_AncillaryArray):
     This class will read in the template. It otherwise acts like a
     numpy.ndarray.
 
+    Parameters
+    ----------
+    copy
+        Return a writable copy of the array. By default, every instance in
+        this process shares one read-only array.
+
     Notes
     -----
     The wavelengths where this template is defined can be found in
     :class:`MUVWavelengthCenters`.
 
     """
-    def __new__(cls):
-        anc = _AncillaryFileLoader('muv_templates.npy')
+    def __new__(cls, copy: bool = False):
+        anc = _AncillaryFileLoader('muv_templates')
         array = anc.load_dict()['co2p_uvd']
-        return super().__new__(cls, array, anc.path)
+        return super().__new__(cls, array, anc.path, copy)
 
 
 class COCameronBands(_AncillaryArray):
@@ -45,16 +57,22 @@ class COCameronBands(_AncillaryArray):
     This class will read in the template. It otherwise acts like a
     numpy.ndarray.
 
+    Parameters
+    ----------
+    copy
+        Return a writable copy of the array. By default, every instance in
+        this process shares one read-only array.
+
     Notes
     -----
     The wavelengths where this template is defined can be found in
     :class:`MUVWavelengthCenters`.
 
     """
-    def __new__(cls):
-        anc = _AncillaryFileLoader('muv_templates.npy')
+    def __new__(cls, copy: bool = False):
+        anc = _AncillaryFileLoader('muv_templates')
         array = anc.load_dict()['co_cameron_bands']
-        return super().__new__(cls, array, anc.path)
+        return super().__new__(cls, array, anc.path, copy)
 
 
 class COPlus1NG(_AncillaryArray):
@@ -63,16 +81,22 @@ class COPlus1NG(_AncillaryArray):
     This class will read in the template. It otherwise acts like a
     numpy.ndarray.
 
+    Parameters
+    ----------
+    copy
+        Return a writable copy of the array. By default, every instance in
+        this process shares one read-only array.
+
     Notes
     -----
     The wavelengths where this template is defined can be found in
     :class:`MUVWavelengthCenters`.
 
     """
-    def __new__(cls):
-        anc = _AncillaryFileLoader('muv_templates.npy')
+    def __new__(cls, copy: bool = False):
+        anc = _AncillaryFileLoader('muv_templates')
         array = anc.load_dict()['cop_1ng']
-        return super().__new__(cls, array, anc.path)
+        return super().__new__(cls, array, anc.path, copy)
 
 
 class N2VergardKaplan(_AncillaryArray):
@@ -81,16 +105,22 @@ class N2VergardKaplan(_AncillaryArray):
     This class will read in the template. It otherwise acts like a
     numpy.ndarray.
 
+    Parameters
+    ----------
+    copy
+        Return a writable copy of the array. By default, every instance in
+        this process shares one read-only array.
+
     Notes
     -----
     The wavelengths where this template is defined can be found in
     :class:`MUVWavelengthCenters`.
 
     """
-    def __new__(cls):
-        anc = _AncillaryFileLoader('muv_templates.npy')
+    def __new__(cls, copy: bool = False):
+        anc = _AncillaryFileLoader('muv_templates')
         array = anc.load_dict()['n2_vk']
-        return super().__new__(cls, array, anc.path)
+        return super().__new__(cls, array, anc.path, copy)
 
 
 class NitricOxideNightglow(_AncillaryArray):
@@ -99,16 +129,46 @@ class NitricOxideNightglow(_AncillaryArray):
     This class will read in the template. It otherwise acts like a
     numpy.ndarray.
 
+    Parameters
+    ----------
+    copy
+        Return a writable copy of the array. By default, every instance in
+        this process shares one read-only array.
+
     Notes
     -----
     The wavelengths where this template is defined can be found in
     :class:`MUVWavelengthCenters`.
 
     """
-    def __new__(cls):
-        anc = _AncillaryFileLoader('muv_templates.npy')
+    def __new__(cls, copy: bool = False):
+        anc = _AncillaryFileLoader('muv_templates')
         array = anc.load_dict()['no_nightglow']
-        return super().__new__(cls, array, anc.path)
+        return super().__new__(cls, array, anc.path, copy)
+
+
+class Oxygen2972(_AncillaryArray):
+    """Create the oxygen 297.2 nm emission template.
+
+    This class will read in the template. It otherwise acts like a
+    numpy.ndarray.
+
+    Parameters
+    ----------
+    copy
+        Return a writable copy of the array. By default, every instance in
+        this process shares one read-only array.
+
+    Notes
+    -----
+    The wavelengths where this template is defined can be found in
+    :class:`MUVWavelengthCenters`.
+
+    """
+    def __new__(cls, copy: bool = False):
+        anc = _AncillaryFileLoader('muv_templates')
+        array = anc.load_dict()['o2972']
+        return super().__new__(cls, array, anc.path, copy)
 
 
 class SolarContinuum(_AncillaryArray):
@@ -117,16 +177,22 @@ class SolarContinuum(_AncillaryArray):
     This class will read in the template. It otherwise acts like a
     numpy.ndarray.
 
+    Parameters
+    ----------
+    copy
+        Return a writable copy of the array. By default, every instance in
+        this process shares one read-only array.
+
     Notes
     -----
     The wavelengths where this template is defined can be found in
     :class:`MUVWavelengthCenters`.
 
     """
-    def __new__(cls):
-        anc = _AncillaryFileLoader('muv_templates.npy')
+    def __new__(cls, copy: bool = False):
+        anc = _AncillaryFileLoader('muv_templates')
         array = anc.load_dict()['solar_continuum']
-        return super().__new__(cls, array, anc.path)
+        return super().__new__(cls, array, anc.path, copy)
 
 
 class MUVWavelengthCenters(_AncillaryArray):
@@ -135,11 +201,17 @@ class MUVWavelengthCenters(_AncillaryArray):
     This class reads in the center wavelengths. It otherwise acts like a
     numpy.ndarray.
 
+    Parameters
+    ----------
+    copy
+        Return a writable copy of the array. By default, every instance in
+        this process shares one read-only array.
+
     """
-    def __new__(cls):
-        anc = _AncillaryFileLoader('muv_wavelengths.npy')
+    def __new__(cls, copy: bool = False):
+        anc = _AncillaryFileLoader('muv_wavelengths')
         array = anc.load_dict()['wavelength_centers']
-        return super().__new__(cls, array, anc.path)
+        return super().__new__(cls, array, anc.path, copy)
 
 
 class MUVWavelengthEdges(_AncillaryArray):
@@ -148,8 +220,14 @@ class MUVWavelengthEdges(_AncillaryArray):
     This class reads in the edge wavelengths. It otherwise acts like a
     numpy.ndarray.
 
+    Parameters
+    ----------
+    copy
+        Return a writable copy of the array. By default, every instance in
+        this process shares one read-only array.
+
     """
-    def __new__(cls):
-        anc = _AncillaryFileLoader('muv_wavelengths.npy')
+    def __new__(cls, copy: bool = False):
+        anc = _AncillaryFileLoader('muv_wavelengths')
         array = anc.load_dict()['wavelength_edges']
-        return super().__new__(cls, array, anc.path)
+        return super().__new__(cls, array, anc.path, copy)
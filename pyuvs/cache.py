@@ -0,0 +1,140 @@
+"""The cache module stores computed arrays on disk so they only need to be
+computed once.
+"""
+import hashlib
+import os
+from pathlib import Path
+import tempfile
+import numpy as np
+
+
+class ArrayCache:
+    """Store collections of arrays on disk, keyed by the values they were
+    computed from.
+
+    ArrayCache maps a key to a dict of arrays. Keys are content hashes of the
+    values used to compute the arrays (see :meth:`make_key`), so a change in
+    any of them simply misses the cache rather than returning stale results.
+
+    Parameters
+    ----------
+    directory
+        Absolute path of the directory where the cache lives. It is created if
+        it does not exist.
+    namespace
+        The name of the subdirectory holding this kind of cached product.
+
+    Raises
+    ------
+    TypeError
+        Raised if directory or namespace is not a str.
+
+    Notes
+    -----
+    Entries are written to a temporary file and then moved into place, so
+    several processes can safely share a cache.
+
+    """
+    def __init__(self, directory: str, namespace: str) -> None:
+        self.__raise_type_error_if_not_str(directory, 'directory')
+        self.__raise_type_error_if_not_str(namespace, 'namespace')
+        self.__path = Path(directory, namespace)
+        self.__path.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def __raise_type_error_if_not_str(value, name: str) -> None:
+        if not isinstance(value, str):
+            message = f'{name} must be a str.'
+            raise TypeError(message)
+
+    @staticmethod
+    def make_key(*parts) -> str:
+        """Make a key from the values a cached product was computed from.
+
+        Parameters
+        ----------
+        parts
+            Any mix of numpy.ndarrays and objects with a stable :code:`repr`
+            (str, int, float, bool, tuples of these...).
+
+        Examples
+        --------
+        >>> key = ArrayCache.make_key('mvn_iuv_l1b_foo', 16, np.arange(3))
+        >>> len(key)
+        64
+
+        """
+        digest = hashlib.sha256()
+        for part in parts:
+            if isinstance(part, np.ndarray):
+                part = np.ascontiguousarray(part)
+                digest.update(str((part.dtype.str, part.shape)).encode())
+                digest.update(part.tobytes())
+            else:
+                digest.update(repr(part).encode())
+            digest.update(b'\0')
+        return digest.hexdigest()
+
+    def __entry_path(self, key: str) -> Path:
+        return self.__path / key[:2] / f'{key}.npz'
+
+    def __contains__(self, key: str) -> bool:
+        return self.__entry_path(key).exists()
+
+    def load(self, key: str) -> dict:
+        """Load the arrays stored under a key.
+
+        Parameters
+        ----------
+        key
+            The key of the entry.
+
+        Returns
+        -------
+        dict
+            The stored arrays, or :code:`None` if there is no entry for the
+            key.
+
+        """
+        try:
+            with np.load(self.__entry_path(key)) as entry:
+                return {f: entry[f] for f in entry.files}
+        except (FileNotFoundError, OSError, ValueError):
+            return None
+
+    def save(self, key: str, arrays: dict) -> None:
+        """Store arrays under a key, replacing any existing entry.
+
+        Parameters
+        ----------
+        key
+            The key of the entry.
+        arrays
+            The arrays to store, keyed by name.
+
+        """
+        path = self.__entry_path(key)
+        path.parent.mkdir(exist_ok=True)
+        handle, temporary_path = tempfile.mkstemp(dir=path.parent,
+                                                  suffix='.tmp')
+        try:
+            with os.fdopen(handle, 'wb') as file:
+                np.savez(file, **arrays)
+            os.replace(temporary_path, path)
+        except BaseException:
+            os.remove(temporary_path)
+            raise
+
+    def clear(self) -> None:
+        """Remove every entry in the cache.
+
+        """
+        for entry in self.__path.glob('*/*.npz'):
+            entry.unlink()
+
+    @property
+    def path(self) -> str:
+        """Get the absolute path of the directory holding the entries.
+
+        """
+        return str(self.__path)
@@ -0,0 +1,115 @@
+"""The ephemeris module computes where MAVEN, Mars, and the Sun are at arrays
+of ephemeris times.
+"""
+from typing import NamedTuple
+import numpy as np
+import spiceypy as spice
+from pyuvs.geometry import ellipsoid_intercept
+
+
+class Ephemeris(NamedTuple):
+    """The positions of MAVEN and the Sun relative to Mars.
+
+    Each field has the shape of the ephemeris times it was computed at, except
+    for the spacecraft position, which has an extra trailing axis of length 3.
+    Latitudes are planetocentric and longitudes are east longitudes from -180
+    to 180. The angles are in degrees and the distances are in kilometers.
+
+    """
+    et: np.ndarray
+    spacecraft_position: np.ndarray
+    subspacecraft_latitude: np.ndarray
+    subspacecraft_longitude: np.ndarray
+    spacecraft_altitude: np.ndarray
+    solar_longitude: np.ndarray
+    subsolar_latitude: np.ndarray
+    subsolar_longitude: np.ndarray
+    mars_sun_distance: np.ndarray
+
+
+def ephemeris(et: np.ndarray) -> Ephemeris:
+    """Compute the positions of MAVEN and the Sun relative to Mars at some
+    ephemeris times.
+
+    Each unique time is only computed once, and SPICE is only used to get the
+    states of MAVEN and the Sun and the orientation of Mars. The sub-points
+    and solar longitude are computed from them with array math.
+
+    Parameters
+    ----------
+    et
+        The ephemeris times. This can be a float or an array of any shape.
+
+    Notes
+    -----
+    The positions are geometric (they are not corrected for light time or
+    stellar aberration). They match SPICE's :code:`subpnt` and :code:`subslr`
+    routines with the :code:`'Intercept: ellipsoid'` method, and its
+    :code:`lspcn` routine. The spacecraft position is in the IAU_MARS frame.
+    The Mars-Sun distance is measured from the sub-solar point.
+
+    SPICE kernels must already be loaded. See :class:`pyuvs.spice.Spice` for
+    methods to do this.
+
+    Examples
+    --------
+    Get the sub-spacecraft latitude at every integration of a file.
+
+    >>> et = file['integration'].data['et']  # doctest: +SKIP
+    >>> latitude = ephemeris(et).subspacecraft_latitude  # doctest: +SKIP
+
+    """
+    et = np.asarray(et, dtype=float)
+    unique_et, inverse = np.unique(et, return_inverse=True)
+    radii = spice.bodvrd('MARS', 'RADII', 3)[1]
+
+    spacecraft = _positions('MAVEN', unique_et, 'IAU_MARS')
+    subspacecraft = ellipsoid_intercept(spacecraft, -spacecraft, radii)
+    sun = _positions('SUN', unique_et, 'IAU_MARS')
+    subsolar = ellipsoid_intercept(sun, -sun, radii)
+    subspacecraft_latitude, subspacecraft_longitude = \
+        _latitude_longitude(subspacecraft)
+    subsolar_latitude, subsolar_longitude = _latitude_longitude(subsolar)
+
+    fields = [unique_et, spacecraft, subspacecraft_latitude,
+              subspacecraft_longitude,
+              np.linalg.norm(spacecraft - subspacecraft, axis=-1),
+              _solar_longitude(unique_et), subsolar_latitude,
+              subsolar_longitude, np.linalg.norm(sun - subsolar, axis=-1)]
+    return Ephemeris(*[f[inverse].reshape(et.shape + f.shape[1:])[()]
+                       for f in fields])
+
+
+def _positions(target: str, et: np.ndarray, frame: str) -> np.ndarray:
+    # Get the geometric position of a target relative to Mars, with shape
+    # (n_times, 3)
+    if et.size == 0:
+        return np.zeros((0, 3))
+    return np.asarray(spice.spkpos(target, et, frame, 'NONE', 'MARS')[0])\
+        .reshape((-1, 3))
+
+
+def _latitude_longitude(point: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    latitude = np.degrees(np.arctan2(point[..., 2],
+                                     np.hypot(point[..., 0], point[..., 1])))
+    longitude = np.degrees(np.arctan2(point[..., 1], point[..., 0]))
+    return latitude, longitude
+
+
+def _solar_longitude(et: np.ndarray) -> np.ndarray:
+    # Follow lspcn: Ls is the Sun's longitude in a frame whose z-axis is Mars's
+    # orbital angular momentum and whose x-axis points to the vernal equinox,
+    # where Mars's equator crosses its orbit
+    if et.size == 0:
+        return np.zeros(0)
+    state = np.asarray(spice.spkezr('MARS', et, 'J2000', 'NONE', 'SUN')[0])\
+        .reshape((-1, 6))
+    pole = np.array([spice.pxform('J2000', 'IAU_MARS', f)[2] for f in et])
+    orbit_normal = np.cross(state[:, :3], state[:, 3:])
+    orbit_normal /= np.linalg.norm(orbit_normal, axis=-1, keepdims=True)
+    equinox = np.cross(pole, orbit_normal)
+    equinox /= np.linalg.norm(equinox, axis=-1, keepdims=True)
+    sun = -state[:, :3]
+    ls = np.arctan2(np.sum(sun * np.cross(orbit_normal, equinox), axis=-1),
+                    np.sum(sun * equinox, axis=-1))
+    return np.degrees(np.mod(ls, 2 * np.pi))
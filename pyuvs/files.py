@@ -1,24 +1,40 @@
 """The files module contains tools for getting IUVS data files from one's
 computer.
 """
-import copy
+import asyncio
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 import fnmatch as fnm
+import functools
+import itertools
+import os
 from pathlib import Path
+import re
+from typing import AsyncIterator, Iterator
 from warnings import warn
 import numpy as np
 
 
+@functools.total_ordering
 class DataFilename:
     """A data structure containing info from a single IUVS filename.
 
     It ensures the input filename represents an IUVS filename and extracts all
     information related to the observation and processing pipeline from the
-    input.
+    input. The filename is parsed once, when the object is made.
+
+    DataFilenames are hashable and are ordered by their paths, so they can be
+    sorted and used in sets and as dict keys.
 
     Parameters
     ----------
     path
         The absolute path of an IUVS data product.
+    check_path
+        Check that the path leads to a file. Set this to False to skip the
+        check when the path is already known to exist (because it just came
+        from a directory listing, for instance); this avoids touching the file
+        system.
 
     Raises
     ------
@@ -30,24 +46,68 @@ class DataFilename:
         Raised if the file is not an IUVS data file.
 
     """
-    def __init__(self, path: str) -> None:
-        self.__path = self.__create_path(path)
-        self.__filename = self.__path.name
+    __slots__ = ('__path', '__filename', '__spacecraft', '__instrument',
+                 '__level', '__description', '__segment', '__orbit',
+                 '__channel', '__timestamp', '__version', '__revision',
+                 '__extension')
+
+    def __init__(self, path: str, check_path: bool = True) -> None:
+        self.__path = self.__create_path(path, check_path)
+        self.__filename = os.path.basename(self.__path)
+        self.__parse_filename()
 
     @staticmethod
-    def __create_path(path: str) -> Path:
-        _DataFilePathChecker(path)
-        return Path(path)
+    def __create_path(path: str, check_path: bool) -> str:
+        if check_path:
+            _DataFilePathChecker(path)
+            return str(Path(path))
+        if not isinstance(path, str):
+            message = f'path should be a str, not a {type(path)}.'
+            raise TypeError(message)
+        return path
+
+    def __parse_filename(self) -> None:
+        match = _filename_pattern.match(self.__filename)
+        if match is None or not self.__filename.startswith('mvn_iuv_') or \
+                not self.__filename.endswith(('.fits', '.fits.gz')):
+            message = 'The input file is not an IUVS data file.'
+            raise ValueError(message)
+        self.__spacecraft, self.__instrument, self.__level, \
+            self.__description, segment, orbit, self.__channel, \
+            self.__timestamp, self.__version, self.__revision, \
+            self.__extension = match.groups()
+        if orbit is None:
+            self.__segment = self.__description
+            self.__orbit = None
+        else:
+            self.__segment = segment or ''
+            self.__orbit = int(orbit)
 
     def __str__(self) -> str:
-        return str(self.__path)
+        return self.__path
+
+    def __repr__(self) -> str:
+        return f'DataFilename({self.__path!r})'
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, DataFilename):
+            return NotImplemented
+        return self.__path == other.__path
+
+    def __lt__(self, other) -> bool:
+        if not isinstance(other, DataFilename):
+            return NotImplemented
+        return self.__path < other.__path
+
+    def __hash__(self) -> int:
+        return hash(self.__path)
 
     @property
     def path(self) -> str:
         """Get the input absolute path.
 
         """
-        return str(self.__path)
+        return self.__path
 
     @property
     def filename(self) -> str:
@@ -61,46 +121,45 @@ class DataFilename:
         """Get the spacecraft code from the filename.
 
         """
-        return self.__split_filename_on_underscore()[0]
+        return self.__spacecraft
 
     @property
     def instrument(self) -> str:
         """Get the instrument code from the filename.
 
         """
-        return self.__split_filename_on_underscore()[1]
+        return self.__instrument
 
     @property
     def level(self) -> str:
         """Get the data product level from the filename.
 
         """
-        return self.__split_filename_on_underscore()[2]
+        return self.__level
 
     @property
     def description(self) -> str:
         """Get the description from the filename.
 
         """
-        return self.__split_filename_on_underscore()[3]
+        return self.__description
 
     @property
     def segment(self) -> str:
-        """Get the observation segment from the filename.
+        """Get the observation segment from the filename. If the filename
+        has no orbit, this is the whole description.
 
         """
-        orbit_index = self.__get_split_index_containing_orbit()
-        segments = self.__split_description()[:orbit_index]
-        return '-'.join(segments)
+        return self.__segment
 
+    # TODO: in python3.10 change type hint to | type(None)
     @property
     def orbit(self) -> int:
-        """Get the orbit number from the filename.
+        """Get the orbit number from the filename, or None if the filename
+        has no orbit.
 
         """
-        orbit_index = self.__get_split_index_containing_orbit()
-        orbit = self.__split_description()[orbit_index].removeprefix('orbit')
-        return int(orbit)
+        return self.__orbit
 
     # TODO: in python3.10 change type hint to | type(None)
     @property
@@ -108,25 +167,21 @@ class DataFilename:
         """Get the observation channel from the filename.
 
         """
-        orbit_index = self.__get_split_index_containing_orbit()
-        try:
-            return self.__split_description()[orbit_index + 1]
-        except IndexError:
-            return None
+        return self.__channel
 
     @property
     def timestamp(self) -> str:
         """Get the timestamp of the observation from the filename.
 
         """
-        return self.__split_filename_on_underscore()[4]
+        return self.__timestamp
 
     @property
     def date(self) -> str:
         """Get the date of the observation from the filename.
 
         """
-        return self.__split_timestamp()[0]
+        return self.__timestamp.split('T')[0]
 
     @property
     def year(self) -> int:
@@ -154,7 +209,7 @@ class DataFilename:
         """Get the time of the observation from the filename.
 
         """
-        return self.__split_timestamp()[1]
+        return self.__timestamp.split('T')[1]
 
     @property
     def hour(self) -> int:
@@ -182,41 +237,47 @@ class DataFilename:
         """Get the version code from the filename.
 
         """
-        return self.__split_filename_on_underscore()[5]
+        return self.__version
 
     @property
     def revision(self) -> str:
         """Get the revision code from the filename.
 
         """
-        return self.__split_filename_on_underscore()[6]
+        return self.__revision
 
     @property
     def extension(self) -> str:
         """Get the extension of filename.
 
         """
-        return self.__split_stem_from_extension()[1]
+        return self.__extension
 
-    def __split_filename_on_underscore(self) -> list[str]:
-        stem = self.__split_stem_from_extension()[0]
-        return stem.split('_')
 
-    def __split_stem_from_extension(self) -> list[str]:
-        extension_index = self.__filename.find('.')
-        stem = self.__filename[:extension_index]
-        extension = self.__filename[extension_index + 1:]
-        return [stem, extension]
+# The description is usually the segment (which may contain hyphens), the
+# orbit, and the channel, all separated by hyphens. Descriptions without an
+# orbit (of calibration files, for instance) are not split up.
+_filename_pattern = re.compile(
+    r'(?P<spacecraft>[^_.]+)_(?P<instrument>[^_.]+)_(?P<level>[^_.]+)_'
+    r'(?P<description>(?:(?P<segment>[^_.]*?)-)??orbit(?P<orbit>\d+)'
+    r'(?:-(?P<channel>[^-_.]+)[^_.]*)?|[^_.]+)_'
+    r'(?P<timestamp>[^_.]+)_(?P<version>[^_.]+)_(?P<revision>[^_.]+)'
+    r'\.(?P<extension>.+)$')
 
-    def __split_timestamp(self) -> list[str]:
-        return self.timestamp.split('T')
 
-    def __split_description(self) -> list[str]:
-        return self.description.split('-')
+def _version_key(filename: DataFilename) -> tuple:
+    # The sort key that orders versions of one observation from oldest to
+    # newest. See DataFilenameCollection for the order.
+    return _version_order(filename.version, filename.revision, filename.path)
 
-    def __get_split_index_containing_orbit(self) -> int:
-        return [c for c, f in enumerate(self.__split_description())
-                if 'orbit' in f][0]
+
+def _version_order(version: str, revision: str, path: str) -> tuple:
+    # _version_key from the raw fields, for callers without a DataFilename
+    version_number = re.search(r'\d+', version)
+    revision_number = re.search(r'\d+', revision)
+    return (int(version_number.group()) if version_number else -1,
+            int(revision_number.group()) if revision_number else -1,
+            revision.startswith('r'), path)
 
 
 class _DataPathChecker:
@@ -424,13 +485,44 @@ class DataFilenameCollection:
     This class checks that the input files are IUVS data files and only keeps
     the most recent data files.
 
+    Files are different versions of the same observation when they have the
+    same level, segment, orbit, channel, and timestamp. Of these, the kept
+    file is the one with the highest version number, then the highest
+    revision number, then the latest processing stage (an "r" revision is
+    preferred over an "s" revision). Any remaining tie goes to the file whose
+    path sorts last.
+
+    Alongside the DataFilenames, the collection keeps each filename field as a
+    NumPy array (see :meth:`column`), so that filtering (:meth:`select`,
+    :meth:`match`), grouping (:meth:`group_by`), and the set operators
+    :code:`|`, :code:`&`, and :code:`-` work on whole columns at once. The
+    collections these make share the parsed filenames of the original, and
+    unlike the input to the constructor they may be empty.
+
+    Examples
+    --------
+    >>> files = FileFinder('/media/IUVS_data').orbit_range_files(
+    ...     3000, 4000, '*', '*')  # doctest: +SKIP
+    >>> muv = files.match(segment='apoapse', channel='muv')  # doctest: +SKIP
+    >>> orbits = muv.group_by('orbit')  # doctest: +SKIP
+
     """
-    def __init__(self, files: list[str]) -> None:
+    __columns = ('path', 'level', 'segment', 'orbit', 'channel', 'timestamp',
+                 'version', 'revision')
+
+    def __init__(self, files: list[str], check_paths: bool = True,
+                 keep_all_versions: bool = False) -> None:
         """
         Parameters
         ----------
         files
             Absolute paths of IUVS data files.
+        check_paths
+            Only keep files whose paths lead to a file. Set this to False to
+            skip checking the file system when the paths are known to exist.
+        keep_all_versions
+            Keep every version of each observation instead of only the most
+            recent one.
 
         Raises
         ------
@@ -440,9 +532,50 @@ class DataFilenameCollection:
             Raised if none of the input files are IUVS data files.
 
         """
+        self.__check_paths = check_paths
+        self.__keep_all_versions = keep_all_versions
         self.__filenames = self.__make_latest_data_filenames(files)
         self.__raise_value_error_if_no_input_iuvs_files()
+        self.__filename_set = frozenset(self.__filenames)
         self.__counter = 0
+        self.__column_arrays = self.__make_columns()
+
+    @classmethod
+    def __from_filenames(cls, filenames: list[DataFilename],
+                         columns: dict = None,
+                         keep_all_versions: bool = False) \
+            -> 'DataFilenameCollection':
+        # Make a collection from filenames that are already parsed and are
+        # already only the most recent files
+        collection = cls.__new__(cls)
+        collection.__check_paths = False
+        collection.__keep_all_versions = keep_all_versions
+        collection.__filenames = filenames
+        collection.__filename_set = frozenset(filenames)
+        collection.__counter = 0
+        collection.__column_arrays = collection.__make_columns() if \
+            columns is None else columns
+        return collection
+
+    def __make_columns(self) -> dict:
+        columns = {
+            'path': np.array([f.path for f in self.__filenames], dtype=object),
+            'level': np.array([f.level for f in self.__filenames], dtype=str),
+            'segment': np.array([f.segment for f in self.__filenames],
+                                dtype=str),
+            'orbit': np.array([-1 if f.orbit is None else f.orbit
+                               for f in self.__filenames], dtype=int),
+            'channel': np.array([f.channel or '' for f in self.__filenames],
+                                dtype=str),
+            'timestamp': np.array([f.timestamp for f in self.__filenames],
+                                  dtype=str),
+            'version': np.array([f.version for f in self.__filenames],
+                                dtype=str),
+            'revision': np.array([f.revision for f in self.__filenames],
+                                 dtype=str)}
+        for column in columns.values():
+            column.flags.writeable = False
+        return columns
 
     def __make_latest_data_filenames(self, files: list[str]) \
             -> list[DataFilename]:
@@ -456,11 +589,10 @@ class DataFilenameCollection:
         return [k for f in filenames if
                 (k := self.__make_filename(f)) is not None]
 
-    @staticmethod
     # TODO: When python 3.10 releases, change -> DataFilename | None
-    def __make_filename(filename: str) -> DataFilename:
+    def __make_filename(self, filename: str) -> DataFilename:
         try:
-            return DataFilename(filename)
+            return DataFilename(filename, check_path=self.__check_paths)
         except FileNotFoundError:
             return None
         except TypeError:
@@ -468,19 +600,19 @@ class DataFilenameCollection:
         except ValueError:
             return None
 
-    # TODO: this logic can now be simplified since I don't need to keep the indx
-    @staticmethod
-    def __get_latest_filenames(filenames: list[DataFilename]) \
+    def __get_latest_filenames(self, filenames: list[DataFilename]) \
             -> list[DataFilename]:
-        fnames = {f.filename.replace('s0', 'a0'): f for f in filenames}
-        prev_key, prev_time = '', ''
-        for k, v in copy.deepcopy(fnames).items():
-            if v.timestamp != prev_time:
-                prev_time = v.timestamp
-            else:
-                del fnames[prev_key]
-            prev_key = k
-        return [*fnames.values()]
+        if self.__keep_all_versions:
+            return filenames
+        latest = {}
+        for filename in filenames:
+            key = (filename.level, filename.segment, filename.orbit,
+                   filename.channel, filename.timestamp)
+            best = latest.get(key)
+            if best is None or _version_key(filename) > _version_key(best):
+                latest[key] = filename
+        return [f for f in filenames if latest[(f.level, f.segment, f.orbit,
+                                                f.channel, f.timestamp)] is f]
 
     @staticmethod
     def __remove_non_fits_files(filenames: list[DataFilename]) \
@@ -517,49 +649,208 @@ class DataFilenameCollection:
         """
         return len(self.__filenames)
 
+    def __len__(self) -> int:
+        return len(self.__filenames)
+
+    def __contains__(self, filename: DataFilename) -> bool:
+        return filename in self.__filename_set
+
+    def column(self, name: str) -> np.ndarray:
+        """Get one field of every filename in the collection as an array.
+
+        Parameters
+        ----------
+        name
+            The name of the field. Can be any of 'path', 'level', 'segment',
+            'orbit', 'channel', 'timestamp', 'version', or 'revision'. Files
+            without a channel have a channel of '', and files without an
+            orbit have an orbit of -1.
+
+        Raises
+        ------
+        ValueError
+            Raised if name is not the name of a field.
+
+        """
+        if name not in self.__columns:
+            message = f'name must be one of {", ".join(self.__columns)}.'
+            raise ValueError(message)
+        return self.__column_arrays[name]
+
+    def select(self, selection: np.ndarray) -> 'DataFilenameCollection':
+        """Make a collection from a subset of the files in this collection.
+
+        Parameters
+        ----------
+        selection
+            A boolean mask with one value per file, the indices of the files
+            to keep, or a slice.
+
+        Examples
+        --------
+        >>> files.select(files.column('orbit') % 2 == 0)  # doctest: +SKIP
+
+        """
+        if isinstance(selection, slice):
+            filenames = self.__filenames[selection]
+        else:
+            filenames = [self.__filenames[f] for f in
+                         np.arange(self.n_files)[selection]]
+        columns = {}
+        for name, column in self.__column_arrays.items():
+            columns[name] = column[selection]
+            columns[name].flags.writeable = False
+        return self.__from_filenames(filenames, columns,
+                                     self.__keep_all_versions)
+
+    def match(self, level: str = '*', segment: str = '*', channel: str = '*',
+              orbit_start: int = None, orbit_end: int = None) \
+            -> 'DataFilenameCollection':
+        """Make a collection of the files in this collection that match a
+        set of patterns.
+
+        Parameters
+        ----------
+        level
+            The level glob pattern to match.
+        segment
+            The segment glob pattern to match.
+        channel
+            The channel glob pattern to match.
+        orbit_start
+            The first orbit to keep. Default is :code:`None`, which does not
+            limit the orbits from below.
+        orbit_end
+            The orbit after the last orbit to keep. Default is :code:`None`,
+            which does not limit the orbits from above.
+
+        Notes
+        -----
+        Files without an orbit are only kept if neither orbit_start nor
+        orbit_end is given.
+
+        """
+        mask = self.__match_orbits(orbit_start, orbit_end)
+        for name, pattern in [('level', level), ('segment', segment),
+                              ('channel', channel)]:
+            mask &= self.__match_column(name, pattern)
+        return self.select(mask)
+
+    def __match_orbits(self, orbit_start: int, orbit_end: int) -> np.ndarray:
+        orbits = self.__column_arrays['orbit']
+        if orbit_start is None and orbit_end is None:
+            return np.ones(self.n_files, dtype=bool)
+        mask = orbits >= 0
+        if orbit_start is not None:
+            mask &= orbits >= orbit_start
+        if orbit_end is not None:
+            mask &= orbits < orbit_end
+        return mask
+
+    def __match_column(self, name: str, pattern: str) -> np.ndarray:
+        # A column only has a few distinct values, so only match those
+        column = self.__column_arrays[name]
+        values, inverse = np.unique(column, return_inverse=True)
+        matches = np.array([fnm.fnmatch(f, pattern) for f in values],
+                           dtype=bool)
+        return matches[inverse] if column.size else np.zeros(0, dtype=bool)
+
+    def group_by(self, *names: str) -> dict:
+        """Split the collection into groups of files that share the values of
+        some fields.
+
+        Parameters
+        ----------
+        names
+            The names of the fields to group by, as in :meth:`column`.
+
+        Returns
+        -------
+        dict
+            The collection of each group, keyed by the tuple of the group's
+            values, in sorted order.
+
+        Examples
+        --------
+        >>> files.group_by('orbit', 'channel')  # doctest: +SKIP
+        {(3453, 'fuv'): <...>, (3453, 'muv'): <...>, ...}
+
+        """
+        columns = [self.column(f) for f in names]
+        if self.n_files == 0:
+            return {}
+        keys = np.rec.fromarrays(
+            [f.astype(str) if f.dtype == object else f for f in columns],
+            names=list(names))
+        unique_keys, inverse = np.unique(keys, return_inverse=True)
+        # Once the files are sorted by group, each group is a slice
+        grouped = self.select(np.argsort(inverse, kind='stable'))
+        bounds = np.concatenate(([0], np.cumsum(np.bincount(inverse))))
+        return {tuple(f.item() for f in key):
+                grouped.select(slice(start, stop)) for key, start, stop in
+                zip(unique_keys, bounds[:-1], bounds[1:])}
+
+    def __or__(self, other: 'DataFilenameCollection') \
+            -> 'DataFilenameCollection':
+        # Files from both may be different versions of one observation, so
+        # keep only the most recent again
+        filenames = sorted(set(self.__filenames) | set(other.filenames))
+        return self.__from_filenames(self.__get_latest_filenames(filenames),
+                                     keep_all_versions=self.__keep_all_versions)
+
+    def __and__(self, other: 'DataFilenameCollection') \
+            -> 'DataFilenameCollection':
+        return self.select(np.isin(self.__column_arrays['path'],
+                                   other.column('path')))
+
+    def __sub__(self, other: 'DataFilenameCollection') \
+            -> 'DataFilenameCollection':
+        return self.select(~np.isin(self.__column_arrays['path'],
+                                    other.column('path')))
+
     def all_l1b(self) -> bool:
         """Determine if all files in the collection are level 1b data files.
 
         """
-        return all((f.level == 'l1b' for f in self.filenames))
+        return bool(np.all(self.__column_arrays['level'] == 'l1b'))
 
     def all_l1c(self) -> bool:
         """Determine if all files in the collection are level 1c data files.
 
         """
-        return all((f.level == 'l1c' for f in self.filenames))
+        return bool(np.all(self.__column_arrays['level'] == 'l1c'))
 
     def all_apoapse(self) -> bool:
         """Determine if all files in the collection are apoapse data files.
 
         """
-        return all((f.segment == 'apoapse' for f in self.filenames))
+        return bool(np.all(self.__column_arrays['segment'] == 'apoapse'))
 
     def all_periapse(self) -> bool:
         """Determine if all files in the collection are periapse data files.
 
         """
-        return all((f.segment == 'periapse' for f in self.filenames))
+        return bool(np.all(self.__column_arrays['segment'] == 'periapse'))
 
     def all_ech(self) -> bool:
         """Determine if all files in the collection are echelle data files..
 
         """
-        return all((f.channel == 'ech' for f in self.filenames))
+        return bool(np.all(self.__column_arrays['channel'] == 'ech'))
 
     def all_fuv(self) -> bool:
         """Determine if all files in the collection are far-ultraviolet data
         files.
 
         """
-        return all((f.channel == 'fuv' for f in self.filenames))
+        return bool(np.all(self.__column_arrays['channel'] == 'fuv'))
 
     def all_muv(self) -> bool:
         """Determine if all files in the collection are mid-ultraviolet data
         files.
 
         """
-        return all((f.channel == 'muv' for f in self.filenames))
+        return bool(np.all(self.__column_arrays['channel'] == 'muv'))
 
 
 class DataPath:
@@ -869,10 +1160,10 @@ class FileFinder:
         p = DataPath(self.__path).block(orbit)
         pat = DataPattern().orbit_pattern(orbit, segment, channel)
         abs_paths = self.__glob_files(p, pat)
-        return DataFilenameCollection(abs_paths)
+        return DataFilenameCollection(abs_paths, check_paths=False)
 
-    def multi_orbit_files(self, orbits: list[int], segment: str, channel: str) \
-            -> DataFilenameCollection:
+    def multi_orbit_files(self, orbits: list[int], segment: str, channel: str,
+                          n_threads: int = 1) -> DataFilenameCollection:
         """Make a DataFilenameCollection for an input list of orbits,
         segment pattern, and channel pattern, assuming orbits are organized in
         blocks of 100.
@@ -885,16 +1176,27 @@ class FileFinder:
             The observing segment to get files from.
         channel
             The observing channel to get files from.
+        n_threads
+            The number of block directories to scan at once. Listing a
+            directory on a network mount is slow, so scanning several at once
+            helps there.
+
+        Notes
+        -----
+        Each block directory is only listed once, however many of the orbits
+        are in it.
 
         """
-        p = DataPath(self.__path).block_paths(orbits)
-        pat = DataPattern().multi_orbit_patterns(orbits, segment, channel)
-        path_list = [self.__glob_files(p[f], pat[f]) for f in range(len(p))]
-        abs_paths = [k for f in path_list for k in f]
-        return DataFilenameCollection(abs_paths)
+        blocks = _group_orbits_by_block(self.__path, orbits, segment, channel)
+        with ThreadPoolExecutor(max_workers=n_threads) as executor:
+            path_list = executor.map(_scan_block, blocks.keys(),
+                                     blocks.values())
+            abs_paths = [k for f in path_list for k in f]
+        return DataFilenameCollection(abs_paths, check_paths=False)
 
     def orbit_range_files(self, orbit_start: int, orbit_end: int, segment: str,
-                          channel: str) -> DataFilenameCollection:
+                          channel: str, n_threads: int = 1) \
+            -> DataFilenameCollection:
         """ Make a DataFilenameCollection for all orbits in a range of orbits
         with a segment pattern and channel pattern, assuming orbits are
         organized in blocks of 100.
@@ -909,10 +1211,87 @@ class FileFinder:
             The observing segment to get files from.
         channel
             The observing channel to get files from.
+        n_threads
+            The number of block directories to scan at once.
 
         """
         orbits = list(range(orbit_start, orbit_end))
-        return self.multi_orbit_files(orbits, segment=segment, channel=channel)
+        return self.multi_orbit_files(orbits, segment=segment, channel=channel,
+                                      n_threads=n_threads)
+
+    def iter_multi_orbit_files(self, orbits: list[int], segment: str,
+                               channel: str, n_threads: int = 1) \
+            -> Iterator[DataFilename]:
+        """Iterate over the files for an input list of orbits, segment
+        pattern, and channel pattern, assuming orbits are organized in blocks
+        of 100.
+
+        Unlike :meth:`multi_orbit_files`, this yields the files in each block
+        directory as soon as that directory is scanned, so the files from the
+        first orbits can be processed while later blocks are still being
+        listed.
+
+        Parameters
+        ----------
+        orbits
+            Orbits to get files from.
+        segment
+            The observing segment to get files from.
+        channel
+            The observing channel to get files from.
+        n_threads
+            The number of block directories to scan at once. Blocks are still
+            yielded in order.
+
+        Yields
+        ------
+        DataFilename
+            The most recent version of each matching file, sorted by path
+            within each block.
+
+        """
+        blocks = iter(_group_orbits_by_block(
+            self.__path, orbits, segment, channel).items())
+        executor = ThreadPoolExecutor(max_workers=n_threads)
+        # Only scan n_threads blocks ahead of the block being yielded
+        scans = deque(executor.submit(_scan_block, *block) for block in
+                      itertools.islice(blocks, n_threads))
+        try:
+            while scans:
+                abs_paths = scans.popleft().result()
+                for block in itertools.islice(blocks, 1):
+                    scans.append(executor.submit(_scan_block, *block))
+                # All versions of an observation are in the same block
+                if abs_paths:
+                    yield from DataFilenameCollection(
+                        abs_paths, check_paths=False).filenames
+        finally:
+            executor.shutdown(cancel_futures=True)
+
+    def iter_orbit_range_files(self, orbit_start: int, orbit_end: int,
+                               segment: str, channel: str,
+                               n_threads: int = 1) -> Iterator[DataFilename]:
+        """Iterate over the files for all orbits in a range of orbits with a
+        segment pattern and channel pattern, assuming orbits are organized in
+        blocks of 100. See :meth:`iter_multi_orbit_files` for details.
+
+        Parameters
+        ----------
+        orbit_start
+            The starting orbit to get files from.
+        orbit_end
+            The ending orbit to get files from.
+        segment
+            The observing segment to get files from.
+        channel
+            The observing channel to get files from.
+        n_threads
+            The number of block directories to scan at once.
+
+        """
+        orbits = list(range(orbit_start, orbit_end))
+        yield from self.iter_multi_orbit_files(
+            orbits, segment=segment, channel=channel, n_threads=n_threads)
 
     def __glob_files(self, path: str, pattern: str) -> list[str]:
         g = self.__perform_glob(path, pattern)
@@ -927,6 +1306,165 @@ class FileFinder:
         return sorted([str(f) for f in inp_glob if f.is_file()])
 
 
+class AsyncFileFinder:
+    """Find IUVS data files on their computer from asyncio code.
+
+    This is the asyncio counterpart to :class:`FileFinder`. Block directories
+    are listed in worker threads, several at once, so that the latency of
+    listing directories on a network mount overlaps instead of adding up.
+
+    """
+    def __init__(self, path: str, max_in_flight: int = 8) -> None:
+        """
+        Parameters
+        ----------
+        path
+            The absolute path where to begin looking for IUVS data files.
+        max_in_flight
+            The most block directories to list at once.
+
+        Raises
+        ------
+        TypeError
+            Raised if path is not a str.
+        ValueError
+            Raised if max_in_flight is not positive.
+
+        """
+        self.__path = path
+        self.__max_in_flight = max_in_flight
+
+        self.__raise_error_if_input_path_is_bad()
+        self.__raise_value_error_if_max_in_flight_is_not_positive()
+
+    def __raise_error_if_input_path_is_bad(self) -> None:
+        if not isinstance(self.__path, str):
+            raise TypeError('path must be a str.')
+
+    def __raise_value_error_if_max_in_flight_is_not_positive(self) -> None:
+        if self.__max_in_flight < 1:
+            raise ValueError('max_in_flight must be positive.')
+
+    async def multi_orbit_files(self, orbits: list[int], segment: str,
+                                channel: str) -> DataFilenameCollection:
+        """Make a DataFilenameCollection for an input list of orbits,
+        segment pattern, and channel pattern, assuming orbits are organized in
+        blocks of 100.
+
+        Parameters
+        ----------
+        orbits
+            Orbits to get files from.
+        segment
+            The observing segment to get files from.
+        channel
+            The observing channel to get files from.
+
+        """
+        scans = self.__start_scans(orbits, segment, channel)
+        try:
+            path_list = await asyncio.gather(*scans)
+        finally:
+            for scan in scans:
+                scan.cancel()
+        abs_paths = [k for f in path_list for k in f]
+        return DataFilenameCollection(abs_paths, check_paths=False)
+
+    async def orbit_range_files(self, orbit_start: int, orbit_end: int,
+                                segment: str, channel: str) \
+            -> DataFilenameCollection:
+        """Make a DataFilenameCollection for all orbits in a range of orbits
+        with a segment pattern and channel pattern, assuming orbits are
+        organized in blocks of 100.
+
+        Parameters
+        ----------
+        orbit_start
+            The starting orbit to get files from.
+        orbit_end
+            The ending orbit to get files from.
+        segment
+            The observing segment to get files from.
+        channel
+            The observing channel to get files from.
+
+        """
+        orbits = list(range(orbit_start, orbit_end))
+        return await self.multi_orbit_files(orbits, segment, channel)
+
+    async def iter_multi_orbit_files(self, orbits: list[int], segment: str,
+                                     channel: str) \
+            -> AsyncIterator[DataFilename]:
+        """Iterate over the files for an input list of orbits, segment
+        pattern, and channel pattern, yielding the files in each block
+        directory in order as soon as that directory is listed.
+
+        Parameters
+        ----------
+        orbits
+            Orbits to get files from.
+        segment
+            The observing segment to get files from.
+        channel
+            The observing channel to get files from.
+
+        """
+        scans = self.__start_scans(orbits, segment, channel)
+        try:
+            for scan in scans:
+                abs_paths = await scan
+                # All versions of an observation are in the same block
+                if abs_paths:
+                    for filename in DataFilenameCollection(
+                            abs_paths, check_paths=False).filenames:
+                        yield filename
+        finally:
+            for scan in scans:
+                scan.cancel()
+
+    def __start_scans(self, orbits: list[int], segment: str,
+                      channel: str) -> list[asyncio.Task]:
+        blocks = _group_orbits_by_block(self.__path, orbits, segment, channel)
+        semaphore = asyncio.Semaphore(self.__max_in_flight)
+
+        async def scan(path: str, patterns: dict[str, str]) -> list[str]:
+            async with semaphore:
+                return await asyncio.to_thread(_scan_block, path, patterns)
+
+        return [asyncio.create_task(scan(*f)) for f in blocks.items()]
+
+
+_orbit_code_pattern = re.compile(r'-orbit(\d{5})')
+
+
+def _find_orbit_code(filename: str) -> str:
+    match = _orbit_code_pattern.search(filename)
+    return match.group(1) if match else None
+
+
+def _group_orbits_by_block(path: str, orbits: list[int], segment: str,
+                           channel: str) -> dict[str, dict[str, str]]:
+    # Map each block directory to the patterns of the orbits wanted from it,
+    # keyed by orbit code
+    p = DataPath(path).block_paths(orbits)
+    pat = DataPattern().multi_orbit_patterns(orbits, segment, channel)
+    blocks = {}
+    for block, orbit, pattern in zip(p, orbits, pat):
+        blocks.setdefault(block, {})[Orbit(orbit).code()] = pattern
+    return blocks
+
+
+def _scan_block(path: str, patterns: dict[str, str]) -> list[str]:
+    # patterns maps each orbit code wanted from this block to its pattern
+    try:
+        with os.scandir(path) as entries:
+            return sorted(
+                f.path for f in entries if
+                (orbit := _find_orbit_code(f.name)) in patterns and
+                fnm.fnmatch(f.name, patterns[orbit]) and f.is_file())
+    except FileNotFoundError:
+        return []
+
 
 if __name__ == '__main__':
     f = FileFinder('/media/kyle/Samsung_T5/IUVS_data')
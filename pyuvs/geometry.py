@@ -0,0 +1,307 @@
+"""The geometry module computes the observing geometry of IUVS pixels.
+"""
+from typing import NamedTuple
+import numpy as np
+import spiceypy as spice
+
+
+class PixelGeometry(NamedTuple):
+    """The observing geometry of a set of pixels.
+
+    Latitudes are planetocentric and longitudes are east longitudes from 0 to
+    360. The angles are in degrees and the local times are in hours. Pixels
+    that do not intercept Mars are NaN in every field.
+
+    """
+    latitude: np.ndarray
+    longitude: np.ndarray
+    local_time: np.ndarray
+    solar_zenith_angle: np.ndarray
+    emission_angle: np.ndarray
+    phase_angle: np.ndarray
+
+
+def pixel_geometry(et: np.ndarray, pixel_vector: np.ndarray,
+                   frame: str = 'IAU_MARS') -> PixelGeometry:
+    """Compute the observing geometry of MAVEN's pixels on the Mars
+    ellipsoid.
+
+    SPICE is only used to get the state at each ephemeris time: where Mars and
+    the Sun appear from MAVEN and how the pixel vectors' frame is oriented.
+    The intercepts and angles of every pixel are then computed with array
+    math, which is much faster than calling SPICE once per pixel.
+
+    Parameters
+    ----------
+    et
+        The ephemeris time of each integration. This has shape
+        (n_integrations,).
+    pixel_vector
+        The direction each pixel looks in. This has shape
+        (n_integrations, ..., 3), so any number of pixels can be observed at
+        each time.
+    frame
+        The reference frame of the pixel vectors.
+
+    Notes
+    -----
+    This reproduces the aberration-corrected (:code:`'LT+S'`) geometry from
+    SPICE's :code:`sincpt`, :code:`ilumin`, and :code:`et2lst` routines,
+    except that the light time to Mars's center is used for every pixel
+    instead of the light time to each pixel's intercept. For MAVEN, this moves
+    the intercepts by tens of meters at most. Local times are not truncated to
+    whole seconds.
+
+    SPICE kernels must already be loaded. See :class:`pyuvs.spice.Spice` for
+    methods to do this.
+
+    """
+    et = np.atleast_1d(np.asarray(et, dtype=float))
+    pixel_vector = np.asarray(pixel_vector, dtype=float)
+    states = _observing_states(et, frame)
+    # Reshape the state at each time so it broadcasts over the pixels
+    pixel_dims = (1,) * (pixel_vector.ndim - 2)
+    return _surface_geometry(
+        *[f if f is None else f.reshape(f.shape[:1] + pixel_dims + f.shape[1:])
+          for f in states], pixel_vector)
+
+
+def adaptive_pixel_geometry(et: np.ndarray, pixel_vector: np.ndarray,
+                            cell_size: int = 4, tolerance: float = 0.01,
+                            frame: str = 'IAU_MARS') -> PixelGeometry:
+    """Compute the observing geometry of a grid of MAVEN's pixels, only
+    solving for the pixels where the geometry changes abruptly.
+
+    The geometry is solved exactly at the corners and center of square cells
+    of pixels. Cells that straddle Mars's limb or the terminator, whose
+    longitude or local time wraps around, or whose center is not bilinearly
+    interpolated from its corners to within a tolerance are solved exactly at
+    every pixel, as are their neighbors. Every other cell is bilinearly
+    interpolated from its corners, or is NaN if all of its corners miss Mars.
+
+    Parameters
+    ----------
+    et
+        The ephemeris time of each integration. This has shape
+        (n_integrations,).
+    pixel_vector
+        The direction each pixel looks in. This has shape
+        (n_integrations, n_positions, 3).
+    cell_size
+        The number of pixels along each side of a cell.
+    tolerance
+        The largest error in degrees allowed at the cell centers. Local times
+        are compared in degrees of longitude.
+    frame
+        The reference frame of the pixel vectors.
+
+    Notes
+    -----
+    The geometry away from the limb varies smoothly, so the interpolation
+    error at the cell centers is a good estimate of the error across the
+    cell. It is only an estimate though, and features smaller than a cell
+    can be missed, so cells should be much smaller than the disk of Mars.
+
+    """
+    et = np.atleast_1d(np.asarray(et, dtype=float))
+    pixel_vector = np.asarray(pixel_vector, dtype=float)
+    n_integrations, n_positions = pixel_vector.shape[:2]
+    if min(n_integrations, n_positions) < 2:
+        return pixel_geometry(et, pixel_vector, frame=frame)
+    states = _observing_states(et, frame)
+
+    # Solve exactly at the cell corners
+    row_nodes = _cell_nodes(n_integrations, cell_size)
+    column_nodes = _cell_nodes(n_positions, cell_size)
+    corners = _surface_geometry(
+        *[f if f is None else f[row_nodes][:, np.newaxis] for f in states],
+        pixel_vector[np.ix_(row_nodes, column_nodes)])
+    row_cell, row_weight = _cell_weights(n_integrations, row_nodes)
+    column_cell, column_weight = _cell_weights(n_positions, column_nodes)
+    geometry = [_bilinear(f, row_cell, row_weight, column_cell, column_weight)
+                for f in corners]
+
+    # Check the interpolation at the center of each cell
+    row_centers = (row_nodes[:-1] + row_nodes[1:]) // 2
+    column_centers = (column_nodes[:-1] + column_nodes[1:]) // 2
+    centers = _surface_geometry(
+        *[f if f is None else f[row_centers][:, np.newaxis] for f in states],
+        pixel_vector[np.ix_(row_centers, column_centers)])
+    interpolated = [f[np.ix_(row_centers, column_centers)] for f in geometry]
+    refine = _cells_to_refine(corners, centers, interpolated, tolerance)
+
+    # Solve the pixels in refined cells exactly
+    rows, columns = np.nonzero(refine[np.ix_(row_cell, column_cell)])
+    exact = _surface_geometry(*[f if f is None else f[rows] for f in states],
+                              pixel_vector[rows, columns])
+    for field, values in zip(geometry, exact):
+        field[rows, columns] = values
+    return PixelGeometry(*geometry)
+
+
+def ellipsoid_intercept(observer: np.ndarray, direction: np.ndarray,
+                        radii: np.ndarray) -> np.ndarray:
+    """Find where rays from an observer first hit an ellipsoid centered at
+    the origin.
+
+    Parameters
+    ----------
+    observer
+        The position of the observer. This has shape (..., 3).
+    direction
+        The direction of each ray. This has shape (..., 3) and must broadcast
+        against observer. It does not need to be a unit vector.
+    radii
+        The radii of the ellipsoid along the x, y, and z axes.
+
+    Returns
+    -------
+    np.ndarray
+        The intercept of each ray, with the broadcast shape of observer and
+        direction. Rays that miss the ellipsoid, or only hit it behind the
+        observer, are NaN.
+
+    Examples
+    --------
+    >>> ellipsoid_intercept(np.array([10., 0, 0]), np.array([-1., 0, 0]),
+    ...                     np.array([2., 2, 1]))
+    array([2., 0., 0.])
+
+    """
+    # Scale space so the ellipsoid is the unit sphere, and find the nearest
+    # point where each ray enters it
+    scaled_observer = observer / radii
+    scaled_direction = direction / radii
+    a = np.sum(scaled_direction ** 2, axis=-1)
+    b = 2 * np.sum(scaled_observer * scaled_direction, axis=-1)
+    c = np.sum(scaled_observer ** 2, axis=-1) - 1
+    discriminant = b ** 2 - 4 * a * c
+    with np.errstate(invalid='ignore'):
+        distance = (-b - np.sqrt(discriminant)) / (2 * a)
+    distance = np.where((discriminant >= 0) & (distance >= 0), distance,
+                        np.nan)
+    return observer + distance[..., np.newaxis] * direction
+
+
+def _observing_states(et: np.ndarray, frame: str) -> tuple:
+    # Get the positions of MAVEN and the Sun relative to Mars, the Sun's
+    # longitude, and the rotation from the pixel vectors' frame at each time.
+    # The positions are at the epoch the light left Mars. Each unique time is
+    # only computed once.
+    et, inverse = np.unique(et, return_inverse=True)
+    mars, light_time = spice.spkpos('MARS', et, 'IAU_MARS', 'LT+S', 'MAVEN')
+    target_et = et - np.asarray(light_time)
+    observer = -np.asarray(mars).reshape((-1, 3))
+    sun = np.asarray(spice.spkpos('SUN', target_et, 'IAU_MARS', 'LT+S',
+                                  'MARS')[0]).reshape((-1, 3))
+    rotation = None
+    if frame.upper() != 'IAU_MARS':
+        # The pixel vectors are in their frame at et, and the rest of the
+        # geometry is in IAU_MARS at the target epoch
+        rotation = np.array([spice.pxfrm2(frame, 'IAU_MARS', f, g)
+                             for f, g in zip(et, target_et)])
+
+    # The local time uses the Sun's longitude at et, not the target epoch
+    sun_lst = np.asarray(spice.spkpos('SUN', et, 'IAU_MARS', 'LT+S',
+                                      'MARS')[0]).reshape((-1, 3))
+    sun_longitude = np.arctan2(sun_lst[:, 1], sun_lst[:, 0])
+    return tuple(f if f is None else f[inverse]
+                 for f in [observer, sun, sun_longitude, rotation])
+
+
+def _surface_geometry(observer: np.ndarray, sun: np.ndarray,
+                      sun_longitude: np.ndarray, rotation: np.ndarray,
+                      pixel_vector: np.ndarray) -> PixelGeometry:
+    # The states must already broadcast against the pixel vectors
+    radii = spice.bodvrd('MARS', 'RADII', 3)[1]
+    if rotation is not None:
+        pixel_vector = np.einsum('...ij,...j->...i', rotation, pixel_vector)
+
+    surface_point = ellipsoid_intercept(observer, pixel_vector, radii)
+    normal = surface_point / radii ** 2
+    to_observer = observer - surface_point
+    to_sun = sun - surface_point
+
+    longitude = np.arctan2(surface_point[..., 1], surface_point[..., 0])
+    colatitude = np.arctan2(np.hypot(surface_point[..., 0],
+                                     surface_point[..., 1]),
+                            surface_point[..., 2])
+
+    return PixelGeometry(
+        latitude=90 - np.degrees(colatitude),
+        longitude=np.degrees(np.mod(longitude, 2 * np.pi)),
+        local_time=np.mod(12 + (longitude - sun_longitude) * 12 / np.pi, 24),
+        solar_zenith_angle=np.degrees(_angle_between(normal, to_sun)),
+        emission_angle=np.degrees(_angle_between(normal, to_observer)),
+        phase_angle=np.degrees(_angle_between(to_sun, to_observer)))
+
+
+def _cell_nodes(n_pixels: int, cell_size: int) -> np.ndarray:
+    # The indices of the cell corners along one axis, always including the
+    # last pixel
+    return np.unique(np.append(np.arange(0, n_pixels, cell_size),
+                               n_pixels - 1))
+
+
+def _cell_weights(n_pixels: int, nodes: np.ndarray) \
+        -> tuple[np.ndarray, np.ndarray]:
+    # Get the cell each pixel is in and its fractional distance across it
+    pixels = np.arange(n_pixels)
+    cell = np.clip(np.searchsorted(nodes, pixels, side='right') - 1, 0,
+                   len(nodes) - 2)
+    weight = (pixels - nodes[cell]) / (nodes[cell + 1] - nodes[cell])
+    return cell, weight
+
+
+def _cells_to_refine(corners: PixelGeometry, centers: PixelGeometry,
+                     interpolated: list[np.ndarray],
+                     tolerance: float) -> np.ndarray:
+    # Flag cells whose corners disagree on whether they see Mars or are lit,
+    # whose longitude or local time wraps around, or whose interpolated center
+    # is off. Their neighbors are flagged too, since the limb can bulge into a
+    # cell between its corners.
+    def corner_values(array):
+        return np.stack([array[:-1, :-1], array[:-1, 1:], array[1:, :-1],
+                         array[1:, 1:]])
+
+    on_mars = corner_values(np.isfinite(corners.latitude))
+    lit = corner_values(corners.solar_zenith_angle < 90)
+    longitude = corner_values(corners.longitude)
+    local_time = corner_values(corners.local_time)
+    with np.errstate(invalid='ignore'):
+        refine = (np.any(on_mars, axis=0) & ~np.all(on_mars, axis=0)) | \
+            (np.any(lit, axis=0) & ~np.all(lit, axis=0)) | \
+            (np.ptp(longitude, axis=0) > 180) | \
+            (np.ptp(local_time, axis=0) > 12) | \
+            (np.isfinite(centers.latitude) != np.all(on_mars, axis=0))
+        scales = [1, 1, 15, 1, 1, 1]
+        for exact, approximate, scale in zip(centers, interpolated, scales):
+            refine |= np.abs(exact - approximate) * scale > tolerance
+
+    dilated = np.pad(refine, 1)
+    dilated = np.any([dilated[r:r + refine.shape[0], c:c + refine.shape[1]]
+                      for r in range(3) for c in range(3)], axis=0)
+    return dilated
+
+
+def _bilinear(array: np.ndarray, row_cell: np.ndarray,
+              row_weight: np.ndarray, column_cell: np.ndarray,
+              column_weight: np.ndarray) -> np.ndarray:
+    # Interpolate the values at the cell corners to every pixel
+    top = array[row_cell][:, column_cell] * (1 - column_weight) + \
+        array[row_cell][:, column_cell + 1] * column_weight
+    bottom = array[row_cell + 1][:, column_cell] * (1 - column_weight) + \
+        array[row_cell + 1][:, column_cell + 1] * column_weight
+    return top + (bottom - top) * row_weight[:, np.newaxis]
+
+
+def _angle_between(u: np.ndarray, v: np.ndarray) -> np.ndarray:
+    # The same formulation as SPICE's vsep, which stays accurate for nearly
+    # parallel and nearly opposite vectors
+    u = u / np.linalg.norm(u, axis=-1, keepdims=True)
+    v = v / np.linalg.norm(v, axis=-1, keepdims=True)
+    dot = np.sum(u * v, axis=-1)
+    same = 2 * np.arcsin(np.minimum(np.linalg.norm(u - v, axis=-1) / 2, 1))
+    opposite = np.pi - 2 * np.arcsin(
+        np.minimum(np.linalg.norm(u + v, axis=-1) / 2, 1))
+    return np.where(dot > 0, same, opposite)
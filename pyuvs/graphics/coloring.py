@@ -4,7 +4,7 @@ import matplotlib.pyplot as plt
 import matplotlib.colors as colors
 from pyuvs.files import DataFilenameCollection
 from pyuvs.l1b.data_contents import L1bDataContents
-from pyuvs.l1b.data_classifier import DataClassifier
+from pyuvs.l1b.data import DataClassifier
 
 
 class Colormaps:
@@ -10,10 +10,10 @@ import matplotlib.colors as colors
 import matplotlib.ticker as ticker
 from scipy.ndimage import gaussian_filter
 from skimage.transform import resize
-import spiceypy as spice
 from pyuvs.files import FileFinder, DataFilenameCollection
+from pyuvs.geometry import pixel_geometry
 from pyuvs.l1b.data_contents import L1bDataContents
-from pyuvs.l1b.data_classifier import DataClassifier
+from pyuvs.l1b.data import DataClassifier
 from pyuvs.graphics.coloring import HistogramEqualizer
 from pyuvs.spice import Spice
 from pyuvs.constants import angular_slit_width as slit_width
@@ -285,7 +285,7 @@ class Quicklook:
             min_sza, max_sza, low_percentile, high_percentile)
         for c, f in enumerate(self.__files.filenames):
             l1b = L1bDataContents(f)
-            if not DataClassifier(f).dayside():
+            if not DataClassifier(l1b).dayside():
                 continue
             colors = heq.colorize_primary(l1b.primary) / 255
             reshaped_colors = self.__reshape_data_for_pcolormesh(colors)
@@ -479,64 +479,23 @@ class Quicklook:
                 [np.linspace(i, j, hifi_spa + 1) for i, j in zip(a, b)])
         # resize array to extract centers
         vec_arr = resize(vec_arr, (hifi_int, hifi_spa, 3), anti_aliasing=True)
-        # make empty arrays to hold geometry calculations
-        latitude = np.zeros((hifi_int, hifi_spa)) * np.nan
-        longitude = np.zeros((hifi_int, hifi_spa)) * np.nan
-        sza = np.zeros((hifi_int, hifi_spa)) * np.nan
-        phase_angle = np.zeros((hifi_int, hifi_spa)) * np.nan
-        emission_angle = np.zeros((hifi_int, hifi_spa)) * np.nan
-        local_time = np.zeros((hifi_int, hifi_spa)) * np.nan
+        # calculate the geometry of every high-resolution pixel at once. Every
+        # pixel in an integration shares its ephemeris time.
+        geometry = pixel_geometry(et_arr[:, 0], vec_arr)
+        latitude = geometry.latitude
+        longitude = geometry.longitude
+        sza = geometry.solar_zenith_angle
+        phase_angle = geometry.phase_angle
+        emission_angle = geometry.emission_angle
+        local_time = geometry.local_time
+        # convert latitude and longitude to pixel coordinates and make a
+        # corresponding magnetic field topology map
         context_map = np.zeros((hifi_int, hifi_spa, 4)) * np.nan
-
-        # calculate intercept latitude and longitude using SPICE, looping through each high-resolution pixel
-        target = 'Mars'
-        frame = 'IAU_Mars'
-        abcorr = 'LT+S'
-        observer = 'MAVEN'
-        body = 499  # Mars IAU code
-        for i in range(hifi_int):
-            for j in range(hifi_spa):
-                et = et_arr[i, j]
-                los_mid = vec_arr[i, j, :]
-                # try to perform the SPICE calculations and record the results
-                try:
-                    # calculate surface intercept
-                    spoint, trgepc, srfvec = spice.sincpt('Ellipsoid', target,
-                                                          et, frame, abcorr,
-                                                          observer, frame,
-                                                          los_mid)
-                    # calculate illumination angles
-                    trgepc, srfvec, phase_for, solar, emissn = spice.ilumin(
-                        'Ellipsoid', target, et, frame, abcorr,
-                        observer, spoint)
-                    # convert from rectangular to spherical coordinates
-                    rpoint, colatpoint, lonpoint = spice.recsph(spoint)
-                    # convert longitude from domain [-pi,pi) to [0,2pi)
-                    if lonpoint < 0.:
-                        lonpoint += 2 * np.pi
-                    # convert ephemeris time to local solar time
-                    hr, mn, sc, time, ampm = spice.et2lst(et, body, lonpoint,
-                                                          'planetocentric',
-                                                          timlen=256,
-                                                          ampmlen=256)
-                    # convert spherical coordinates to latitude and longitude in degrees
-                    latitude[i, j] = np.degrees(np.pi / 2 - colatpoint)
-                    longitude[i, j] = np.degrees(lonpoint)
-                    # convert illumination angles to degrees and record
-                    sza[i, j] = np.degrees(solar)
-                    phase_angle[i, j] = np.degrees(phase_for)
-                    emission_angle[i, j] = np.degrees(emissn)
-                    # convert local solar time to decimal hour
-                    local_time[i, j] = hr + mn / 60 + sc / 3600
-                    # convert latitude and longitude to pixel coordinates
-                    map_lat = int(np.round(np.degrees(colatpoint), 1) * 10)
-                    map_lon = int(np.round(np.degrees(lonpoint), 1) * 10)
-                    # make a corresponding magnetic field topology map
-                    context_map[i, j] = map_data[map_lat, map_lon]
-                # if the SPICE calculation fails, this (probably) means it didn't intercept the planet
-                except:
-                    # This pixel (or the vector) didn't intercept the planet
-                    pass
+        on_mars = np.isfinite(latitude)
+        map_lat = (np.round(90 - latitude[on_mars], 1) * 10).astype(int)
+        map_lon = (np.round(longitude[on_mars], 1) * 10).astype(int)
+        context_map[on_mars] = map_data[np.minimum(map_lat, 1799),
+                                        np.minimum(map_lon, 3599)]
         # get mirror angles
         angles = hdul['integration'].data[
                      'mirror_deg'] * 2  # convert from mirror angles to FOV angles
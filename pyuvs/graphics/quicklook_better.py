@@ -1,19 +1,21 @@
 
 from astropy.io import fits
 import copy
+from multiprocessing import Pool
 import os
 import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.colors as colors
 import matplotlib.ticker as ticker
-import spiceypy as spice
-import spiceypy.utils.exceptions
-from pyuvs.files import FileFinder, DataFilenameCollection, orbit_code
+from pyuvs.cache import ArrayCache
+from pyuvs.files import FileFinder, DataFilename, DataFilenameCollection
+from pyuvs.geometry import PixelGeometry, adaptive_pixel_geometry, \
+    pixel_geometry
 from pyuvs.l1b.data_contents import L1bDataContents
-from pyuvs.l1b.data_classifier import DataCollectionClassifier, DataClassifier
+from pyuvs.l1b.data import DataCollectionClassifier, DataClassifier
 from pyuvs.graphics.coloring import HistogramEqualizer
 from pyuvs.spice import Spice
-from pyuvs.constants import slit_width
+from pyuvs.constants import angular_slit_width as slit_width
 
 
 # TODO: Add ability to choose spectral indices in HistogramEqualizer
@@ -52,7 +54,9 @@ class ApoapseMUVQuicklookCreator:
 class ApoapseMUVQuicklook:
     def __init__(self, files: DataFilenameCollection, flatfield: np.ndarray,
                  swath_numbers: list[int], dayside: list[bool], flip: bool,
-                 spice_directory: str) -> None:
+                 spice_directory: str,
+                 geometry_cache_directory: str = None,
+                 n_workers: int = 1) -> None:
         self.__files = files
         self.__flatfield = flatfield
         self.__swath_numbers = swath_numbers
@@ -60,6 +64,8 @@ class ApoapseMUVQuicklook:
         self.__dayside = dayside
         self.__flip = flip
         self.__spice_directory = spice_directory
+        self.__geometry_cache_directory = geometry_cache_directory
+        self.__n_workers = n_workers
 
         self.__axes = self.__setup_fig_and_axes()
 
@@ -137,7 +143,9 @@ class ApoapseMUVQuicklook:
         geography_map = SurfaceGeographyMap()
         field_map = MagneticFieldMap()
         hrgc = HighResolutionGeometryCreator(
-            self.__spice_directory, geography_map.array, field_map.array, 200, self.__flip)
+            self.__spice_directory, geography_map.array, field_map.array, 200,
+            self.__flip, n_workers=self.__n_workers,
+            cache_directory=self.__geometry_cache_directory)
 
         map_ql = self.__setup_map_quicklook()
         lt_bundle = self.__setup_local_time_bundle()
@@ -145,8 +153,8 @@ class ApoapseMUVQuicklook:
         ea_bundle = self.__setup_emission_angle_bundle()
         pa_bundle = self.__setup_phase_angle_bundle()
 
-        for c, f in enumerate(self.__files.filenames):
-            arrays = hrgc.swath_geometry(L1bDataContents(f))
+        geometries = hrgc.swath_geometries(self.__files.filenames)
+        for c, arrays in enumerate(geometries):
 
             map_ql.plot_precomputed_swath_map(
                 arrays.geography_map, arrays.x, arrays.y, arrays.cx,
@@ -168,7 +176,9 @@ class ApoapseMUVQuicklook:
         geography_map = SurfaceGeographyMap()
         field_map = MagneticFieldMap()
         hrgc = HighResolutionGeometryCreator(
-            self.__spice_directory, geography_map.array, field_map.array, 200, self.__flip)
+            self.__spice_directory, geography_map.array, field_map.array, 200,
+            self.__flip, n_workers=self.__n_workers,
+            cache_directory=self.__geometry_cache_directory)
 
         map_bundle = self.__setup_magnetic_field_bundle()
         lt_bundle = self.__setup_local_time_bundle()
@@ -176,9 +186,8 @@ class ApoapseMUVQuicklook:
         ea_bundle = self.__setup_emission_angle_bundle()
         pa_bundle = self.__setup_phase_angle_bundle()
 
-        for c, f in enumerate(self.__files.filenames):
-            print(c)
-            arrays = hrgc.swath_geometry(L1bDataContents(f))
+        geometries = hrgc.swath_geometries(self.__files.filenames)
+        for c, arrays in enumerate(geometries):
 
             if self.__dayside[c]:
                 map_bundle.plot_precomputed_swath_map(
@@ -408,25 +417,265 @@ class QuicklookColorbarBundle(Quicklook, Colorbar):
 
 
 class HighResolutionGeometryCreator:
+    """Compute the geometry of swaths on a grid finer than the detector's.
+
+    Parameters
+    ----------
+    spice_directory
+        Absolute path to the directory where SPICE files live.
+    geography_map
+        The map of Mars's surface to sample.
+    field_map
+        The map of Mars's magnetic field to sample.
+    artificial_positions
+        The number of positions in the finer grid.
+    flip
+        Whether the swaths were beta angle flipped.
+    n_workers
+        The number of worker processes :meth:`swath_geometries` uses. Default
+        is 1, which computes the geometry in this process. :code:`None` uses
+        one per CPU. Each worker gets its own copy of the maps, so a pool only
+        pays off for many swaths.
+    cache_directory
+        Absolute path of the directory where :meth:`swath_geometries` caches
+        the geometry of each file. Default is :code:`None`, which does not
+        use a cache.
+    adaptive
+        Whether to only solve the geometry exactly near the limb and
+        terminator, and interpolate it elsewhere. See
+        :func:`pyuvs.geometry.adaptive_pixel_geometry`. Default is
+        :code:`False`.
+
+    Notes
+    -----
+    SPICE keeps its kernels in global state, so it cannot be used from
+    several threads at once. Each worker process instead loads its own copy of
+    the kernels once, when it starts.
+
+    """
     def __init__(self, spice_directory, geography_map: np.ndarray,
                  field_map: np.ndarray,
-                 artificial_positions: int, flip: bool):
+                 artificial_positions: int, flip: bool, n_workers: int = 1,
+                 cache_directory: str = None, adaptive: bool = False):
         Spice().load_spice(spice_directory)
+        self.__spice_directory = spice_directory
         self.__geography_map = geography_map
         self.__field_map = field_map
         self.__positions = artificial_positions
         self.__flip = flip
+        self.__n_workers = n_workers
+        self.__adaptive = adaptive
+        self.__cache = None if cache_directory is None else \
+            SwathGeometryCache(cache_directory, geography_map, field_map,
+                               artificial_positions, flip, adaptive=adaptive)
 
     def swath_geometry(self, file: L1bDataContents):
         return _SwathGeometryCreator(
             file, self.__geography_map, self.__field_map,
-            self.__positions, self.__flip).arrays
+            self.__positions, self.__flip, self.__adaptive).arrays
+
+    def swath_geometries(self, files: list[DataFilename]) \
+            -> list['_SwathArrays']:
+        """Compute the geometry of several files, using a pool of worker
+        processes if this object has more than one worker.
+
+        Parameters
+        ----------
+        files
+            The files to compute the geometry of.
+
+        Returns
+        -------
+        list[_SwathArrays]
+            The geometry of each file, in single precision.
+
+        Notes
+        -----
+        If this object has a cache, only the files that are not already in it
+        are computed, and they are added to it.
+
+        """
+        geometries = [None] * len(files)
+        if self.__cache is not None:
+            geometries = [self.__cache.load(f) for f in files]
+        missing = [c for c, arrays in enumerate(geometries) if arrays is None]
+        computed = self.__compute_swath_geometries(
+            [files[c].path for c in missing])
+        for c, arrays in zip(missing, computed):
+            geometries[c] = arrays
+            if self.__cache is not None:
+                self.__cache.save(files[c], arrays)
+        return geometries
+
+    def __compute_swath_geometries(self, paths: list[str]) \
+            -> list['_SwathArrays']:
+        settings = (self.__geography_map, self.__field_map, self.__positions,
+                    self.__flip, self.__adaptive)
+        if not paths:
+            return []
+        if self.__n_workers == 1:
+            return [_single_precision_swath_geometry(f, settings)
+                    for f in paths]
+        with Pool(processes=self.__n_workers,
+                  initializer=_initialize_geometry_worker,
+                  initargs=(self.__spice_directory, settings)) as pool:
+            return pool.map(_compute_swath_geometry, paths, chunksize=1)
+
+
+# Increment this whenever a change to the geometry changes its output, so that
+# geometry cached by older code is no longer used.
+_geometry_version = 1
+
+
+class SwathGeometryCache:
+    """Store the high-resolution geometry of swaths on disk.
+
+    Entries are keyed by the identity of the data file (its orbit, segment,
+    channel, timestamp, version, and revision), the resolution and flip of
+    the swath, the maps it samples, and the currently furnished SPICE
+    kernels. Geometry is stored in single precision. Sampled maps whose
+    values are all integers from 0 to 255, like RGB images, are stored as
+    bytes.
+
+    Parameters
+    ----------
+    directory
+        Absolute path of the directory where the cache lives.
+    geography_map
+        The map of Mars's surface the geometry samples.
+    field_map
+        The map of Mars's magnetic field the geometry samples.
+    artificial_positions
+        The number of positions in the finer grid.
+    flip
+        Whether the swaths were beta angle flipped.
+    adaptive
+        Whether the geometry is adaptively interpolated.
+
+    Notes
+    -----
+    The kernels that the geometry is computed from must be furnished before
+    this object is made.
+
+    """
+    def __init__(self, directory: str, geography_map: np.ndarray,
+                 field_map: np.ndarray, artificial_positions: int,
+                 flip: bool, adaptive: bool = False) -> None:
+        self.__cache = ArrayCache(directory, 'swath_geometry')
+        self.__settings = ArrayCache.make_key(
+            _geometry_version, artificial_positions, flip, adaptive,
+            Spice.furnished_kernels(), np.asarray(geography_map),
+            np.asarray(field_map))
+
+    def key(self, filename: DataFilename) -> str:
+        """Make the cache key of a data file.
+
+        Parameters
+        ----------
+        filename
+            The data file.
+
+        """
+        return ArrayCache.make_key(
+            filename.level, filename.segment, filename.orbit,
+            filename.channel, filename.timestamp, filename.version,
+            filename.revision, self.__settings)
+
+    def load(self, filename: DataFilename) -> '_SwathArrays':
+        """Load the cached geometry of a data file.
+
+        Parameters
+        ----------
+        filename
+            The data file.
+
+        Returns
+        -------
+        _SwathArrays
+            The geometry, or :code:`None` if the file is not in the cache.
+
+        """
+        arrays = self.__cache.load(self.key(filename))
+        return None if arrays is None else _unpack_swath_arrays(arrays)
+
+    def save(self, filename: DataFilename, arrays: '_SwathArrays') -> None:
+        """Store the geometry of a data file.
+
+        Parameters
+        ----------
+        filename
+            The data file.
+        arrays
+            The geometry of the file.
+
+        """
+        self.__cache.save(self.key(filename), _pack_swath_arrays(arrays))
+
+    def clear(self) -> None:
+        """Remove every cached geometry.
+
+        """
+        self.__cache.clear()
+
+
+_swath_array_names = ('latitude', 'longitude', 'local_time',
+                      'solar_zenith_angle', 'emission_angle', 'phase_angle',
+                      'geography_map', 'field_map', 'x', 'y', 'cx', 'cy')
+
+
+def _pack_swath_arrays(arrays: '_SwathArrays') -> dict:
+    # Maps are only sampled on Mars, so off-Mars pixels (where latitude is
+    # NaN) are restored when unpacking and needn't be stored as NaN
+    packed = {f: getattr(arrays, f).astype(np.float32)
+              for f in _swath_array_names}
+    on_mars = np.isfinite(arrays.latitude)
+    for name in ['geography_map', 'field_map']:
+        values = getattr(arrays, name)
+        sampled = values[on_mars]
+        if np.all((sampled >= 0) & (sampled <= 255) &
+                  (sampled == np.round(sampled))):
+            packed[name] = np.where(np.isnan(values), 0, values)\
+                .astype(np.uint8)
+    return packed
+
+
+def _unpack_swath_arrays(packed: dict) -> '_SwathArrays':
+    arrays = _SwathArrays(*packed['latitude'].shape)
+    on_mars = np.isfinite(packed['latitude'])
+    for name in _swath_array_names:
+        values = packed[name].astype(np.float32)
+        if packed[name].dtype == np.uint8:
+            values[~on_mars] = np.nan
+        setattr(arrays, name, values)
+    return arrays
+
+
+# The settings of each geometry worker process, set when the worker starts
+_geometry_worker_settings = ()
+
+
+def _initialize_geometry_worker(spice_directory: str, settings: tuple) \
+        -> None:
+    global _geometry_worker_settings
+    Spice().load_spice(spice_directory)
+    _geometry_worker_settings = settings
+
+
+def _compute_swath_geometry(path: str) -> '_SwathArrays':
+    return _single_precision_swath_geometry(path, _geometry_worker_settings)
+
+
+def _single_precision_swath_geometry(path: str, settings: tuple) \
+        -> '_SwathArrays':
+    with L1bDataContents(DataFilename(path, check_path=False)) as file:
+        return _SwathGeometryCreator(file, *settings).arrays.as_float32()
 
 
 class _SwathGeometryCreator:
     def __init__(self, file: L1bDataContents, geography_map: np.ndarray,
                  field_map: np.ndarray,
-                 artificial_positions: int, flip: bool):
+                 artificial_positions: int, flip: bool,
+                 adaptive: bool = False):
         self.__file = file
         self.__geography_map = geography_map
         self.__field_map = field_map
@@ -434,13 +683,7 @@ class _SwathGeometryCreator:
         self.__integrations = self.__get_artificial_integrations()
         self.__arrays = _SwathArrays(self.__integrations, self.__positions)
         self.__flip = flip
-
-        self.__target = 'Mars'
-        self.__frame = 'IAU_Mars'
-        self.__abcorr = 'LT+S'
-        self.__observer = 'MAVEN'
-        self.__body = 499
-        self.__method = 'Ellipsoid'
+        self.__adaptive = adaptive
 
         self.__et = self.__expand_et_to_new_pixel_centers()
         self.__pixel_vec = self.__expand_pixel_vec_to_new_pixel_centers()
@@ -491,51 +734,19 @@ class _SwathGeometryCreator:
         return (rescaled_pixel_vec_edges[:-1, :-1, :] +
                 rescaled_pixel_vec_edges[1:, 1:, :])/2
 
-    def __compute_pixel_surface_intercept(self, et, pixel_vector):
-        return spice.sincpt(
-            self.__method, self.__target, et, self.__frame, self.__abcorr,
-            self.__observer, self.__frame, pixel_vector)
-
-    def __compute_illumination_angles(self, et, spoint):
-        return spice.ilumin(
-            self.__method, self.__target, et, self.__frame, self.__abcorr,
-            self.__observer, spoint)
-
-    def __get_pixel_values(self, et, pixel_vector):
-        try:
-            spoint, trgepc, srfvec = \
-                self.__compute_pixel_surface_intercept(et, pixel_vector)
-            trgepc, srfvec, phase, solar, emission = \
-                self.__compute_illumination_angles(et, spoint)
-        except spiceypy.utils.exceptions.NotFoundError:
-            return np.nan, np.nan, np.nan, np.nan, np.nan, np.nan, np.nan, \
-                   np.nan
-
-        rpoint, colatpoint, lonpoint = spice.recsph(spoint)
-
-        if lonpoint < 0:
-            lonpoint += 2 * np.pi
-
-        hr, mn, sc, time, ampm = spice.et2lst(
-            et, self.__body, lonpoint, 'planetocentric', timlen=256,
-            ampmlen=256)
-
-        latitude = np.degrees(np.pi / 2 - colatpoint)
-        longitude = np.degrees(lonpoint)
-        local_time = hr + mn / 60 + sc / 3600
-        solar_zenith_angle = np.degrees(solar)
-        emission_angle = np.degrees(emission)
-        phase_angle = np.degrees(phase)
-        map_lat = int(np.round(np.degrees(colatpoint), 1) * 10)
-        map_lon = int(np.round(np.degrees(lonpoint), 1) * 10)
-        if map_lat == 1800:
-            map_lat = 1799
-        if map_lon == 3600:
-            map_lon = 3599
-        geography_map = self.__geography_map[map_lat, map_lon]
-        field_map = self.__field_map[map_lat, map_lon]
-        return latitude, longitude, local_time, solar_zenith_angle, \
-               emission_angle, phase_angle, geography_map, field_map
+    @staticmethod
+    def __sample_map(array: np.ndarray,
+                     geometry: PixelGeometry) -> np.ndarray:
+        # The maps have 0.1 degree pixels, starting from the north pole and
+        # the prime meridian
+        values = np.zeros(geometry.latitude.shape + array.shape[2:]) * np.nan
+        on_mars = np.isfinite(geometry.latitude)
+        map_lat = (np.round(90 - geometry.latitude[on_mars], 1) * 10)\
+            .astype(int)
+        map_lon = (np.round(geometry.longitude[on_mars], 1) * 10).astype(int)
+        values[on_mars] = array[np.minimum(map_lat, 1799),
+                                np.minimum(map_lon, 3599)]
+        return values
 
     def __make_pcolormesh_angles(self):
         angles = self.__file['integration'].data['mirror_deg'] * 2
@@ -558,38 +769,23 @@ class _SwathGeometryCreator:
         return x, y, cx, cy
 
     def __fill_high_resolution_arrays(self):
-        latitude = self.__arrays.latitude
-        longitude = self.__arrays.longitude
-        local_time = self.__arrays.local_time
-        solar_zenith_angle = self.__arrays.solar_zenith_angle
-        emission_angle = self.__arrays.emission_angle
-        phase_angle = self.__arrays.phase_angle
-        geography_map = self.__arrays.geography_map
-        field_map = self.__arrays.field_map
-        for i in range(latitude.shape[0]):
-            for j in range(latitude.shape[1]):
-                et = self.__et[i, j]
-                pixel_vector = self.__pixel_vec[i, j, :]
-                lat, lon, lt, sza, ea, pa, geo_map, b_map = \
-                    self.__get_pixel_values(et, pixel_vector)
-                latitude[i, j] = lat
-                longitude[i, j] = lon
-                local_time[i, j] = lt
-                solar_zenith_angle[i, j] = sza
-                emission_angle[i, j] = ea
-                phase_angle[i, j] = pa
-                geography_map[i, j] = geo_map
-                field_map[i, j] = b_map
+        # Every artificial pixel in an integration shares its ephemeris time
+        if self.__adaptive:
+            geometry = adaptive_pixel_geometry(self.__et[:, 0],
+                                               self.__pixel_vec)
+        else:
+            geometry = pixel_geometry(self.__et[:, 0], self.__pixel_vec)
         x, y, cx, cy = self.__make_pcolormesh_angles()
 
-        self.__arrays.latitude = latitude
-        self.__arrays.longitude = longitude
-        self.__arrays.local_time = local_time
-        self.__arrays.solar_zenith_angle = solar_zenith_angle
-        self.__arrays.emission_angle = emission_angle
-        self.__arrays.phase_angle = phase_angle
-        self.__arrays.geography_map = geography_map
-        self.__arrays.field_map = field_map
+        self.__arrays.latitude = geometry.latitude
+        self.__arrays.longitude = geometry.longitude
+        self.__arrays.local_time = geometry.local_time
+        self.__arrays.solar_zenith_angle = geometry.solar_zenith_angle
+        self.__arrays.emission_angle = geometry.emission_angle
+        self.__arrays.phase_angle = geometry.phase_angle
+        self.__arrays.geography_map = self.__sample_map(
+            self.__geography_map, geometry)
+        self.__arrays.field_map = self.__sample_map(self.__field_map, geometry)
         self.__arrays.x = x
         self.__arrays.y = y
         self.__arrays.cx = cx
@@ -620,6 +816,16 @@ class _SwathArrays:
     def __make_array_of_nans(shape: tuple) -> np.ndarray:
         return np.zeros(shape) * np.nan
 
+    def as_float32(self) -> '_SwathArrays':
+        """Get a copy of these arrays in single precision, which halves their
+        size.
+
+        """
+        arrays = copy.copy(self)
+        for name in _swath_array_names:
+            setattr(arrays, name, getattr(self, name).astype(np.float32))
+        return arrays
+
     @property
     def latitude(self):
         return self.__latitude
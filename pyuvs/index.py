@@ -0,0 +1,315 @@
+"""The index module keeps a persistent index of the IUVS data files on one's
+computer so that finding files does not require scanning the file system.
+"""
+import os
+import sqlite3
+from pyuvs.files import DataFilename, DataFilenameCollection, \
+    _version_order
+from pyuvs.l1b.metadata import read_l1b_summary, swath_numbers
+
+
+_schema = '''
+CREATE TABLE IF NOT EXISTS directories (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    directory TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    filename TEXT NOT NULL,
+    level TEXT NOT NULL,
+    segment TEXT NOT NULL,
+    orbit INTEGER NOT NULL,
+    channel TEXT,
+    timestamp TEXT NOT NULL,
+    version TEXT NOT NULL,
+    revision TEXT NOT NULL,
+    extension TEXT NOT NULL,
+    n_integrations INTEGER,
+    first_mirror_angle REAL,
+    last_mirror_angle REAL,
+    dayside INTEGER,
+    relay INTEGER,
+    geometry INTEGER,
+    beta_flip INTEGER,
+    swath INTEGER
+);
+CREATE INDEX IF NOT EXISTS files_by_orbit
+    ON files (orbit, segment, channel, level);
+CREATE INDEX IF NOT EXISTS files_by_directory ON files (directory);
+'''
+
+
+class FileIndex:
+    """Keep an index of the IUVS data files under a data root in a SQLite
+    database.
+
+    The index records every field of each file's name and, for level 1b files,
+    the classifications from :func:`~pyuvs.l1b.metadata.read_l1b_summary` and
+    the swath number. Once it is built, queries are database lookups instead
+    of file system scans.
+
+    Parameters
+    ----------
+    path
+        The absolute path of the IUVS data root.
+    database
+        The absolute path of the database file. It is created if it does not
+        exist.
+
+    Raises
+    ------
+    TypeError
+        Raised if path or database is not a str.
+
+    Notes
+    -----
+    :meth:`refresh` only rescans directories whose modification time changed
+    since the last refresh, so keeping the index up to date after new files
+    arrive is cheap. Files that are changed in place without changing their
+    directory are not noticed.
+
+    Examples
+    --------
+    >>> with FileIndex('/media/IUVS_data', '/home/me/iuvs.db') as index:  # doctest: +SKIP
+    ...     index.refresh()
+    ...     files = index.query(3000, 9000, segment='apoapse', channel='muv',
+    ...                         dayside=True)
+
+    """
+    def __init__(self, path: str, database: str) -> None:
+        self.__raise_type_error_if_not_str(path, 'path')
+        self.__raise_type_error_if_not_str(database, 'database')
+        self.__path = path
+        self.__connection = sqlite3.connect(database)
+        self.__connection.executescript(_schema)
+
+    @staticmethod
+    def __raise_type_error_if_not_str(value, name: str) -> None:
+        if not isinstance(value, str):
+            message = f'{name} must be a str.'
+            raise TypeError(message)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the database.
+
+        """
+        self.__connection.close()
+
+    def refresh(self) -> int:
+        """Bring the index up to date with the files under the data root.
+
+        Returns
+        -------
+        int
+            The number of directories that were rescanned.
+
+        """
+        indexed = dict(self.__connection.execute(
+            'SELECT path, mtime_ns FROM directories'))
+        present = self.__find_directories()
+        changed = {k: v for k, v in present.items() if indexed.get(k) != v}
+        removed = indexed.keys() - present.keys()
+
+        with self.__connection:
+            groups = set()
+            for directory in removed:
+                groups |= self.__remove_directory(directory)
+            for directory, mtime_ns in changed.items():
+                groups |= self.__scan_directory(directory, mtime_ns)
+            for group in groups:
+                self.__update_swath_numbers(*group)
+        return len(changed)
+
+    def __find_directories(self) -> dict:
+        directories = {}
+        pending = [self.__path]
+        while pending:
+            directory = pending.pop()
+            try:
+                directories[directory] = os.stat(directory).st_mtime_ns
+                with os.scandir(directory) as entries:
+                    pending.extend(f.path for f in entries if
+                                   f.is_dir(follow_symlinks=False))
+            except OSError:
+                continue
+        return directories
+
+    def __remove_directory(self, directory: str) -> set:
+        groups = self.__groups_in_directory(directory)
+        self.__connection.execute('DELETE FROM files WHERE directory = ?',
+                                  (directory,))
+        self.__connection.execute('DELETE FROM directories WHERE path = ?',
+                                  (directory,))
+        return groups
+
+    def __scan_directory(self, directory: str, mtime_ns: int) -> set:
+        indexed = {path: (size, mtime) for path, size, mtime in
+                   self.__connection.execute(
+                       'SELECT path, size, mtime_ns FROM files '
+                       'WHERE directory = ?', (directory,))}
+        present = {}
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.name.startswith('mvn_iuv_') and \
+                        entry.is_file() and \
+                        (entry.name.endswith('.fits') or
+                         entry.name.endswith('.fits.gz')):
+                    stat = entry.stat()
+                    present[entry.path] = (stat.st_size, stat.st_mtime_ns)
+
+        groups = self.__groups_in_directory(directory)
+        self.__connection.executemany(
+            'DELETE FROM files WHERE path = ?',
+            [(f,) for f in indexed.keys() - present.keys()])
+        for path, stat in present.items():
+            if indexed.get(path) != stat:
+                self.__index_file(path, directory, *stat)
+        self.__connection.execute(
+            'INSERT OR REPLACE INTO directories VALUES (?, ?)',
+            (directory, mtime_ns))
+        return groups | self.__groups_in_directory(directory)
+
+    def __groups_in_directory(self, directory: str) -> set:
+        return set(self.__connection.execute(
+            'SELECT DISTINCT segment, orbit, channel FROM files '
+            'WHERE directory = ? AND level = ?', (directory, 'l1b')))
+
+    def __index_file(self, path: str, directory: str, size: int,
+                     mtime_ns: int) -> None:
+        try:
+            filename = DataFilename(path)
+            fields = (filename.filename, filename.level, filename.segment,
+                      filename.orbit, filename.channel, filename.timestamp,
+                      filename.version, filename.revision, filename.extension)
+        except (FileNotFoundError, ValueError, IndexError):
+            return
+        # The index is organized by orbit, so files without one are skipped
+        if filename.orbit is None:
+            return
+        classifications = (None,) * 7
+        if filename.level == 'l1b':
+            try:
+                summary = read_l1b_summary(filename)
+                classifications = (
+                    summary.n_integrations, summary.first_mirror_angle,
+                    summary.last_mirror_angle, summary.dayside(),
+                    summary.relay(), summary.geometry(), summary.beta_flip())
+            except (OSError, ValueError, IndexError, KeyError, EOFError):
+                pass
+        self.__connection.execute(
+            'INSERT OR REPLACE INTO files VALUES '
+            '(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            (path, directory, size, mtime_ns, *fields, *classifications,
+             None))
+
+    def __update_swath_numbers(self, segment: str, orbit: int,
+                               channel: str) -> None:
+        # Like DataFilenameCollection, only the last version of each
+        # observation counts
+        rows = self.__connection.execute(
+            'SELECT path, timestamp, first_mirror_angle, last_mirror_angle, '
+            'version, revision FROM files WHERE level = ? AND segment = ? '
+            'AND orbit = ? AND channel IS ? ORDER BY timestamp',
+            ('l1b', segment, orbit, channel)).fetchall()
+        latest = {}
+        for row in rows:
+            if row[1] not in latest or \
+                    _version_order(row[4], row[5], row[0]) > \
+                    _version_order(latest[row[1]][4], latest[row[1]][5],
+                                   latest[row[1]][0]):
+                latest[row[1]] = row
+        paths = [f[0] for f in latest.values() if f[2] is not None]
+        first_angles = [f[2] for f in latest.values() if f[2] is not None]
+        last_angles = [f[3] for f in latest.values() if f[2] is not None]
+        self.__connection.execute(
+            'UPDATE files SET swath = NULL WHERE level = ? AND segment = ? '
+            'AND orbit = ? AND channel IS ?', ('l1b', segment, orbit, channel))
+        self.__connection.executemany(
+            'UPDATE files SET swath = ? WHERE path = ?',
+            zip(swath_numbers(first_angles, last_angles).tolist(), paths))
+
+    def paths(self, orbit_start: int = 0, orbit_end: int = 100000,
+              segment: str = '*', channel: str = '*', level: str = '*',
+              dayside: bool = None, relay: bool = None,
+              geometry: bool = None, beta_flip: bool = None) -> list[str]:
+        """Get the paths of the indexed files matching a query.
+
+        Parameters
+        ----------
+        orbit_start
+            The first orbit to get files from.
+        orbit_end
+            The orbit after the last orbit to get files from.
+        segment
+            The segment glob pattern to get files from.
+        channel
+            The channel glob pattern to get files from.
+        level
+            The data level glob pattern to get files from.
+        dayside
+            If given, only get files whose dayside classification matches.
+        relay
+            If given, only get files whose relay classification matches.
+        geometry
+            If given, only get files whose geometry classification matches.
+        beta_flip
+            If given, only get files whose beta flip classification matches.
+
+        """
+        conditions = ['orbit >= ?', 'orbit < ?', 'segment GLOB ?',
+                      "COALESCE(channel, '') GLOB ?", 'level GLOB ?']
+        values = [orbit_start, orbit_end, segment, channel, level]
+        for name, value in [('dayside', dayside), ('relay', relay),
+                            ('geometry', geometry), ('beta_flip', beta_flip)]:
+            if value is not None:
+                conditions.append(f'{name} = ?')
+                values.append(bool(value))
+        return [f[0] for f in self.__connection.execute(
+            f'SELECT path FROM files WHERE {" AND ".join(conditions)} '
+            f'ORDER BY path', values)]
+
+    def query(self, orbit_start: int = 0, orbit_end: int = 100000,
+              segment: str = '*', channel: str = '*', level: str = '*',
+              dayside: bool = None, relay: bool = None,
+              geometry: bool = None, beta_flip: bool = None) \
+            -> DataFilenameCollection:
+        """Make a DataFilenameCollection of the indexed files matching a
+        query. The parameters are the same as in :meth:`paths`.
+
+        Raises
+        ------
+        ValueError
+            Raised if no files match the query.
+
+        """
+        # The paths come straight from the index, so don't check they exist
+        return DataFilenameCollection(self.paths(
+            orbit_start, orbit_end, segment, channel, level, dayside, relay,
+            geometry, beta_flip), check_paths=False)
+
+    def swath_numbers(self, paths: list[str]) -> list[int]:
+        """Get the indexed swath number of each of a list of files.
+
+        Parameters
+        ----------
+        paths
+            The absolute paths of the files. Files that are not indexed level
+            1b files, or are not the latest version of an observation, have a
+            swath number of None.
+
+        """
+        swaths = []
+        for path in paths:
+            row = self.__connection.execute(
+                'SELECT swath FROM files WHERE path = ?', (path,)).fetchone()
+            swaths.append(None if row is None else row[0])
+        return swaths
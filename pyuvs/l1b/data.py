@@ -1,74 +1,18 @@
-from astropy.io import fits
+import weakref
 import numpy as np
-from pyuvs.files import DataFilename, DataFilenameCollection
+from pyuvs.files import DataFilenameCollection
 from pyuvs.l1b._files import L1bDataFilenameCollection
-
-
-class L1bDataContents:
-    def __init__(self, filename: DataFilename) -> None:
-        """
-
-        Parameters
-        ----------
-        filename
-        """
-        self.__hdulist = fits.open(filename.path)
-        self.__primary_shape = self.__primary_shape()
-
-    def __primary_shape(self) -> tuple[int, int, int]:
-        primary = self.__hdulist['primary'].data
-        ndims = np.ndim(primary)
-        if ndims == 2:
-            return primary[np.newaxis, :, :].shape
-        elif ndims == 3:
-            return primary.shape
-        else:
-            message = f'This file has {ndims} dimensions, not the standard 2 ' \
-                      f'or 3. Unsure how to deal with this file...'
-            raise IndexError(message)
-
-    def __getattr__(self, method):
-        return getattr(self.val, method)
-
-    def __getitem__(self, x):
-        return self.__hdulist[x]
-
-    def info(self) -> None:
-        """ Print info about the input file.
-
-        """
-        self.__hdulist.info()
-
-    @property
-    def n_integrations(self) -> int:
-        """ Get the number of integrations in this observation file.
-
-        """
-        return self.__primary_shape[0]
-
-    @property
-    def n_positions(self) -> int:
-        """ Get the number of detector positions in this observation file.
-
-        """
-        return self.__primary_shape[1]
-
-    @property
-    def n_wavelengths(self) -> int:
-        """ Get the number of wavelengths used in this observation file.
-
-        """
-        return self.__primary_shape[2]
-
-    @property
-    def hdulist(self) -> fits.hdu.hdulist.HDUList:
-        return self.__hdulist
+from pyuvs.l1b.data_contents import L1bDataContents
+from pyuvs.l1b.metadata import L1bFileSummary, has_geometry, \
+    is_beta_flipped, is_dayside, is_relay, read_l1b_summary, swath_numbers
 
 
 class DataClassifier:
     """Create an object that can classify L1b data.
 
-    DataClassifier can classify a single data file.
+    DataClassifier can classify a single data file. It needs an opened file;
+    :func:`~pyuvs.l1b.metadata.read_l1b_summary` gives the same classification
+    without opening the file.
 
     """
     def __init__(self, data_contents: L1bDataContents):
@@ -85,31 +29,31 @@ class DataClassifier:
         """Determine if the data file was beta angle flipped.
 
         """
-        sc = self.__contents['spacecraftgeometry'].data
-        vi = sc['vx_instrument_inertial'][-1]
-        vs = sc['v_spacecraft_rate_inertial'][-1]
-        return np.sign(np.dot(vi, vs)) > 0
+        vi = self.__contents.column('spacecraftgeometry',
+                                    'vx_instrument_inertial')[-1]
+        vs = self.__contents.column('spacecraftgeometry',
+                                    'v_spacecraft_rate_inertial')[-1]
+        return is_beta_flipped(vi, vs)
 
     def dayside(self) -> bool:
         """Determine if the data file was taken with dayside voltage settings.
 
         """
-        return self.__contents['observation'].data['mcp_volt'][0] < 790
+        return is_dayside(self.__contents.column('observation', 'mcp_volt')[0])
 
     def geometry(self) -> bool:
         """Determine if the data file contains geometry.
 
         """
-        lat = self.__contents['pixelgeometry'].data['pixel_corner_lat']
-        return ~np.isnan(lat.flatten()[0])
+        lat = self.__contents.column('pixelgeometry', 'pixel_corner_lat')
+        return has_geometry(lat.flat[0])
 
     def relay(self) -> bool:
         """Determine if the data file is a relay file.
 
         """
-        mirror_angles = self.__contents['integration'].data['mirror_deg']
-        return np.amin(mirror_angles) == 30.2508544921875 and \
-               np.amax(mirror_angles) == 59.6502685546875
+        mirror_angles = self.__contents.column('integration', 'mirror_deg')
+        return is_relay(np.amin(mirror_angles), np.amax(mirror_angles))
 
     def single_integration(self) -> bool:
         """Determine if the data file is a single integration.
@@ -121,6 +65,12 @@ class DataClassifier:
 class DataCollectionClassifier:
     """Classify a collection of level 1b files.
 
+    Each file is only read once, with
+    :func:`~pyuvs.l1b.metadata.read_l1b_summary`, no matter how many
+    classifications are asked for. The summaries are memoized on the
+    collection, so they are shared by every classifier made from it. The
+    :code:`any_*` methods stop reading files as soon as they find a match.
+
     Attributes
     ----------
     files
@@ -135,6 +85,7 @@ class DataCollectionClassifier:
     def __init__(self, files: DataFilenameCollection):
         L1bDataFilenameCollection(files)
         self.__files = files
+        self.__summaries = _get_collection_summaries(files)
 
     def swath_number(self) -> list[int]:
         """Compute the swath number associated with each of the files in the
@@ -144,61 +95,94 @@ class DataCollectionClassifier:
         is no way to ensure the list of files are complete.
 
         """
-        swath = []
-        current_swath = 0
-        first_file = True
-        for file in self.__files.filenames:
-            l1b = L1bDataContents(file)
-
-            # Determine which way the mirror is scanning
-            integration = l1b['integration'].data
-            positive_mirror_direction = integration['mirror_deg'][-1] - \
-                                        integration['mirror_deg'][0] > 0
-            starting_mirror_angle = integration['mirror_deg'][0]
-
-            # If it's the first file, it's obviously in the first swath
-            if first_file:
-                previous_ending_angle = integration['mirror_deg'][-1]
-                swath.append(0)
-                first_file = False
-                continue
-
-            if positive_mirror_direction and starting_mirror_angle < previous_ending_angle:
-                current_swath += 1
-            if not positive_mirror_direction and starting_mirror_angle > previous_ending_angle:
-                current_swath += 1
-
-            swath.append(current_swath)
-            previous_ending_angle = integration['mirror_deg'][-1]
-
-        return swath
+        table = self.__summaries.table
+        return swath_numbers(table['first_mirror_angle'],
+                             table['last_mirror_angle']).tolist()
+
+    def table(self) -> dict:
+        """Get every classification of every file as a table.
+
+        Returns
+        -------
+        dict
+            The columns of the table, keyed by name. There is one column for
+            each field of :class:`~pyuvs.l1b.metadata.L1bFileSummary` and for
+            each of its classifications, each holding one value per file.
+
+        """
+        return self.__summaries.table
 
     def dayside(self) -> list[bool]:
-        return [DataClassifier(L1bDataContents(f)).dayside() for f in self.__files]
+        return self.__summaries.table['dayside'].tolist()
 
     def all_dayside(self) -> bool:
         return all(self.dayside())
 
     def any_dayside(self) -> bool:
-        return any(self.dayside())
+        return any(f.dayside() for f in self.__summaries)
 
     def relay(self) -> list[bool]:
-        return [DataClassifier(L1bDataContents(f)).relay() for f in self.__files]
+        return self.__summaries.table['relay'].tolist()
 
     def all_relay(self) -> bool:
         return all(self.relay())
 
     def any_relay(self) -> bool:
-        return any(self.relay())
+        return any(f.relay() for f in self.__summaries)
 
     def geometry(self) -> list[bool]:
-        return [DataClassifier(L1bDataContents(f)).geometry() for f in self.__files]
+        return self.__summaries.table['geometry'].tolist()
 
     def all_geometry(self) -> bool:
         return all(self.geometry())
 
     def any_geometry(self) -> bool:
-        return any(self.geometry())
+        return any(f.geometry() for f in self.__summaries)
+
+
+class _CollectionSummaries:
+    """Read the summary of each file in a collection, at most once.
+
+    Iterating yields the summaries in the order of the files, only reading
+    the files that have not been read yet.
+
+    """
+    __classifications = ('beta_flip', 'dayside', 'geometry', 'relay',
+                         'single_integration')
+
+    def __init__(self, files: DataFilenameCollection) -> None:
+        self.__filenames = list(files.filenames)
+        self.__summaries = []
+        self.__table = None
+
+    def __iter__(self):
+        for index, filename in enumerate(self.__filenames):
+            if index == len(self.__summaries):
+                self.__summaries.append(read_l1b_summary(filename))
+            yield self.__summaries[index]
+
+    @property
+    def table(self) -> dict:
+        if self.__table is None:
+            summaries = list(self)
+            table = {field: np.array([getattr(f, field) for f in summaries])
+                     for field in L1bFileSummary._fields}
+            table.update({name: np.array([getattr(f, name)() for f in
+                                          summaries], dtype=bool)
+                          for name in self.__classifications})
+            self.__table = table
+        return self.__table
+
+
+_collection_summaries = weakref.WeakKeyDictionary()
+
+
+def _get_collection_summaries(files: DataFilenameCollection) \
+        -> _CollectionSummaries:
+    # Summaries live as long as the collection they describe
+    if files not in _collection_summaries:
+        _collection_summaries[files] = _CollectionSummaries(files)
+    return _collection_summaries[files]
 
 
 if __name__ == '__main__':
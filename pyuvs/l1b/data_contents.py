@@ -1,9 +1,15 @@
 """The data_contents module contains classes to extract info from an L1b data
 file.
 """
+import asyncio
+from collections import deque
+import gzip
+import io
+import itertools
+from typing import AsyncIterator
 from astropy.io import fits
 import numpy as np
-from pyuvs.files import DataFilename
+from pyuvs.files import DataFilename, DataFilenameCollection
 
 
 class _IUVSDataContents:
@@ -378,34 +384,102 @@ class _L1bPixelgeometryContents:
 
 
 class L1bDataContents:
-    def __init__(self, filename: DataFilename) -> None:
-        """
-
-        Parameters
-        ----------
-        filename
-        """
-        self.__hdulist = fits.open(filename.path)
-        self.__primary_shape = self.__primary_shape()
+    """Lazily access the contents of an L1b data file.
+
+    Uncompressed files are memory-mapped, and nothing is read from the file
+    until it is needed: HDUs are only parsed when they are first accessed and
+    binary table columns are only decoded when they are indexed. Getting the
+    number of integrations in a file, or one of its header keywords, therefore
+    does not read any of the data.
+
+    Parameters
+    ----------
+    filename
+        A single IUVS data filename.
+    data
+        The uncompressed contents of the file, if they were already read into
+        memory (see :func:`prefetch_l1b_contents`). If given, the file itself
+        is not opened.
+
+    Raises
+    ------
+    IndexError
+        Raised if the primary structure of the file does not have 2 or 3
+        dimensions.
+
+    Notes
+    -----
+    Each object holds an open file handle until it is closed. Use it as a
+    context manager when scanning many files:
+
+    >>> with L1bDataContents(filename) as l1b:  # doctest: +SKIP
+    ...     mirror_angles = l1b.column('integration', 'mirror_deg')
+
+    Arrays taken from a closed file remain valid.
 
-    def __primary_shape(self) -> tuple[int, int, int]:
-        primary = self.__hdulist['primary'].data
-        ndims = np.ndim(primary)
+    """
+    def __init__(self, filename: DataFilename, data: bytes = None) -> None:
+        source = filename.path if data is None else io.BytesIO(data)
+        self.__hdulist = fits.open(source, memmap=data is None,
+                                   lazy_load_hdus=True)
+        try:
+            self.__primary_shape = self.__read_primary_shape()
+        except BaseException:
+            self.__hdulist.close()
+            raise
+
+    def __read_primary_shape(self) -> tuple[int, int, int]:
+        header = self.__hdulist['primary'].header
+        ndims = header['naxis']
         if ndims == 2:
-            return primary[np.newaxis, :, :].shape
+            return 1, header['naxis2'], header['naxis1']
         elif ndims == 3:
-            return primary.shape
+            return header['naxis3'], header['naxis2'], header['naxis1']
         else:
             message = f'This file has {ndims} dimensions, not the standard 2 ' \
                       f'or 3. Unsure how to deal with this file...'
             raise IndexError(message)
 
-    def __getattr__(self, method):
-        return getattr(self.val, method)
-
     def __getitem__(self, x):
         return self.__hdulist[x]
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the file.
+
+        """
+        self.__hdulist.close()
+
+    def header(self, hdu) -> fits.Header:
+        """Get the header of an HDU without reading its data.
+
+        Parameters
+        ----------
+        hdu
+            The name or index of the HDU.
+
+        """
+        return self.__hdulist[hdu].header
+
+    def column(self, hdu, name: str) -> np.ndarray:
+        """Get a single column of a binary table HDU. Only this column is
+        decoded.
+
+        Parameters
+        ----------
+        hdu
+            The name or index of the HDU.
+        name
+            The name of the column.
+
+        """
+        return self.__hdulist[hdu].data[name]
+
     def info(self) -> None:
         """ Print info about the input file.
 
@@ -436,3 +510,62 @@ class L1bDataContents:
     @property
     def hdulist(self) -> fits.hdu.hdulist.HDUList:
         return self.__hdulist
+
+
+async def prefetch_l1b_contents(files: DataFilenameCollection,
+                                n_files: int = 4) \
+        -> AsyncIterator[L1bDataContents]:
+    """Iterate over the contents of each file in a collection, reading the
+    next files into memory while the current one is processed.
+
+    Files are read (and decompressed) in worker threads, so the reads carry on
+    even while the code using the current file does not await anything. This
+    hides the latency of first reads from a network mount.
+
+    Parameters
+    ----------
+    files
+        The files to read.
+    n_files
+        The number of files to read ahead. This many files are read at once
+        and held in memory.
+
+    Yields
+    ------
+    L1bDataContents
+        The contents of each file, in the order of the collection.
+
+    Raises
+    ------
+    ValueError
+        Raised if n_files is not positive.
+
+    Examples
+    --------
+    >>> async for l1b in prefetch_l1b_contents(files):  # doctest: +SKIP
+    ...     with l1b:
+    ...         mirror_angles = l1b.column('integration', 'mirror_deg')
+
+    """
+    if n_files < 1:
+        raise ValueError('n_files must be positive.')
+    filenames = iter(files.filenames)
+    reads = deque((f, asyncio.create_task(asyncio.to_thread(_read_file, f)))
+                  for f in itertools.islice(filenames, n_files))
+    try:
+        while reads:
+            filename, read = reads.popleft()
+            data = await read
+            for f in itertools.islice(filenames, 1):
+                reads.append(
+                    (f, asyncio.create_task(asyncio.to_thread(_read_file, f))))
+            yield L1bDataContents(filename, data)
+    finally:
+        for _, read in reads:
+            read.cancel()
+
+
+def _read_file(filename: DataFilename) -> bytes:
+    opener = gzip.open if filename.extension.endswith('gz') else open
+    with opener(filename.path, 'rb') as file:
+        return file.read()
@@ -1,3 +1,4 @@
+from functools import lru_cache
 import numpy as np
 from pyuvs.anc.flatfield import Flatfield, FlatfieldWavelengths
 
@@ -29,25 +30,17 @@ class MUVFlatfield:
         wavelengths
             The new wavelengths.
 
+        Notes
+        -----
+        The flatfield is linearly interpolated along both axes at once.
+        Regridded flatfields are cached by binning scheme, so files that share
+        a binning scheme (all the files from an orbit, typically) only pay for
+        the interpolation once. The cached flatfields are read-only.
+
         """
-        self.__val = self.__interpolate_to_positions(
-            n_positions, self.__interpolate_to_new_wavelengths(wavelengths))
-
-    def __interpolate_to_new_wavelengths(self, wavs: np.ndarray) -> np.ndarray:
-        return np.array(
-            [[np.interp(w, self.__wavelengths, self.val[pos, :]) for w in wavs]
-             for pos in range(self.__n_positions)])
-
-    def __interpolate_to_positions(self, n_positions: int,
-                                   trimmed_ff: np.ndarray) -> np.ndarray:
-        new_positions = np.linspace(0, self.__n_positions,
-                                    num=n_positions)
-        original_positions = np.linspace(0, self.__n_positions,
-                                         num=self.__n_positions)
-        return np.array(
-            [[np.interp(pos, original_positions, trimmed_ff[:, wav])
-              for wav in range(trimmed_ff.shape[-1])] for pos in new_positions]
-        )
+        wavelengths = np.ascontiguousarray(wavelengths, dtype=float)
+        self.__val = _regrid_flatfield(int(n_positions), wavelengths.tobytes(),
+                                       wavelengths.shape)
 
     @property
     def val(self):
@@ -55,3 +48,37 @@ class MUVFlatfield:
 
         """
         return self.__val
+
+
+@lru_cache(maxsize=32)
+def _regrid_flatfield(n_positions: int, wavelengths: bytes,
+                      wavelengths_shape: tuple[int]) -> np.ndarray:
+    flatfield = np.asarray(Flatfield())
+    original_n_positions = flatfield.shape[0]
+    new_wavelengths = np.frombuffer(wavelengths).reshape(wavelengths_shape)
+
+    # Separable linear interpolation: wavelengths first, then positions
+    index, weight = _linear_weights(new_wavelengths,
+                                    np.asarray(FlatfieldWavelengths()))
+    flatfield = flatfield[:, index] + \
+        (flatfield[:, index + 1] - flatfield[:, index]) * weight
+    index, weight = _linear_weights(
+        np.linspace(0, original_n_positions, num=n_positions),
+        np.linspace(0, original_n_positions, num=original_n_positions))
+    weight = weight.reshape((-1,) + (1,) * (flatfield.ndim - 1))
+    flatfield = flatfield[index] + \
+        (flatfield[index + 1] - flatfield[index]) * weight
+
+    flatfield.flags.writeable = False
+    return flatfield
+
+
+def _linear_weights(x: np.ndarray, xp: np.ndarray) \
+        -> tuple[np.ndarray, np.ndarray]:
+    # Get the index of the point in xp at or below each x and the fractional
+    # distance to the next point. Like np.interp, x outside xp is clamped to
+    # its ends.
+    x = np.clip(x, xp[0], xp[-1])
+    index = np.clip(np.searchsorted(xp, x, side='right') - 1, 0, len(xp) - 2)
+    weight = (x - xp[index]) / (xp[index + 1] - xp[index])
+    return index, weight
@@ -0,0 +1,356 @@
+"""The metadata module quickly reads the small amount of metadata needed to
+classify an L1b data file.
+
+Classifying a file only needs a handful of values from it, so rather than
+opening the file with astropy this module streams through it once: it parses
+each header, reads just the table rows that hold the needed values, and skips
+over everything else (including the primary image) without decoding it. This
+works the same on gzipped and uncompressed files.
+"""
+import gzip
+import re
+from typing import NamedTuple
+from astropy.io import fits
+import numpy as np
+from pyuvs.files import DataFilename
+
+
+_fits_block_size = 2880
+_relay_mirror_angles = (30.2508544921875, 59.6502685546875)
+
+
+def is_dayside(mcp_volt: float) -> bool:
+    """Determine if a detector voltage is a dayside voltage setting.
+
+    Parameters
+    ----------
+    mcp_volt
+        The MCP voltage of the observation.
+
+    """
+    return bool(mcp_volt < 790)
+
+
+def is_relay(minimum_mirror_angle: float, maximum_mirror_angle: float) \
+        -> bool:
+    """Determine if the extent of a mirror scan is that of a relay file.
+
+    Parameters
+    ----------
+    minimum_mirror_angle
+        The smallest mirror angle in the file [degrees].
+    maximum_mirror_angle
+        The largest mirror angle in the file [degrees].
+
+    """
+    return bool(minimum_mirror_angle == _relay_mirror_angles[0] and
+                maximum_mirror_angle == _relay_mirror_angles[1])
+
+
+def has_geometry(pixel_corner_latitude: float) -> bool:
+    """Determine if a file contains geometry from its first pixel corner
+    latitude.
+
+    Parameters
+    ----------
+    pixel_corner_latitude
+        The first pixel corner latitude in the file.
+
+    """
+    return not np.isnan(pixel_corner_latitude)
+
+
+def is_beta_flipped(instrument_velocity: np.ndarray,
+                    spacecraft_rate: np.ndarray) -> bool:
+    """Determine if the spacecraft was beta angle flipped.
+
+    Parameters
+    ----------
+    instrument_velocity
+        The instrument x-axis in inertial coordinates.
+    spacecraft_rate
+        The spacecraft rate in inertial coordinates.
+
+    """
+    return bool(np.sign(np.dot(instrument_velocity, spacecraft_rate)) > 0)
+
+
+def swath_numbers(first_mirror_angles: np.ndarray,
+                  last_mirror_angles: np.ndarray) -> np.ndarray:
+    """Compute the swath number of each file in a sequence of files.
+
+    A new swath starts whenever the mirror starts a file behind where it ended
+    the previous file. This assumes the files are a complete, time-ordered set
+    of files from a single orbit, segment, and channel---otherwise the result
+    has no real meaning.
+
+    Parameters
+    ----------
+    first_mirror_angles
+        The first mirror angle of each file [degrees].
+    last_mirror_angles
+        The last mirror angle of each file [degrees].
+
+    """
+    first_mirror_angles = np.asarray(first_mirror_angles)
+    last_mirror_angles = np.asarray(last_mirror_angles)
+    if first_mirror_angles.size == 0:
+        return np.zeros(0, dtype=int)
+    positive_mirror_direction = \
+        (last_mirror_angles - first_mirror_angles > 0)[1:]
+    starting_mirror_angle = first_mirror_angles[1:]
+    previous_ending_angle = last_mirror_angles[:-1]
+    new_swath = (positive_mirror_direction &
+                 (starting_mirror_angle < previous_ending_angle)) | \
+                (~positive_mirror_direction &
+                 (starting_mirror_angle > previous_ending_angle))
+    return np.concatenate(([0], np.cumsum(new_swath))).astype(int)
+
+
+class L1bFileSummary(NamedTuple):
+    """The metadata of an L1b file needed to classify it.
+
+    The spacecraft vectors are those of the final integration in the file.
+
+    """
+    n_integrations: int
+    mcp_volt: float
+    minimum_mirror_angle: float
+    maximum_mirror_angle: float
+    first_mirror_angle: float
+    last_mirror_angle: float
+    first_pixel_corner_latitude: float
+    instrument_velocity: tuple[float, float, float]
+    spacecraft_rate: tuple[float, float, float]
+
+    def beta_flip(self) -> bool:
+        """Determine if the data file was beta angle flipped.
+
+        """
+        return is_beta_flipped(self.instrument_velocity, self.spacecraft_rate)
+
+    def dayside(self) -> bool:
+        """Determine if the data file was taken with dayside voltage settings.
+
+        """
+        return is_dayside(self.mcp_volt)
+
+    def geometry(self) -> bool:
+        """Determine if the data file contains geometry.
+
+        """
+        return has_geometry(self.first_pixel_corner_latitude)
+
+    def relay(self) -> bool:
+        """Determine if the data file is a relay file.
+
+        """
+        return is_relay(self.minimum_mirror_angle, self.maximum_mirror_angle)
+
+    def single_integration(self) -> bool:
+        """Determine if the data file is a single integration.
+
+        """
+        return self.n_integrations == 1
+
+
+def read_l1b_summary(filename: DataFilename) -> L1bFileSummary:
+    """Read the metadata needed to classify an L1b file.
+
+    Parameters
+    ----------
+    filename
+        The L1b data file.
+
+    Raises
+    ------
+    ValueError
+        Raised if the file is missing any of the needed HDUs, or any of them
+        are empty.
+
+    Examples
+    --------
+    >>> summary = read_l1b_summary(filename)  # doctest: +SKIP
+    >>> summary.dayside()  # doctest: +SKIP
+    False
+
+    """
+    opener = gzip.open if filename.path.endswith('.gz') else open
+    with opener(filename.path, 'rb') as file:
+        values = _L1bMetadataStream(file).values
+    mirror_angles = values['mirror_deg']
+    return L1bFileSummary(
+        n_integrations=values['n_integrations'],
+        mcp_volt=float(values['mcp_volt']),
+        minimum_mirror_angle=float(np.amin(mirror_angles)),
+        maximum_mirror_angle=float(np.amax(mirror_angles)),
+        first_mirror_angle=float(mirror_angles[0]),
+        last_mirror_angle=float(mirror_angles[-1]),
+        first_pixel_corner_latitude=float(
+            np.ravel(values['pixel_corner_lat'])[0]),
+        instrument_velocity=tuple(
+            float(f) for f in values['vx_instrument_inertial']),
+        spacecraft_rate=tuple(
+            float(f) for f in values['v_spacecraft_rate_inertial']))
+
+
+class _L1bMetadataStream:
+    """Read the classification metadata while streaming through a file.
+
+    Each needed column is read from a single row---the first, the last, or all
+    of them---which is given as a row index (or None for all rows).
+
+    """
+    __needed_columns = {
+        'integration': {'mirror_deg': None},
+        'spacecraftgeometry': {'vx_instrument_inertial': -1,
+                               'v_spacecraft_rate_inertial': -1},
+        'pixelgeometry': {'pixel_corner_lat': 0},
+        'observation': {'mcp_volt': 0}}
+
+    def __init__(self, file) -> None:
+        self.__file = file
+        self.__values = {}
+        self.__read()
+
+    def __read(self) -> None:
+        remaining = set(self.__needed_columns)
+        header = self.__read_header()
+        if header is None:
+            raise ValueError('The file is empty.')
+        self.__values['n_integrations'] = self.__n_integrations(header)
+        self.__skip(_data_size(header))
+
+        while remaining:
+            header = self.__read_header()
+            if header is None:
+                message = f'The file is missing the ' \
+                          f'{", ".join(sorted(remaining))} HDUs.'
+                raise ValueError(message)
+            name = str(header.get('extname', '')).lower()
+            if name in remaining:
+                remaining.remove(name)
+                self.__read_table(header, self.__needed_columns[name])
+            else:
+                self.__skip(_data_size(header))
+
+    def __read_header(self):
+        try:
+            return fits.Header.fromfile(self.__file, padding=True)
+        except EOFError:
+            return None
+
+    @staticmethod
+    def __n_integrations(header: fits.Header) -> int:
+        ndims = header['naxis']
+        if ndims == 2:
+            return 1
+        elif ndims == 3:
+            return header['naxis3']
+        else:
+            message = f'This file has {ndims} dimensions, not the standard 2 ' \
+                      f'or 3. Unsure how to deal with this file...'
+            raise IndexError(message)
+
+    def __read_table(self, header: fits.Header, columns: dict) -> None:
+        layout = _BinaryTableLayout(header)
+        # Read the single span of rows holding every needed value
+        row_ranges = {column: layout.row_range(row)
+                      for column, row in columns.items()}
+        first_row = min(f[0] for f in row_ranges.values())
+        last_row = max(f[1] for f in row_ranges.values())
+        self.__skip(first_row * layout.row_size)
+        rows = self.__file.read((last_row - first_row) * layout.row_size)
+        position = last_row * layout.row_size
+        for column, (start, stop) in row_ranges.items():
+            values = layout.decode(rows, column, first_row, start, stop)
+            self.__values[column] = values if columns[column] is None else \
+                values[0]
+        self.__skip(_data_size(header) - position)
+
+    def __skip(self, n_bytes: int) -> None:
+        if n_bytes > 0:
+            self.__file.seek(n_bytes, 1)
+
+    @property
+    def values(self) -> dict:
+        return self.__values
+
+
+class _BinaryTableLayout:
+    """Locate columns within the rows of a binary table from its header.
+
+    """
+    __format_pattern = re.compile(r'^\s*(\d*)([LXBIJKAEDCMPQ])')
+    __byte_sizes = {'L': 1, 'B': 1, 'I': 2, 'J': 4, 'K': 8, 'A': 1, 'E': 4,
+                    'D': 8, 'C': 8, 'M': 16, 'P': 8, 'Q': 16}
+    __dtypes = {'B': 'u1', 'I': '>i2', 'J': '>i4', 'K': '>i8', 'E': '>f4',
+                'D': '>f8'}
+
+    def __init__(self, header: fits.Header) -> None:
+        self.__header = header
+        self.__row_size = header['naxis1']
+        self.__n_rows = header['naxis2']
+        self.__columns = self.__locate_columns()
+
+    def __locate_columns(self) -> dict:
+        columns = {}
+        offset = 0
+        for column in range(1, self.__header['tfields'] + 1):
+            repeat, code = self.__format_pattern.match(
+                self.__header[f'tform{column}']).groups()
+            repeat = int(repeat) if repeat else 1
+            name = str(self.__header[f'ttype{column}']).lower()
+            columns[name] = (offset, repeat, code, column)
+            offset += (repeat + 7) // 8 if code == 'X' else \
+                repeat * self.__byte_sizes[code]
+        return columns
+
+    def row_range(self, row) -> tuple[int, int]:
+        self.__raise_value_error_if_table_is_empty()
+        if row is None:
+            return 0, self.__n_rows
+        row = row % self.__n_rows
+        return row, row + 1
+
+    def __raise_value_error_if_table_is_empty(self) -> None:
+        if self.__n_rows == 0:
+            name = str(self.__header.get('extname', '')).lower()
+            message = f'The {name} table is empty.'
+            raise ValueError(message)
+
+    def decode(self, rows: bytes, name: str, first_row: int, start: int,
+               stop: int) -> np.ndarray:
+        try:
+            offset, repeat, code, column = self.__columns[name]
+        except KeyError as error:
+            message = f'The table does not have the column {name}.'
+            raise ValueError(message) from error
+        dtype = np.dtype(self.__dtypes[code])
+        values = np.ndarray(
+            shape=(stop - start, repeat), dtype=dtype, buffer=rows,
+            offset=(start - first_row) * self.__row_size + offset,
+            strides=(self.__row_size, dtype.itemsize))
+        scale = self.__header.get(f'tscal{column}', 1)
+        zero = self.__header.get(f'tzero{column}', 0)
+        values = values.astype(dtype.newbyteorder('='))
+        if scale != 1 or zero != 0:
+            values = values * scale + zero
+        return values[:, 0] if repeat == 1 else values
+
+    @property
+    def row_size(self) -> int:
+        return self.__row_size
+
+
+def _data_size(header: fits.Header) -> int:
+    # The size of an HDU's data, including its padding, from the FITS standard
+    n_axes = header.get('naxis', 0)
+    if n_axes == 0:
+        return 0
+    n_elements = np.prod([header[f'naxis{f}'] for f in range(1, n_axes + 1)],
+                         dtype=np.int64)
+    n_bits = abs(header['bitpix']) * header.get('gcount', 1) * \
+        (header.get('pcount', 0) + int(n_elements))
+    n_bytes = n_bits // 8
+    return -(-n_bytes // _fits_block_size) * _fits_block_size
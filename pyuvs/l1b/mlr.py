@@ -1,21 +1,20 @@
-import glob
-
-import matplotlib.pyplot as plt
-import matplotlib.colors as colors
+"""The mlr module fits spectral templates to level 1B data with multiple linear
+regression.
+"""
+from functools import lru_cache, partial
+from multiprocessing import Pool
+import warnings
+from astropy.io import fits
 import numpy as np
-import statsmodels.api as sm
+from pyuvs.cache import ArrayCache
 from pyuvs.l1b.data_contents import L1bDataContents
 from pyuvs.constants import cmos_pixel_well_depth, pixel_omega, kR
-from pyuvs.anc.templates import NitricOxideNightglow
-from pyuvs.anc.sensitivity import FUVCurve, FUVWavelengths, MUVCurve, \
-    MUVWavelengths
-from pyuvs.files import DataFilename
-
-from astropy.io import fits
-
-orbit_number = 5738
-files = sorted(glob.glob(
-    f'/Volumes/MAVEN Data/iuvs_data/level1b/orbit05700/*l1b_apoapse-orbit{orbit_number:0>5}-muv*.fits.gz'))
+from pyuvs.anc.templates import CO2PlusFDB, CO2PlusUltravioletDoublet, \
+    COCameronBands, COPlus1NG, N2VergardKaplan, NitricOxideNightglow, \
+    Oxygen2972
+from pyuvs.anc.sensitivity import FUVCurve, FUVWavelengths, \
+    PipelineMUVCurve, PipelineMUVWavelengths
+from pyuvs.files import DataFilename, DataFilenameCollection
 
 
 class _InstrumentSettings:
@@ -47,7 +46,7 @@ class _InstrumentSettings:
 
 class CalibrationCurve:
 
-    def __init__(self, instrument_settings: dict, sensitivity: _AuxiliaryDict):
+    def __init__(self, instrument_settings: dict, sensitivity: dict):
         self.__instrument_settings = instrument_settings
         self.__wavelength = sensitivity['wavelength']
         self.__sensitivity = sensitivity['sensitivity']
@@ -58,9 +57,9 @@ class CalibrationCurve:
 
         bin_omega = pixel_omega * self.__instrument_settings[
             'spatial_bin_width']
-        line_effective_area = np.array(
-            [np.interp(i, self.__wavelength, self.__sensitivity) for i in
-             self.__instrument_settings['wavelengths']])
+        line_effective_area = np.interp(
+            self.__instrument_settings['wavelengths'], self.__wavelength,
+            self.__sensitivity)
         return self.__instrument_settings['wavelength_width'] * \
                self.__instrument_settings['detector_gain'] * \
                self.__instrument_settings[
@@ -71,28 +70,68 @@ class CalibrationCurve:
         return self.__detector_calibration
 
 
+def detector_calibration_curve(instrument_settings: dict) -> np.ndarray:
+    """Get the detector calibration curve [DN/kR] of an observation.
+
+    Curves only depend on the channel, spatial binning, detector gain,
+    integration time, and wavelengths of an observation, which are shared by
+    most of the files in an orbit, so the most recently used curves are
+    memoized. The returned array is read-only.
+
+    Parameters
+    ----------
+    instrument_settings
+        The instrument settings of the observation, as made by
+        :class:`_InstrumentSettings`.
+
+    """
+    wavelengths = np.ascontiguousarray(instrument_settings['wavelengths'],
+                                       dtype=float)
+    return _cached_detector_calibration_curve(
+        instrument_settings['channel'],
+        int(instrument_settings['spatial_bin_width']),
+        float(instrument_settings['detector_gain']),
+        float(instrument_settings['integration_time']),
+        float(instrument_settings['wavelength_width']),
+        wavelengths.tobytes(), wavelengths.shape)
+
+
+@lru_cache(maxsize=32)
+def _cached_detector_calibration_curve(
+        channel: str, spatial_bin_width: int, detector_gain: float,
+        integration_time: float, wavelength_width: float,
+        wavelengths: bytes, wavelengths_shape: tuple[int]) -> np.ndarray:
+    settings = {'spatial_bin_width': spatial_bin_width,
+                'detector_gain': detector_gain,
+                'integration_time': integration_time,
+                'wavelength_width': wavelength_width,
+                'wavelengths': np.frombuffer(wavelengths).reshape(
+                    wavelengths_shape)}
+    curve = CalibrationCurve(settings, _load_sensitivity_curve(channel))
+    calibration = curve.detector_calibration
+    calibration.flags.writeable = False
+    return calibration
+
+
 class MLRFitter:
+    """Fit templates to a single spectrum with statsmodels.
+
+    This is the reference implementation of the fit. It makes one statsmodels
+    model per spectrum, so use :class:`BatchedMLRFitter` for anything larger
+    than a handful of spectra and keep this class for validation.
 
+    """
     def __init__(self, spectrum, spectrum_uncertainty, templates,
                  template_names):
         self.__spectrum = spectrum
         self.__spectrum_uncertainty = spectrum_uncertainty
-        self.__templates = self.__add_constant_to_templates(templates)
-        self.__template_names = self.__add_constant_to_template_names(
+        self.__templates = _add_constant_to_templates(templates)
+        self.__template_names = _add_constant_to_template_names(
             template_names)
         self.__fit = self.__fit_templates()
 
-    @staticmethod
-    def __add_constant_to_templates(templates):
-        return sm.add_constant(templates.T).T
-
-    @staticmethod
-    def __add_constant_to_template_names(template_names):
-        template_names = list(template_names)
-        template_names.insert(0, 'constant')
-        return np.array(template_names)
-
     def __fit_templates(self):
+        import statsmodels.api as sm
         weights = 1 / (self.__spectrum_uncertainty ** 2)
         model = sm.WLS(self.__spectrum, self.__templates.T, weights=weights)
         return model.fit()
@@ -143,17 +182,439 @@ class MLRFitter:
         return self.__fit.params[0]
 
 
+class TemplateMatrix:
+    """Hold a set of templates along with the precomputed factors used to fit
+    them.
+
+    The factors only depend on the templates, so one TemplateMatrix can be
+    reused to fit any number of spectra with :class:`BatchedMLRFitter`. All
+    arrays are read-only so that a matrix can safely be shared.
+
+    Parameters
+    ----------
+    templates
+        The templates to fit, with shape (n_templates, n_wavelengths).
+    template_names
+        The name of each template.
+
+    Raises
+    ------
+    ValueError
+        Raised if there is not one name per template.
+
+    """
+    def __init__(self, templates: np.ndarray,
+                 template_names: list[str]) -> None:
+        self.__templates = self.__make_read_only(
+            np.array(templates, dtype=float, ndmin=2))
+        self.__template_names = tuple(template_names)
+
+        self.__raise_value_error_if_names_do_not_match_templates()
+
+        self.__design = self.__make_read_only(
+            _add_constant_to_templates(self.__templates).T)
+        self.__feature_names = self.__make_read_only(
+            _add_constant_to_template_names(self.__template_names))
+        self.__gram_factors = self.__make_read_only(self.__make_gram_factors())
+        self.__pseudo_inverse = self.__make_read_only(
+            np.linalg.pinv(self.__design))
+        self.__normalized_covariance = self.__make_read_only(
+            np.linalg.pinv(self.__design.T @ self.__design, hermitian=True))
+        self.__rank = int(np.linalg.matrix_rank(self.__design))
+
+    def __raise_value_error_if_names_do_not_match_templates(self) -> None:
+        if len(self.__template_names) != self.__templates.shape[0]:
+            message = 'There must be one template name per template.'
+            raise ValueError(message)
+
+    @staticmethod
+    def __make_read_only(array: np.ndarray) -> np.ndarray:
+        array.flags.writeable = False
+        return array
+
+    def __make_gram_factors(self) -> np.ndarray:
+        n_wavelengths, n_features = self.__design.shape
+        return (self.__design[:, :, np.newaxis] *
+                self.__design[:, np.newaxis, :]).reshape(n_wavelengths,
+                                                         n_features ** 2)
+
+    @property
+    def templates(self) -> np.ndarray:
+        """Get the templates, with shape (n_templates, n_wavelengths).
+
+        """
+        return self.__templates
+
+    @property
+    def template_names(self) -> tuple[str]:
+        """Get the name of each template.
+
+        """
+        return self.__template_names
+
+    @property
+    def design(self) -> np.ndarray:
+        """Get the design matrix, with shape (n_wavelengths, n_features). The
+        first feature is the constant term.
+
+        """
+        return self.__design
+
+    @property
+    def feature_names(self) -> np.ndarray:
+        """Get the name of each feature, with the constant first.
+
+        """
+        return self.__feature_names
+
+    @property
+    def gram_factors(self) -> np.ndarray:
+        """Get the outer product of the design matrix with itself at each
+        wavelength, flattened to shape (n_wavelengths, n_features**2).
+
+        Notes
+        -----
+        Multiplying weights of shape (n_spectra, n_wavelengths) by this matrix
+        gives the weighted Gram matrix :math:`X^T W X` of every spectrum with a
+        single matrix product.
+
+        """
+        return self.__gram_factors
+
+    @property
+    def pseudo_inverse(self) -> np.ndarray:
+        """Get the pseudo-inverse of the design matrix, with shape
+        (n_features, n_wavelengths).
+
+        Notes
+        -----
+        A spectrum whose weights are equal at every wavelength has its
+        coefficients given by this matrix times the spectrum, whatever the
+        weight.
+
+        """
+        return self.__pseudo_inverse
+
+    @property
+    def normalized_covariance(self) -> np.ndarray:
+        """Get the pseudo-inverse of the unweighted Gram matrix
+        :math:`X^T X`, with shape (n_features, n_features).
+
+        """
+        return self.__normalized_covariance
+
+    @property
+    def rank(self) -> int:
+        """Get the rank of the design matrix.
+
+        """
+        return self.__rank
+
+
+@lru_cache(maxsize=16)
+def nightside_muv_template_matrix(spectral_bin_width: int,
+                                  spectral_pixel_start: int,
+                                  n_wavelengths: int,
+                                  wavelength_width: float) -> TemplateMatrix:
+    """Make the matrix of nightside MUV templates for a binning table.
+
+    IUVS only uses a handful of binning tables, so the most recently used
+    matrices are memoized and files sharing a binning table share a matrix.
+
+    Parameters
+    ----------
+    spectral_bin_width
+        The number of detector pixels in each spectral bin.
+    spectral_pixel_start
+        The first detector pixel in the spectral direction.
+    n_wavelengths
+        The number of spectral bins in the data.
+    wavelength_width
+        The width of each spectral bin [nm].
+
+    """
+    templates = _make_nightside_muv_templates()
+    pixel_start = int(spectral_pixel_start / spectral_bin_width)
+    array = np.array(list(templates.values()))
+    if spectral_bin_width != 1:
+        array = _rebin_templates(array, spectral_bin_width, wavelength_width)
+    return TemplateMatrix(array[:, pixel_start:pixel_start + n_wavelengths],
+                          list(templates.keys()))
+
+
+def _rebin_templates(templates: np.ndarray, bin_width: int,
+                     wavelength_width: float) -> np.ndarray:
+    # Like the pipeline, this only keeps bins that start before the final
+    # bin_width detector pixels
+    n_bins = len(range(0, templates.shape[-1] - bin_width, bin_width))
+    rebinned = templates[:, :n_bins * bin_width].reshape(
+        templates.shape[0], n_bins, bin_width).sum(axis=-1)
+    return rebinned / np.sum(rebinned * wavelength_width, axis=-1,
+                             keepdims=True)
+
+
+class BatchedMLRFitter:
+    """Fit templates to many spectra at once with weighted least squares.
+
+    This solves the same problem as :class:`MLRFitter` but for every spectrum
+    in one set of stacked NumPy linear algebra calls. The spectra can have any
+    leading shape---(n_integrations, n_positions) for a file, or the
+    integrations of several files stacked together for an orbit---as long as
+    the last axis is wavelength.
+
+    Parameters
+    ----------
+    spectra
+        The spectra to fit. The last axis must be wavelength.
+    spectra_uncertainty
+        The uncertainty of each spectral element. Must have the same shape as
+        :code:`spectra`.
+    templates
+        The templates to fit.
+
+    Raises
+    ------
+    ValueError
+        Raised if the shapes of the inputs are incompatible.
+
+    Notes
+    -----
+    A constant term is fit along with the templates, as in
+    :class:`MLRFitter`. Spectra containing a non-finite value or a non-positive
+    uncertainty are not fit; all of their outputs are NaN.
+
+    """
+    def __init__(self, spectra: np.ndarray, spectra_uncertainty: np.ndarray,
+                 templates: TemplateMatrix) -> None:
+        self.__spectra = np.asarray(spectra, dtype=float)
+        self.__spectra_uncertainty = np.asarray(spectra_uncertainty,
+                                                dtype=float)
+        self.__matrix = templates
+
+        self.__raise_value_error_if_shapes_do_not_match()
+
+        self.__coefficients, self.__uncertainties, self.__residuals, \
+            self.__rsquared = self.__fit_templates()
+
+    def __raise_value_error_if_shapes_do_not_match(self) -> None:
+        if self.__spectra.shape != self.__spectra_uncertainty.shape:
+            message = 'spectra and spectra_uncertainty must have the same ' \
+                      'shape.'
+            raise ValueError(message)
+        if self.__spectra.shape[-1] != self.__matrix.design.shape[0]:
+            message = 'The last axis of spectra must have the same length ' \
+                      'as the templates.'
+            raise ValueError(message)
+
+    def __fit_templates(self):
+        n_wavelengths, n_features = self.__matrix.design.shape
+        leading_shape = self.__spectra.shape[:-1]
+
+        spectra = self.__spectra.reshape(-1, n_wavelengths)
+        uncertainty = self.__spectra_uncertainty.reshape(-1, n_wavelengths)
+        good = np.all(np.isfinite(spectra) & np.isfinite(uncertainty) &
+                      (uncertainty > 0), axis=-1)
+        weights = np.where(good[:, np.newaxis], uncertainty, 1) ** -2.
+
+        coefficients = np.full((spectra.shape[0], n_features), np.nan)
+        uncertainties = np.full((spectra.shape[0], n_features), np.nan)
+        residuals = np.full(spectra.shape, np.nan)
+        rsquared = np.full(spectra.shape[0], np.nan)
+
+        if np.any(good):
+            coefficients[good], uncertainties[good], residuals[good], \
+                rsquared[good] = self.__solve(spectra[good], weights[good])
+
+        return coefficients.reshape(leading_shape + (n_features,)), \
+            uncertainties.reshape(leading_shape + (n_features,)), \
+            residuals.reshape(leading_shape + (n_wavelengths,)), \
+            rsquared.reshape(leading_shape)
+
+    def __solve(self, spectra: np.ndarray, weights: np.ndarray):
+        design = self.__matrix.design
+        n_wavelengths, n_features = design.shape
+        n_spectra = spectra.shape[0]
+        normalized_covariance = np.empty((n_spectra, n_features, n_features))
+        coefficients = np.empty((n_spectra, n_features))
+
+        # When a spectrum has the same weight at every wavelength the weight
+        # cancels out of the coefficients, so the precomputed pseudo-inverse of
+        # the template matrix gives them directly.
+        uniform = np.all(weights == weights[:, :1], axis=-1)
+        normalized_covariance[uniform] = \
+            self.__matrix.normalized_covariance / \
+            weights[uniform, :1, np.newaxis]
+        coefficients[uniform] = spectra[uniform] @ \
+            self.__matrix.pseudo_inverse.T
+
+        # Otherwise each spectrum has its own weights, so the normal equations
+        # X^T W X b = X^T W y differ per spectrum. Build all of them at once
+        # from the precomputed per-wavelength outer products of X.
+        weighted = ~uniform
+        if np.any(weighted):
+            gram = (weights[weighted] @ self.__matrix.gram_factors).reshape(
+                -1, n_features, n_features)
+            moment = (weights[weighted] * spectra[weighted]) @ design
+            normalized_covariance[weighted] = np.linalg.pinv(gram,
+                                                             hermitian=True)
+            coefficients[weighted] = np.einsum(
+                'pij,pj->pi', normalized_covariance[weighted], moment)
+
+        residuals = spectra - coefficients @ design.T
+        weighted_ssr = np.sum(weights * residuals ** 2, axis=-1)
+        scale = weighted_ssr / (n_wavelengths - self.__matrix.rank)
+        uncertainties = np.sqrt(np.diagonal(
+            normalized_covariance, axis1=-2, axis2=-1) * scale[:, np.newaxis])
+
+        weighted_mean = np.sum(weights * spectra, axis=-1) / \
+            np.sum(weights, axis=-1)
+        centered_tss = np.sum(
+            weights * (spectra - weighted_mean[:, np.newaxis]) ** 2, axis=-1)
+        rsquared = 1 - weighted_ssr / centered_tss
+
+        return coefficients, uncertainties, residuals, rsquared
+
+    @property
+    def fit_coefficients(self) -> np.ndarray:
+        """Get the fit coefficients. The last axis is the feature, with the
+        constant first.
+
+        """
+        return self.__coefficients
+
+    @property
+    def fit_uncertainties(self) -> np.ndarray:
+        """Get the standard errors of the fit coefficients.
+
+        """
+        return self.__uncertainties
+
+    @property
+    def fit_residuals(self) -> np.ndarray:
+        """Get the unweighted residuals of the fit.
+
+        """
+        return self.__residuals
+
+    @property
+    def fit_rsquared(self) -> np.ndarray:
+        """Get the coefficient of determination of each fit.
+
+        """
+        return self.__rsquared
+
+    @property
+    def template_names(self) -> np.ndarray:
+        """Get the name of each feature, with the constant first.
+
+        """
+        return self.__matrix.feature_names
+
+    def get_integrated_intensity(self, calibration_curve: np.ndarray,
+                                 wavelength_width: float) -> np.ndarray:
+        """Get the integrated intensity of each template.
+
+        Parameters
+        ----------
+        calibration_curve
+            The calibration curve. Its last axis is wavelength and its leading
+            axes must broadcast against the leading axes of the spectra.
+        wavelength_width
+            The width of each wavelength bin.
+
+        """
+        return self.__integrate(self.__coefficients, calibration_curve,
+                                wavelength_width)
+
+    def get_integrated_intensity_uncertainty(
+            self, calibration_curve: np.ndarray,
+            wavelength_width: float) -> np.ndarray:
+        """Get the uncertainty of the integrated intensity of each template.
+
+        Parameters
+        ----------
+        calibration_curve
+            The calibration curve. Its last axis is wavelength and its leading
+            axes must broadcast against the leading axes of the spectra.
+        wavelength_width
+            The width of each wavelength bin.
+
+        """
+        return self.__integrate(self.__uncertainties, calibration_curve,
+                                wavelength_width)
+
+    def __integrate(self, values: np.ndarray, calibration_curve: np.ndarray,
+                    wavelength_width: float) -> np.ndarray:
+        calibration_curve = np.asarray(calibration_curve)
+        template_sums = np.sum(
+            self.__matrix.templates / calibration_curve[..., np.newaxis, :],
+            axis=-1) * wavelength_width
+        return values[..., 1:] * template_sums
+
+
+def _add_constant_to_templates(templates: np.ndarray) -> np.ndarray:
+    templates = np.asarray(templates, dtype=float)
+    return np.vstack([np.ones((1, templates.shape[-1])), templates])
+
+
+def _add_constant_to_template_names(template_names: list[str]) -> np.ndarray:
+    template_names = list(template_names)
+    template_names.insert(0, 'constant')
+    return np.array(template_names)
+
+
+def _load_sensitivity_curve(channel: str) -> dict:
+    if channel == 'muv':
+        # The pipeline retrieval deliberately uses the pipeline curve
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            return {'wavelength': PipelineMUVWavelengths(),
+                    'sensitivity': PipelineMUVCurve()}
+    return {'wavelength': FUVWavelengths(), 'sensitivity': FUVCurve()}
+
+
+def _make_nightside_muv_templates() -> dict:
+    return {'co2p_fdb': CO2PlusFDB(),
+            'co2p_uvd': CO2PlusUltravioletDoublet(),
+            'co_cameron_bands': COCameronBands(),
+            'cop_1ng': COPlus1NG(),
+            'n2_vk': N2VergardKaplan(),
+            'no_nightglow': NitricOxideNightglow(),
+            'o2972': Oxygen2972()}
+
+
 class PipelineMLR:
+    """Retrieve emission brightnesses from an L1b file in the same way as the
+    IUVS pipeline.
 
-    def __init__(self, contents: L1bDataContents):
+    Parameters
+    ----------
+    contents
+        The contents of an L1b data file.
+    reference
+        Fit each pixel separately with statsmodels instead of using
+        :class:`BatchedMLRFitter`. This is much slower and is only meant for
+        validation.
+
+    Raises
+    ------
+    ValueError
+        Raised if the file uses an unsupported binning table.
+
+    """
+    def __init__(self, contents: L1bDataContents, reference: bool = False):
         self.__l1b = contents
         self.__instrument_settings = _InstrumentSettings(contents).settings
         self.__raise_value_error_if_invalid_binning_table()
         self.__saturation_threshold = self.__calculate_saturation_threshold()
-        self.__sensitivity_curve = self.__load_sensitivity_curve()
-        self.__detector_calibration = self.__calculate_calibration_curve()
-        fit_array, radiance_array, uncertainty_array, features = self.__perform_pixel_by_pixel_mlr_fit()
-        self.__fits = fit_array
+        self.__detector_calibration = detector_calibration_curve(
+            self.__instrument_settings)
+        if reference:
+            radiance_array, uncertainty_array, features = \
+                self.__perform_pixel_by_pixel_mlr_fit()
+        else:
+            radiance_array, uncertainty_array, features = \
+                self.__perform_batched_mlr_fit()
         self.__radiances = radiance_array
         self.__uncertainties = uncertainty_array
         self.__features = features
@@ -169,49 +630,39 @@ class PipelineMLR:
             'spatial_bin_width'] * self.__instrument_settings[
                    'spectral_bin_width']
 
-    def __load_sensitivity_curve(self):
-        return MUVSensitivityPipeline() if self.__instrument_settings[
-                                               'channel'] == 'muv' else FUVSensitivity()
+    def __load_nightside_templates(self) -> TemplateMatrix:
+        # TODO: implement FUV fitting
+        return nightside_muv_template_matrix(
+            self.__instrument_settings['spectral_bin_width'],
+            self.__instrument_settings['spectral_pixel_start'],
+            self.__l1b.n_wavelengths,
+            float(self.__instrument_settings['wavelength_width']))
 
-    def __calculate_calibration_curve(self):
-        return CalibrationCurve(self.__instrument_settings,
-                                self.__sensitivity_curve).detector_calibration
+    def __get_spectra(self) -> tuple[np.ndarray, np.ndarray]:
+        shape = (self.__l1b.n_integrations, self.__l1b.n_positions,
+                 self.__l1b.n_wavelengths)
+        spectrum = self.__l1b['detector_dark_subtracted'].data.reshape(shape)
+        spectrum_uncertainty = self.__l1b['random_dn_unc'].data.reshape(shape)
+        return spectrum, spectrum_uncertainty
 
-    def __load_nightside_templates(self):
-
-        # TODO: implement FUV fitting
-        templates = NightsideMUVTemplates()
-
-        n_spectral_bins = int(
-            1024 / self.__instrument_settings['spectral_bin_width'])
-        pixel_start = int(self.__instrument_settings['spectral_pixel_start'] /
-                          self.__instrument_settings['spectral_bin_width'])
-        if n_spectral_bins != 1024:
-            return list(templates.keys()), np.array(
-                [self.__rebin_factor(templates[i]) for i in
-                 list(templates.keys())])[:,
-                                           pixel_start:pixel_start + l1b.n_wavelengths]
-        else:
-            return list(templates.keys()), np.array(
-                [templates[i] for i in list(templates.keys())])[:,
-                                           pixel_start:pixel_start + l1b.n_wavelengths]
-
-    def __rebin_factor(self, array: np.ndarray):
-        new_spectrum = np.array([np.sum(
-            array[i:i + self.__instrument_settings['spectral_bin_width']]) for i
-                                 in range(0, len(array) -
-                                          self.__instrument_settings[
-                                              'spectral_bin_width'],
-                                          self.__instrument_settings[
-                                              'spectral_bin_width'])])
-        new_spectrum /= np.sum(
-            new_spectrum * self.__instrument_settings['wavelength_width'])
-        return new_spectrum
+    def __perform_batched_mlr_fit(self):
+        templates = self.__load_nightside_templates()
+        spectrum, spectrum_uncertainty = self.__get_spectra()
+        fit = BatchedMLRFitter(spectrum, spectrum_uncertainty, templates)
+        radiance_array = fit.get_integrated_intensity(
+            self.__detector_calibration,
+            self.__instrument_settings['spectral_bin_width'])
+        uncertainty_array = fit.get_integrated_intensity_uncertainty(
+            self.__detector_calibration,
+            self.__instrument_settings['spectral_bin_width'])
+        return radiance_array, uncertainty_array, \
+            np.array(templates.template_names)
 
     def __perform_pixel_by_pixel_mlr_fit(self):
-        template_names, templates = self.__load_nightside_templates()
-        fit_array = np.zeros(
-            (self.__l1b.n_integrations, self.__l1b.n_positions), dtype=object)
+        matrix = self.__load_nightside_templates()
+        templates = matrix.templates
+        template_names = matrix.template_names
+        spectrum, spectrum_uncertainty = self.__get_spectra()
         radiance_array = np.zeros((self.__l1b.n_integrations,
                                    self.__l1b.n_positions, len(template_names)))
         uncertainty_array = np.zeros((self.__l1b.n_integrations,
@@ -219,13 +670,9 @@ class PipelineMLR:
                                       len(template_names)))
         for integration in range(self.__l1b.n_integrations):
             for spatial_bin in range(self.__l1b.n_positions):
-                spectrum = self.__l1b['detector_dark_subtracted'].data[
-                    integration, spatial_bin]
-                spectrum_uncertainty = self.__l1b['random_dn_unc'].data[
-                    integration, spatial_bin]
-                fit = MLRFitter(spectrum, spectrum_uncertainty, templates,
-                                template_names)
-                fit_array[integration, spatial_bin] = fit
+                fit = MLRFitter(spectrum[integration, spatial_bin],
+                                spectrum_uncertainty[integration, spatial_bin],
+                                templates, template_names)
                 radiance_array[
                     integration, spatial_bin] = fit.get_integrated_intensity(
                     self.__detector_calibration[spatial_bin],
@@ -234,8 +681,7 @@ class PipelineMLR:
                     integration, spatial_bin] = fit.get_integrated_intensity_uncertainty(
                     self.__detector_calibration[spatial_bin],
                     self.__instrument_settings['spectral_bin_width'])
-        return fit_array, radiance_array, uncertainty_array, np.array(
-            template_names)
+        return radiance_array, uncertainty_array, np.array(template_names)
 
     @property
     def no_nightglow_radiance(self):
@@ -264,12 +710,332 @@ class PipelineMLR:
         return np.sum(self.__uncertainties[:, :, ind], axis=2)
 
 
+_retrieval_products = ('aurora_radiance', 'aurora_uncertainty',
+                       'no_nightglow_radiance', 'no_nightglow_uncertainty')
+
+
+# Increment this whenever a change to the retrieval changes its output, so
+# that results cached by older code are no longer used.
+_retrieval_version = 1
+
+
+def _compute_products(filename: DataFilename) -> dict:
+    # The products are cast to float32 to halve what is sent back from
+    # worker processes and what is stored in the cache.
+    with L1bDataContents(filename) as contents:
+        mlr = PipelineMLR(contents)
+        return {f: getattr(mlr, f).astype(np.float32)
+                for f in _retrieval_products}
+
+
+def _retrieve_file(path: str, cache_directory: str = None) \
+        -> tuple[str, dict, str]:
+    # This runs in a worker process, so it takes and returns only plain,
+    # picklable objects.
+    filename = DataFilename(path)
+    try:
+        if cache_directory is None:
+            products = _compute_products(filename)
+        else:
+            products = MLRResultsCache(cache_directory).retrieve(filename)
+        return path, products, ''
+    except (OSError, ValueError, IndexError, KeyError) as error:
+        return path, {}, str(error)
+
+
+@lru_cache(maxsize=None)
+def _retrieval_fingerprint(channel: str) -> str:
+    templates = _make_nightside_muv_templates()
+    sensitivity = _load_sensitivity_curve(channel)
+    return ArrayCache.make_key(
+        _retrieval_version, tuple(templates.keys()),
+        *[np.asarray(f) for f in templates.values()],
+        np.asarray(sensitivity['wavelength']),
+        np.asarray(sensitivity['sensitivity']))
+
+
+class MLRResultsCache:
+    """Store the products of :class:`PipelineMLR` on disk.
+
+    Entries are keyed by the identity of the data file (its orbit, segment,
+    channel, timestamp, version, and revision), the templates and sensitivity
+    curve used in the fit, and the binning of the file. Retrieving a file
+    that is already in the cache only costs reading its primary header and
+    the cached arrays.
+
+    Parameters
+    ----------
+    directory
+        Absolute path of the directory where the cache lives.
+
+    """
+    def __init__(self, directory: str) -> None:
+        self.__cache = ArrayCache(directory, 'mlr')
+
+    def key(self, filename: DataFilename) -> str:
+        """Make the cache key of a data file.
+
+        Parameters
+        ----------
+        filename
+            The data file.
+
+        """
+        header = fits.getheader(filename.path)
+        return ArrayCache.make_key(
+            filename.level, filename.segment, filename.orbit,
+            filename.channel, filename.timestamp, filename.version,
+            filename.revision, _retrieval_fingerprint(header['xuv'].lower()),
+            header['spe_size'], header['spe_ofs'], header['spa_size'],
+            header['spa_ofs'])
+
+    def load(self, filename: DataFilename) -> dict:
+        """Load the cached products of a data file.
+
+        Parameters
+        ----------
+        filename
+            The data file.
+
+        Returns
+        -------
+        dict
+            The products keyed by name (e.g. 'aurora_radiance'), or
+            :code:`None` if the file is not in the cache.
+
+        """
+        return self.__cache.load(self.key(filename))
+
+    def save(self, filename: DataFilename, products: dict) -> None:
+        """Store the products of a data file.
+
+        Parameters
+        ----------
+        filename
+            The data file.
+        products
+            The products keyed by name.
+
+        """
+        self.__cache.save(self.key(filename), products)
+
+    def retrieve(self, filename: DataFilename) -> dict:
+        """Get the products of a data file, only running the fit if they are
+        not already in the cache.
+
+        Parameters
+        ----------
+        filename
+            The data file.
+
+        """
+        key = self.key(filename)
+        products = self.__cache.load(key)
+        if products is None:
+            products = _compute_products(filename)
+            self.__cache.save(key, products)
+        return products
+
+    def clear(self) -> None:
+        """Remove every cached product.
+
+        """
+        self.__cache.clear()
+
+
+class OrbitMLRRetrieval:
+    """Hold the MLR retrievals of all files from a single orbit.
+
+    The retrievals of each file are stacked along the integration axis, so
+    each product has shape (n_integrations, n_positions), where
+    n_integrations is the total across all files. Files with fewer positions
+    than the widest file are padded with NaNs.
+
+    Parameters
+    ----------
+    orbit
+        The orbit number.
+    filenames
+        The absolute path of each file, in the order they were stacked.
+    retrievals
+        The products retrieved from each file.
+
+    """
+    def __init__(self, orbit: int, filenames: list[str],
+                 retrievals: list[dict]) -> None:
+        self.__orbit = orbit
+        self.__filenames = filenames
+        self.__file_index = np.concatenate(
+            [np.full(r['aurora_radiance'].shape[0], c)
+             for c, r in enumerate(retrievals)])
+        self.__products = self.__stack_retrievals(retrievals)
+
+    @staticmethod
+    def __stack_retrievals(retrievals: list[dict]) -> dict:
+        n_positions = max(r['aurora_radiance'].shape[1] for r in retrievals)
+        products = {}
+        for product in _retrieval_products:
+            arrays = [r[product] for r in retrievals]
+            products[product] = np.concatenate(
+                [np.pad(a, ((0, 0), (0, n_positions - a.shape[1])),
+                        constant_values=np.nan) for a in arrays])
+        return products
+
+    @property
+    def orbit(self) -> int:
+        """Get the orbit number.
+
+        """
+        return self.__orbit
+
+    @property
+    def filenames(self) -> list[str]:
+        """Get the absolute path of each file in the retrieval.
+
+        """
+        return self.__filenames
+
+    @property
+    def file_index(self) -> np.ndarray:
+        """Get the index into :py:attr:`filenames` of each integration.
+
+        """
+        return self.__file_index
+
+    @property
+    def aurora_radiance(self) -> np.ndarray:
+        """Get the aurora radiance of each integration and position [kR].
+
+        """
+        return self.__products['aurora_radiance']
+
+    @property
+    def aurora_uncertainty(self) -> np.ndarray:
+        """Get the aurora radiance uncertainty of each integration and
+        position [kR].
+
+        """
+        return self.__products['aurora_uncertainty']
+
+    @property
+    def no_nightglow_radiance(self) -> np.ndarray:
+        """Get the NO nightglow radiance of each integration and position
+        [kR].
+
+        """
+        return self.__products['no_nightglow_radiance']
+
+    @property
+    def no_nightglow_uncertainty(self) -> np.ndarray:
+        """Get the NO nightglow radiance uncertainty of each integration and
+        position [kR].
+
+        """
+        return self.__products['no_nightglow_uncertainty']
+
+
+class CollectionMLR:
+    """Run :class:`PipelineMLR` on a collection of L1b files in parallel.
+
+    Each file is retrieved in its own task on a pool of worker processes and
+    the results are gathered into one :class:`OrbitMLRRetrieval` per orbit.
+
+    Parameters
+    ----------
+    files
+        The level 1b files to retrieve.
+    n_workers
+        The number of worker processes. Default is :code:`None`, which uses
+        one per CPU. If this is 1, the files are retrieved in this process.
+    tasks_per_worker
+        The number of files a worker retrieves before it is replaced with a
+        fresh process. This bounds how much memory each worker can hold on
+        to.
+    cache_directory
+        Absolute path of a directory to cache the products of each file in.
+        Default is :code:`None`, which does not use a cache. See
+        :class:`MLRResultsCache`.
+
+    Raises
+    ------
+    ValueError
+        Raised if any of the input files are not level 1b files.
+
+    Notes
+    -----
+    Files that cannot be retrieved (for instance, because they use an
+    unsupported binning table) are skipped and listed in
+    :py:attr:`failed_files`.
+
+    """
+    def __init__(self, files: DataFilenameCollection, n_workers: int = None,
+                 tasks_per_worker: int = 10,
+                 cache_directory: str = None) -> None:
+        self.__files = files
+        self.__n_workers = n_workers
+        self.__tasks_per_worker = tasks_per_worker
+        self.__cache_directory = cache_directory
+
+        self.__raise_value_error_if_not_all_l1b()
+
+        self.__failed_files = {}
+        self.__orbits = self.__gather_orbits(self.__retrieve_files())
+
+    def __raise_value_error_if_not_all_l1b(self) -> None:
+        if not self.__files.all_l1b():
+            message = 'Some files are not level 1b.'
+            raise ValueError(message)
+
+    def __retrieve_files(self) -> list[tuple[str, dict, str]]:
+        paths = [f.path for f in self.__files.filenames]
+        retrieve = partial(_retrieve_file,
+                           cache_directory=self.__cache_directory)
+        if self.__n_workers == 1:
+            return [retrieve(f) for f in paths]
+        with Pool(processes=self.__n_workers,
+                  maxtasksperchild=self.__tasks_per_worker) as pool:
+            return list(pool.imap(retrieve, paths, chunksize=1))
+
+    def __gather_orbits(self, results: list[tuple[str, dict, str]]) \
+            -> dict[int, OrbitMLRRetrieval]:
+        orbit_paths = {}
+        orbit_retrievals = {}
+        for filename, (path, products, error) in \
+                zip(self.__files.filenames, results):
+            if error:
+                self.__failed_files[path] = error
+                continue
+            orbit_paths.setdefault(filename.orbit, []).append(path)
+            orbit_retrievals.setdefault(filename.orbit, []).append(products)
+        return {orbit: OrbitMLRRetrieval(orbit, orbit_paths[orbit],
+                                         orbit_retrievals[orbit])
+                for orbit in orbit_paths}
+
+    @property
+    def orbits(self) -> dict[int, OrbitMLRRetrieval]:
+        """Get the retrievals of each orbit, keyed by orbit number.
+
+        """
+        return self.__orbits
+
+    @property
+    def failed_files(self) -> dict[str, str]:
+        """Get the files that could not be retrieved and the reason why.
+
+        """
+        return self.__failed_files
+
+
 if __name__ == '__main__':
-    df = DataFilename(files[7])
-    l1b = L1bDataContents(df)
-    img = PipelineMLR(l1b).aurora_radiance
-    img = plt.imshow(img, norm=colors.PowerNorm(gamma=1 / 2, vmin=0, vmax=10))
+    import matplotlib.pyplot as plt
+    import matplotlib.colors as colors
+    from pyuvs.files import FileFinder
+
+    orbit_number = 5738
+    files = FileFinder('/Volumes/MAVEN Data/iuvs_data/level1b').soschob(
+        orbit_number, segment='apoapse', channel='muv')
+    retrieval = CollectionMLR(files).orbits[orbit_number]
+    img = plt.imshow(retrieval.aurora_radiance,
+                     norm=colors.PowerNorm(gamma=1 / 2, vmin=0, vmax=10))
     plt.colorbar()
     plt.show()
-
-
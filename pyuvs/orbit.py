@@ -1,8 +1,16 @@
 """The spatial module performs pertinent spatial calculations.
 """
 from datetime import datetime
+import os
+import tempfile
+import warnings
 import numpy as np
 import spiceypy as spice
+from pyuvs.ephemeris import ephemeris
+
+
+# The ephemeris time just before MAVEN's first periapsis
+_orbit_insertion_et = 464623267
 
 
 class OrbitalGeometry:
@@ -25,7 +33,8 @@ class OrbitalGeometry:
         self.__observer = 'MAVEN'
 
     def find_maven_apsis_et(self, end_time: datetime = None,
-                            apsis: str = 'apoapse') \
+                            apsis: str = 'apoapse', start_et: float = None,
+                            first_orbit: int = 1) \
             -> tuple[np.ndarray, np.ndarray]:
         """Calculate the ephemeris times at either orbital apses between a start
         and end time. To do this, SPICE checks the Mars-MAVEN distance in steps
@@ -40,6 +49,12 @@ class OrbitalGeometry:
         apsis
             The apsis to get the ephemeris times for. Can be either 'apoapse' or
             'periapse'.
+        start_et
+            Ephemeris time to start looking for apses at. Default is
+            :code:`None`, which starts at MAVEN's orbit insertion.
+        first_orbit
+            The orbit number of the first apsis that is found. This only needs
+            to be set if start_et is.
 
         Returns
         -------
@@ -50,9 +65,7 @@ class OrbitalGeometry:
             range.
 
         """
-        # TODO: it'd be nice to be able to specify a start time. This is easy to
-        #  implement here, but I'm not sure how I'd compute orbit numbers.
-        et_start = 464623267
+        et_start = _orbit_insertion_et if start_et is None else start_et
         et_end = spice.datetime2et(datetime.utcnow()) if end_time is None \
             else spice.datetime2et(end_time)
 
@@ -60,28 +73,31 @@ class OrbitalGeometry:
         adjust = 0.
         step = 60.
 
-        cnfine = spice.utils.support_types.SPICEDOUBLE_CELL(2)
-        spice.wninsd(et_start, et_end, cnfine)
-        ninterval = round((et_end - et_start) / step)
-        result = spice.utils.support_types.SPICEDOUBLE_CELL(
-            round(1.1 * (et_end - et_start) / 4.5))
-
-        spice.gfdist(self.__target, self.__abcorr, self.__observer, relate,
-                     refval, adjust, step, ninterval, cnfine, result=result)
-        count = spice.wncard(result)
-        et_array = np.zeros(count)
-        if count == 0:
-            print('Result window is empty.')
-        else:
+        et_array = np.zeros(0)
+        if et_end > et_start:
+            cnfine = spice.utils.support_types.SPICEDOUBLE_CELL(2)
+            spice.wninsd(et_start, et_end, cnfine)
+            ninterval = round((et_end - et_start) / step)
+            result = spice.utils.support_types.SPICEDOUBLE_CELL(
+                round(1.1 * (et_end - et_start) / 4.5))
+
+            spice.gfdist(self.__target, self.__abcorr, self.__observer,
+                         relate, refval, adjust, step, ninterval, cnfine,
+                         result=result)
+            count = spice.wncard(result)
+            et_array = np.zeros(count)
             for i in range(count):
                 lr = spice.wnfetd(result, i)
                 left = lr[0]
                 right = lr[1]
                 if left == right:
                     et_array[i] = left
+        if len(et_array) == 0:
+            warnings.warn('Result window is empty.')
 
         # make array of orbit numbers
-        orbit_numbers = np.arange(1, len(et_array) + 1, 1, dtype=int)
+        orbit_numbers = np.arange(first_orbit, first_orbit + len(et_array),
+                                  dtype=int)
 
         # return orbit numbers and array of ephemeris times
         return orbit_numbers, et_array
@@ -100,14 +116,16 @@ class OrbitalGeometry:
             refval = 3396 + 6200
         return relate, refval
 
-    def spice_positions(self, et: float):
+    @staticmethod
+    def spice_positions(et: np.ndarray):
         """Calculate MAVEN spacecraft position, Mars solar longitude, and the
-        subsolar position for a given ephemeris time.
+        subsolar position for some ephemeris times.
 
         Parameters
         ----------
         et
-            Input epoch in ephemeris seconds past J2000.
+            Input epochs in ephemeris seconds past J2000. This can be a float
+            or an array of any shape.
 
         Returns
         -------
@@ -127,37 +145,18 @@ class OrbitalGeometry:
             Sub-solar longitudes in degrees.
         mars_sun_km: array
 
+        Notes
+        -----
+        See :func:`pyuvs.ephemeris.ephemeris`, which computes these.
+
         """
-        spoint, trgepc, srfvec = \
-            spice.subpnt('Intercept: ellipsoid', self.__target, et, 'IAU_MARS',
-                         self.__abcorr, self.__observer)
-        _, _, srvec_sun = \
-            spice.subpnt('Intercept: ellipsoid', self.__target, et, 'IAU_MARS',
-                         self.__abcorr, 'SUN')
-        rpoint, colatpoint, lonpoint = spice.recsph(spoint)
-        if lonpoint > np.pi:
-            lonpoint -= 2 * np.pi
-        subsc_lat = 90 - np.degrees(colatpoint)
-        subsc_lon = np.degrees(lonpoint)
-        sc_alt_km = np.sqrt(np.sum(srfvec ** 2))
-        mars_sun_km = np.sqrt(np.sum(srvec_sun**2))
-
-        # calculate subsolar position
-        sspoint, strgepc, ssrfvec = \
-            spice.subslr('Intercept: ellipsoid', self.__target, et, 'IAU_MARS',
-                         self.__abcorr, self.__observer)
-        srpoint, scolatpoint, slonpoint = spice.recsph(sspoint)
-        if slonpoint > np.pi:
-            slonpoint -= 2 * np.pi
-        subsolar_lat = 90 - np.degrees(scolatpoint)
-        subsolar_lon = np.degrees(slonpoint)
-
-        ls = np.degrees(spice.lspcn(self.__target, et, self.__abcorr))
-
-        return et, subsc_lat, subsc_lon, sc_alt_km, ls, subsolar_lat, \
-            subsolar_lon, mars_sun_km
-
-    def get_orbit_positions(self, end_time: datetime = None,) -> dict:
+        positions = ephemeris(et)
+        return positions.et, positions.subspacecraft_latitude, \
+            positions.subspacecraft_longitude, positions.spacecraft_altitude, \
+            positions.solar_longitude, positions.subsolar_latitude, \
+            positions.subsolar_longitude, positions.mars_sun_distance
+
+    def get_orbit_positions(self, end_time: datetime = None) -> np.ndarray:
         """Calculate orbit segment geometry.
 
         Parameters
@@ -168,7 +167,8 @@ class OrbitalGeometry:
         Returns
         -------
         orbit_data
-            Calculations of the following keys:
+            A structured array with one element per orbit and the following
+            fields:
 
             * orbit_number: The relative orbit number.
             * et: The ephemeris time [seconds past J2000].
@@ -180,9 +180,12 @@ class OrbitalGeometry:
             * subsolar_lon: The sub-solar longitude [degrees].
             * mars_sun_dist: The Mars-sun distance [km].
 
-        All of these values are calculated for 3 times: The start of the orbit
-        (which is 21.4 minutes before periapsis), periapsis, and apoapsis. The
-        arrays stored in the keys are indexed in this order.
+        All of these values except the orbit number are calculated for 3
+        times: The start of the orbit (which is 21.4 minutes before
+        periapsis), periapsis, and apoapsis. These fields have shape
+        (n_orbits, 3) and are indexed in this order. Each apoapsis belongs to
+        the orbit whose periapsis it follows, and orbits without an apoapsis
+        have NaN apoapsis values.
 
         """
         # get ephemeris times for orbit apoapse and periapse points
@@ -190,77 +193,242 @@ class OrbitalGeometry:
             self.find_maven_apsis_et(end_time=end_time, apsis='periapse')
         _, apoapse_et = \
             self.find_maven_apsis_et(end_time=end_time, apsis='apoapse')
-        n_orbits = len(orbit_numbers)
-
-        et, subsc_lat, subsc_lon, sc_alt, mars_sun_dist, solar_longitude, \
-        subsolar_lat, subsolar_lon = \
-            self.__compute_geometry_arrays(n_orbits, periapse_et, apoapse_et)
-
-        orbit_data = {
-            'orbit_number': orbit_numbers,
-            'et': et,
-            'subsc_lat': subsc_lat,
-            'subsc_lon': subsc_lon,
-            'subsc_alt': sc_alt,
-            'solar_longitude': solar_longitude,
-            'subsolar_lat': subsolar_lat,
-            'subsolar_lon': subsolar_lon,
-            'mars_sun_dist': mars_sun_dist,
-        }
-        return orbit_data
-
-    def __compute_geometry_arrays(self, n_orbits, periapse_et, apoapse_et):
-        et = self.__make_array_of_nans((n_orbits, 3))
-        subsc_lat = self.__make_array_of_nans((n_orbits, 3))
-        subsc_lon = self.__make_array_of_nans((n_orbits, 3))
-        sc_alt = self.__make_array_of_nans((n_orbits, 3))
-        mars_sun_dist = self.__make_array_of_nans((n_orbits, 3))
-        solar_longitude = self.__make_array_of_nans((n_orbits, 3))
-        subsolar_lat = self.__make_array_of_nans((n_orbits, 3))
-        subsolar_lon = self.__make_array_of_nans((n_orbits, 3))
-
-        return self.__fill_arrays_with_calculations(
-            n_orbits, et, subsc_lat, subsc_lon, sc_alt, mars_sun_dist,
-            solar_longitude, subsolar_lat, subsolar_lon, periapse_et,
-            apoapse_et)
+        return _orbit_positions(orbit_numbers, periapse_et,
+                                _pair_apoapses(periapse_et, apoapse_et))
+
+
+# The fields of the orbit positions, as named by get_orbit_positions, and
+# the names of the Ephemeris fields that fill them
+_orbit_position_fields = {
+    'et': 'et',
+    'subsc_lat': 'subspacecraft_latitude',
+    'subsc_lon': 'subspacecraft_longitude',
+    'subsc_alt': 'spacecraft_altitude',
+    'solar_longitude': 'solar_longitude',
+    'subsolar_lat': 'subsolar_latitude',
+    'subsolar_lon': 'subsolar_longitude',
+    'mars_sun_dist': 'mars_sun_distance'}
+
+
+def _pair_apoapses(periapse_et: np.ndarray, apoapse_et: np.ndarray,
+                   paired_et: np.ndarray = None) -> np.ndarray:
+    # Get the apoapsis time of each orbit. Each apoapsis belongs to the orbit
+    # whose periapsis precedes it, so apoapses before the first periapsis are
+    # dropped. Orbits that already have an apoapsis in paired_et keep it.
+    paired_et = np.full(len(periapse_et), np.nan) if paired_et is None \
+        else np.copy(paired_et)
+    orbit = np.searchsorted(periapse_et, apoapse_et, side='right') - 1
+    new_apoapse = orbit >= 0
+    new_apoapse[new_apoapse] = np.isnan(paired_et[orbit[new_apoapse]])
+    paired_et[orbit[new_apoapse]] = apoapse_et[new_apoapse]
+    return paired_et
+
+
+def _orbit_positions(orbit_numbers: np.ndarray, periapse_et: np.ndarray,
+                     apoapse_et: np.ndarray) -> np.ndarray:
+    # apoapse_et has one (possibly NaN) time per orbit. See _pair_apoapses.
+    n_orbits = len(orbit_numbers)
+    positions = np.zeros(
+        n_orbits, dtype=[('orbit_number', int)] +
+        [(f, float, (3,)) for f in _orbit_position_fields])
+    positions['orbit_number'] = orbit_numbers
+
+    # Build the (n_orbits, 3) grid of orbit start, periapsis, and apoapsis
+    # times and compute all of them at once
+    et = np.full((n_orbits, 3), np.nan)
+    et[:, 0] = periapse_et - 1284
+    et[:, 1] = periapse_et
+    et[:, 2] = apoapse_et
+    known = np.isfinite(et)
+    values = ephemeris(et[known])
+
+    for field, name in _orbit_position_fields.items():
+        positions[field] = np.nan
+        positions[field][known] = getattr(values, name)
+    return positions
+
+
+class OrbitTable:
+    """Keep a table of MAVEN's orbits on disk, and extend it as new kernels
+    arrive.
+
+    The table holds the same orbit positions as
+    :meth:`OrbitalGeometry.get_orbit_positions`. Updating it only searches for
+    apses after the last known periapsis, so keeping it current only costs
+    the geometry of the new orbits.
+
+    Parameters
+    ----------
+    path
+        Absolute path of the .npz file holding the table. It is created the
+        first time the table is updated if it does not exist.
+
+    Raises
+    ------
+    TypeError
+        Raised if path is not a str.
+
+    Notes
+    -----
+    Each apoapsis is assigned to the orbit whose periapsis it follows.
+    Orbits are never recomputed once they have both apses, so if older
+    kernels are replaced with better reconstructions, delete the table to
+    rebuild it.
+
+    SPICE kernels must already be loaded to update the table. See
+    :class:`pyuvs.spice.Spice` for methods to do this.
+
+    """
+    def __init__(self, path: str) -> None:
+        self.__raise_type_error_if_not_str(path)
+        self.__path = path
+        self.__positions = self.__load()
 
     @staticmethod
-    def __make_array_of_nans(shape: tuple) -> np.ndarray:
-        return np.zeros(shape) * np.nan
-
-    def __fill_arrays_with_calculations(
-            self, n_orbits, et, subsc_lat, subsc_lon, sc_alt, mars_sun_dist,
-            solar_longitude, subsolar_lat, subsolar_lon, periapse_et,
-            apoapse_et):
-        for i in range(n_orbits):
-            for j in range(3):
-                # first do orbit start positions
-                if j == 0:
-                    tet, tsubsc_lat, tsubsc_lon, tsc_alt_km, tls, tsubsolar_lat, \
-                    tsubsolar_lon, mars_sun_km = self.spice_positions(
-                        periapse_et[i] - 1284)
-
-                # then periapse positions
-                elif j == 1:
-                    tet, tsubsc_lat, tsubsc_lon, tsc_alt_km, tls, tsubsolar_lat, \
-                    tsubsolar_lon, mars_sun_km = self.spice_positions(
-                        periapse_et[i])
-
-                # and finally apoapse positions
-                else:
-                    tet, tsubsc_lat, tsubsc_lon, tsc_alt_km, tls, tsubsolar_lat, \
-                    tsubsolar_lon, mars_sun_km = self.spice_positions(
-                        apoapse_et[i])
-
-                # place calculations into arrays
-                et[i, j] = tet
-                subsc_lat[i, j] = tsubsc_lat
-                subsc_lon[i, j] = tsubsc_lon
-                sc_alt[i, j] = tsc_alt_km
-                mars_sun_dist[i, j] = mars_sun_km
-                solar_longitude[i, j] = tls
-                subsolar_lat[i, j] = tsubsolar_lat
-                subsolar_lon[i, j] = tsubsolar_lon
-
-        return et, subsc_lat, subsc_lon, sc_alt, mars_sun_dist, \
-            solar_longitude, subsolar_lat, subsolar_lon
+    def __raise_type_error_if_not_str(path) -> None:
+        if not isinstance(path, str):
+            message = 'path must be a str.'
+            raise TypeError(message)
+
+    def __load(self) -> np.ndarray:
+        try:
+            with np.load(self.__path) as table:
+                return table['positions']
+        except FileNotFoundError:
+            return _orbit_positions(np.zeros(0, dtype=int), np.zeros(0),
+                                    np.zeros(0))
+
+    def __save(self) -> None:
+        directory = os.path.dirname(self.__path)
+        handle, temporary_path = tempfile.mkstemp(dir=directory,
+                                                  suffix='.tmp')
+        try:
+            with os.fdopen(handle, 'wb') as file:
+                np.savez(file, positions=self.__positions)
+            os.replace(temporary_path, self.__path)
+        except BaseException:
+            os.remove(temporary_path)
+            raise
+
+    def update(self, end_time: datetime = None) -> int:
+        """Add the orbits since the last known periapsis to the table, and
+        save it.
+
+        Parameters
+        ----------
+        end_time
+            Ending datetime to find orbits until. Default is :code:`None`,
+            which finds orbits up until today.
+
+        Returns
+        -------
+        int
+            The number of orbits that were added.
+
+        """
+        positions = self.__positions
+        n_known = len(positions)
+        start_et, first_orbit = None, 1
+        if n_known > 0:
+            start_et = positions['et'][-1, 1] + 60
+            first_orbit = positions['orbit_number'][-1] + 1
+
+        geometry = OrbitalGeometry()
+        # An empty window only means there are no new orbits yet
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            new_orbits, new_periapse_et = geometry.find_maven_apsis_et(
+                end_time=end_time, apsis='periapse', start_et=start_et,
+                first_orbit=first_orbit)
+            _, new_apoapse_et = geometry.find_maven_apsis_et(
+                end_time=end_time, apsis='apoapse', start_et=start_et)
+
+        orbit_numbers = np.concatenate([positions['orbit_number'],
+                                        new_orbits])
+        periapse_et = np.concatenate([positions['et'][:, 1], new_periapse_et])
+        known_apoapse_et = np.concatenate([positions['et'][:, 2],
+                                           np.full(len(new_orbits), np.nan)])
+        apoapse_et = _pair_apoapses(periapse_et, new_apoapse_et,
+                                    known_apoapse_et)
+
+        # Only recompute the orbits that changed
+        changed = np.isnan(known_apoapse_et) & ~np.isnan(apoapse_et)
+        first_changed = int(np.min(np.flatnonzero(changed), initial=n_known))
+        self.__positions = np.concatenate([
+            positions[:first_changed],
+            _orbit_positions(orbit_numbers[first_changed:],
+                             periapse_et[first_changed:],
+                             apoapse_et[first_changed:])])
+        self.__save()
+        return len(new_orbits)
+
+    def orbit_positions(self, orbits: np.ndarray) -> np.ndarray:
+        """Look up the positions of some orbits.
+
+        Parameters
+        ----------
+        orbits
+            The orbit numbers. This can be an int or an array of any shape.
+
+        Returns
+        -------
+        np.ndarray
+            The rows of the table for those orbits, with the shape of orbits.
+
+        Raises
+        ------
+        ValueError
+            Raised if any of the orbits are not in the table.
+
+        """
+        orbits = np.asarray(orbits)
+        known = self.__positions['orbit_number']
+        index = np.clip(np.searchsorted(known, orbits), 0,
+                        max(len(known) - 1, 0))
+        self.__raise_value_error_if_unknown_orbits(orbits, index)
+        return self.__positions[index]
+
+    def __raise_value_error_if_unknown_orbits(self, orbits: np.ndarray,
+                                              index: np.ndarray) -> None:
+        known = self.__positions['orbit_number']
+        if len(known) == 0 or np.any(known[index] != orbits):
+            message = 'orbits contains orbits that are not in the table.'
+            raise ValueError(message)
+
+    def orbit_at(self, et: np.ndarray) -> np.ndarray:
+        """Find the orbit that contains some ephemeris times.
+
+        Orbits start 21.4 minutes before periapsis.
+
+        Parameters
+        ----------
+        et
+            The ephemeris times. This can be a float or an array of any shape.
+
+        Returns
+        -------
+        np.ndarray
+            The orbit number at each time. Times before the first orbit are -1,
+            and times after the start of the last known orbit are in that
+            orbit.
+
+        """
+        start = self.__positions['et'][:, 0]
+        orbits = np.concatenate([[-1], self.__positions['orbit_number']])
+        return orbits[np.searchsorted(start, et, side='right')][()]
+
+    @property
+    def positions(self) -> np.ndarray:
+        """Get the positions of every orbit in the table.
+
+        """
+        positions = self.__positions.view()
+        positions.flags.writeable = False
+        return positions
+
+    @property
+    def n_orbits(self) -> int:
+        """Get the number of orbits in the table.
+
+        """
+        return len(self.__positions)
@@ -120,6 +120,30 @@ class Spice:
         self.furnish_sclk(sclk_path)
         self.__furnish_mars(generic_spk_path)
 
+    @staticmethod
+    def furnished_kernels() -> tuple[tuple[str, int], ...]:
+        """Get the name and size of every currently furnished kernel, in the
+        order they were furnished.
+
+        Returns
+        -------
+        tuple[tuple[str, int], ...]
+            The file name and size in bytes of each kernel.
+
+        Notes
+        -----
+        NAIF puts the version of a kernel in its file name, so this identifies
+        the loaded kernel set without reading the (often large) kernels
+        themselves. The order matters since later kernels take priority over
+        earlier ones.
+
+        """
+        kernels = []
+        for index in range(spice.ktotal('ALL')):
+            path = spice.kdata(index, 'ALL')[0]
+            kernels.append((os.path.basename(path), os.path.getsize(path)))
+        return tuple(kernels)
+
     def __furnish_ck_type(self, ck_path: str, kernel_type: str) -> None:
         longterm_kernels, lastlong = \
             self.__find_long_term_kernels(ck_path, kernel_type)
@@ -0,0 +1,84 @@
+import os
+from pathlib import Path
+import tempfile
+from unittest import TestCase, mock
+import numpy as np
+from pyuvs.anc import _arrays
+from pyuvs.anc.conversion import convert_pickled_file
+from pyuvs.anc.images import ClosedMagneticFieldMap
+from pyuvs.anc.templates import CO2PlusFDB, CO2PlusUltravioletDoublet, \
+    NitricOxideNightglow
+
+
+class TestAncillaryRegistry(TestCase):
+    def setUp(self) -> None:
+        _arrays._registry.clear()
+
+    def tearDown(self) -> None:
+        _arrays._registry.clear()
+
+    def test_file_is_read_once(self) -> None:
+        with mock.patch.object(_arrays.np, 'load',
+                               wraps=np.load) as load:
+            template = CO2PlusFDB()
+            n_loads = load.call_count
+            CO2PlusUltravioletDoublet(), NitricOxideNightglow(), CO2PlusFDB()
+        self.assertLess(0, n_loads)
+        self.assertEqual(n_loads, load.call_count)
+        self.assertEqual((1024,), template.shape)
+
+    def test_arrays_are_read_only(self) -> None:
+        template = CO2PlusFDB()
+        with self.assertRaises(ValueError):
+            template[0] = 1
+
+    def test_copied_array_is_writable(self) -> None:
+        template = CO2PlusFDB(copy=True)
+        template[0] = -1
+        self.assertFalse(np.shares_memory(CO2PlusFDB(), template))
+        self.assertNotEqual(-1, CO2PlusFDB()[0])
+        self.assertIsInstance(template, CO2PlusFDB)
+
+    def test_arrays_share_memory(self) -> None:
+        self.assertTrue(np.shares_memory(CO2PlusFDB(), CO2PlusFDB()))
+
+    def test_memory_mapped_array_matches_read_array(self) -> None:
+        mapped = ClosedMagneticFieldMap(mmap=True)
+        np.testing.assert_array_equal(ClosedMagneticFieldMap(), mapped)
+        self.assertFalse(mapped.flags.writeable)
+        self.assertEqual(ClosedMagneticFieldMap().path, mapped.path)
+
+
+class TestConvertedFiles(TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'ancillary.npy')
+        self.contents = {'curve': np.linspace(0, 1, 5), 'width': np.float64(2)}
+        np.save(self.path, self.contents, allow_pickle=True)
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_converted_file_matches_pickled_file(self) -> None:
+        directory = convert_pickled_file(self.path)
+        contents = _arrays._AncillaryRegistry().dict(directory)
+        np.testing.assert_array_equal(self.contents['curve'],
+                                      contents['curve'])
+        self.assertFalse(contents['curve'].flags.writeable)
+        self.assertEqual(2, contents['width'])
+        self.assertIsInstance(contents['width'], np.float64)
+
+    def test_object_value_raises_value_error(self) -> None:
+        np.save(self.path, {'nested': {'a': 1}}, allow_pickle=True)
+        with self.assertRaises(ValueError):
+            convert_pickled_file(self.path)
+
+    def test_shipped_files_are_not_pickled(self) -> None:
+        files = Path(_arrays.__file__).parent / 'files'
+        self.assertEqual([], [f.name for f in files.glob('*.npy')
+                              if np.load(str(f), mmap_mode='r').dtype ==
+                              object])
+        for manifest in files.glob(f'*/{_arrays._manifest_name}'):
+            for value in _arrays._load_converted_dict(
+                    manifest.parent).values():
+                self.assertNotEqual(object, np.asarray(value).dtype)
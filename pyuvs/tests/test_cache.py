@@ -0,0 +1,53 @@
+import tempfile
+from unittest import TestCase
+import numpy as np
+from pyuvs.cache import ArrayCache
+
+
+class TestArrayCache(TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = ArrayCache(self.directory.name, 'test')
+        self.arrays = {'a': np.arange(5, dtype=np.float32),
+                       'b': np.ones((2, 3), dtype=np.uint8)}
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+
+class TestMakeKey(TestArrayCache):
+    def test_same_inputs_give_same_key(self) -> None:
+        self.assertEqual(ArrayCache.make_key('foo', 1, np.arange(3)),
+                         ArrayCache.make_key('foo', 1, np.arange(3)))
+
+    def test_different_array_values_give_different_keys(self) -> None:
+        self.assertNotEqual(ArrayCache.make_key(np.arange(3)),
+                            ArrayCache.make_key(np.arange(1, 4)))
+
+    def test_different_array_dtypes_give_different_keys(self) -> None:
+        self.assertNotEqual(ArrayCache.make_key(np.zeros(2, dtype=np.int64)),
+                            ArrayCache.make_key(np.zeros(2)))
+
+
+class TestSaveAndLoad(TestArrayCache):
+    def test_missing_key_loads_none(self) -> None:
+        self.assertIsNone(self.cache.load(ArrayCache.make_key('foo')))
+
+    def test_saved_arrays_round_trip(self) -> None:
+        key = ArrayCache.make_key('foo')
+        self.cache.save(key, self.arrays)
+        loaded = self.cache.load(key)
+        self.assertIn(key, self.cache)
+        for name, array in self.arrays.items():
+            np.testing.assert_array_equal(array, loaded[name])
+            self.assertEqual(array.dtype, loaded[name].dtype)
+
+    def test_clear_removes_entries(self) -> None:
+        key = ArrayCache.make_key('foo')
+        self.cache.save(key, self.arrays)
+        self.cache.clear()
+        self.assertNotIn(key, self.cache)
+
+    def test_int_directory_raises_type_error(self) -> None:
+        with self.assertRaises(TypeError):
+            ArrayCache(1, 'test')
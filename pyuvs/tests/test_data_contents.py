@@ -0,0 +1,107 @@
+import asyncio
+import gzip
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+from astropy.io import fits
+import numpy as np
+from pyuvs.files import DataFilename, DataFilenameCollection
+from pyuvs.l1b.data_contents import L1bDataContents, prefetch_l1b_contents
+
+
+class TestL1bDataContents(TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        path = os.path.join(self.directory.name,
+                            'mvn_iuv_l1b_apoapse-orbit03453-muv_'
+                            '20160708T071914_v13_r01.fits')
+        primary = fits.PrimaryHDU(np.zeros((4, 3, 5), dtype='>f4'))
+        primary.header['xuv'] = 'MUV'
+        integration = fits.BinTableHDU.from_columns(
+            [fits.Column(name='et', format='D', array=np.arange(4)),
+             fits.Column(name='mirror_deg', format='E',
+                         array=np.linspace(30, 50, 4))],
+            name='integration')
+        fits.HDUList([primary, integration]).writeto(path)
+        self.filename = DataFilename(path)
+        self.contents = L1bDataContents(self.filename)
+
+    def tearDown(self) -> None:
+        self.contents.close()
+        self.directory.cleanup()
+
+
+class TestShape(TestL1bDataContents):
+    def test_shape_matches_primary_data(self) -> None:
+        self.assertEqual((4, 3, 5), (self.contents.n_integrations,
+                                     self.contents.n_positions,
+                                     self.contents.n_wavelengths))
+
+
+class TestAccess(TestL1bDataContents):
+    def test_header_gets_keyword(self) -> None:
+        self.assertEqual('MUV', self.contents.header('primary')['xuv'])
+
+    def test_column_gets_column(self) -> None:
+        np.testing.assert_allclose(
+            np.linspace(30, 50, 4),
+            self.contents.column('integration', 'mirror_deg'))
+
+    def test_column_matches_item_access(self) -> None:
+        np.testing.assert_array_equal(
+            self.contents['integration'].data['et'],
+            self.contents.column('integration', 'et'))
+
+
+class TestClose(TestL1bDataContents):
+    def test_context_manager_closes_file(self) -> None:
+        with L1bDataContents(self.filename) as contents:
+            mirror_angles = contents.column('integration', 'mirror_deg')
+        self.assertTrue(contents.hdulist._file.closed)
+        self.assertEqual(4, len(mirror_angles))
+
+
+class TestInMemory(TestL1bDataContents):
+    def test_contents_match_file(self) -> None:
+        with open(self.filename.path, 'rb') as file:
+            data = file.read()
+        with L1bDataContents(self.filename, data) as contents:
+            self.assertEqual(4, contents.n_integrations)
+            np.testing.assert_array_equal(
+                self.contents.column('integration', 'mirror_deg'),
+                contents.column('integration', 'mirror_deg'))
+
+
+class TestPrefetchL1bContents(TestL1bDataContents):
+    def setUp(self) -> None:
+        super().setUp()
+        # A gzipped copy with a later timestamp, and a plain copy after that
+        self.paths = [self.filename.path]
+        for timestamp, suffix in [('071915', '.gz'), ('071916', '')]:
+            path = self.filename.path.replace('071914', timestamp) + suffix
+            opener = gzip.open if suffix else open
+            with open(self.filename.path, 'rb') as file, \
+                    opener(path, 'wb') as copy:
+                shutil.copyfileobj(file, copy)
+            self.paths.append(path)
+
+    async def read_mirror_angles(self, n_files: int) -> list[np.ndarray]:
+        mirror_angles = []
+        async for contents in prefetch_l1b_contents(
+                DataFilenameCollection(self.paths), n_files):
+            with contents:
+                mirror_angles.append(
+                    contents.column('integration', 'mirror_deg'))
+        return mirror_angles
+
+    def test_every_file_is_read_in_order(self) -> None:
+        for n_files in [1, 2, 5]:
+            mirror_angles = asyncio.run(self.read_mirror_angles(n_files))
+            self.assertEqual(3, len(mirror_angles))
+            for angles in mirror_angles:
+                np.testing.assert_allclose(np.linspace(30, 50, 4), angles)
+
+    def test_nonpositive_read_ahead_raises_value_error(self) -> None:
+        with self.assertRaises(ValueError):
+            asyncio.run(self.read_mirror_angles(0))
@@ -0,0 +1,80 @@
+import os
+import tempfile
+from unittest import TestCase
+from pyuvs.files import DataFilename
+
+
+class TestDataFilename(TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(
+            self.directory.name, 'mvn_iuv_l1b_relay-echelle-orbit12190-ech_'
+                                 '20200821T214652_v13_r01.fits.gz')
+        open(self.path, 'w').close()
+        self.filename = DataFilename(self.path)
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+
+class TestParse(TestDataFilename):
+    def test_fields_match_known_values(self) -> None:
+        self.assertEqual('relay-echelle', self.filename.segment)
+        self.assertEqual(12190, self.filename.orbit)
+        self.assertEqual('ech', self.filename.channel)
+        self.assertEqual('20200821T214652', self.filename.timestamp)
+        self.assertEqual(21, self.filename.hour)
+        self.assertEqual('r01', self.filename.revision)
+        self.assertEqual('fits.gz', self.filename.extension)
+
+    def test_missing_channel_is_none(self) -> None:
+        filename = DataFilename(
+            'mvn_iuv_l1c_periapse-orbit00335_20141201T001558_v13_r01.fits.gz',
+            check_path=False)
+        self.assertIsNone(filename.channel)
+        self.assertEqual(335, filename.orbit)
+
+    def test_missing_orbit_is_none(self) -> None:
+        filename = DataFilename(
+            'mvn_iuv_l1b_cruisecal2-mode080-muv_20140521T120029_v13_r01.fits',
+            check_path=False)
+        self.assertIsNone(filename.orbit)
+        self.assertIsNone(filename.channel)
+        self.assertEqual('cruisecal2-mode080-muv', filename.segment)
+        self.assertEqual('20140521T120029', filename.timestamp)
+
+    def test_non_iuvs_filename_raises_value_error(self) -> None:
+        with self.assertRaises(ValueError):
+            DataFilename('mvn_iuv_l1b_foo.fits', check_path=False)
+
+
+class TestCheckPath(TestDataFilename):
+    def test_missing_file_raises_file_not_found_error(self) -> None:
+        os.remove(self.path)
+        with self.assertRaises(FileNotFoundError):
+            DataFilename(self.path)
+
+    def test_unchecked_missing_file_is_parsed(self) -> None:
+        os.remove(self.path)
+        self.assertEqual(12190, DataFilename(self.path, False).orbit)
+
+    def test_unchecked_int_raises_type_error(self) -> None:
+        with self.assertRaises(TypeError):
+            DataFilename(1, check_path=False)
+
+
+class TestComparison(TestDataFilename):
+    def test_same_path_is_equal_and_hashes_equal(self) -> None:
+        other = DataFilename(self.path)
+        self.assertEqual(self.filename, other)
+        self.assertEqual(1, len({self.filename, other}))
+
+    def test_filenames_sort_by_path(self) -> None:
+        later = DataFilename(self.path.replace('214652', '214653'),
+                             check_path=False)
+        self.assertEqual([self.filename, later],
+                         sorted([later, self.filename]))
+
+    def test_fields_are_read_only(self) -> None:
+        with self.assertRaises(AttributeError):
+            self.filename.orbit = 1
@@ -0,0 +1,130 @@
+from unittest import TestCase
+import numpy as np
+from pyuvs.files import DataFilename, DataFilenameCollection
+
+
+def make_path(segment: str, orbit: int, channel: str, time: str,
+              revision: str = 'r01') -> str:
+    return f'/data/orbit{orbit // 100:03}00/mvn_iuv_l1b_{segment}-' \
+           f'orbit{orbit:05}-{channel}_20160708T{time}_v13_{revision}.fits.gz'
+
+
+class TestDataFilenameCollection(TestCase):
+    def setUp(self) -> None:
+        self.paths = [make_path('apoapse', 3453, 'fuv', '071911'),
+                      make_path('apoapse', 3453, 'muv', '071910'),
+                      make_path('apoapse', 3454, 'muv', '071912'),
+                      make_path('periapse', 3454, 'muv', '071913'),
+                      make_path('periapse', 3455, 'fuv', '071914')]
+        self.files = DataFilenameCollection(self.paths, check_paths=False)
+
+
+class TestColumn(TestDataFilenameCollection):
+    def test_columns_have_one_value_per_file(self) -> None:
+        np.testing.assert_equal([3453, 3453, 3454, 3454, 3455],
+                                self.files.column('orbit'))
+        np.testing.assert_equal(self.paths, self.files.column('path'))
+
+    def test_missing_orbit_is_negative_one(self) -> None:
+        files = DataFilenameCollection(
+            ['/data/mvn_iuv_l1b_cruisecal2-mode080-muv_20140521T120029_v13_'
+             'r01.fits'], check_paths=False)
+        np.testing.assert_equal([-1], files.column('orbit'))
+
+    def test_columns_are_read_only(self) -> None:
+        with self.assertRaises(ValueError):
+            self.files.column('orbit')[0] = 1
+
+    def test_unknown_column_raises_value_error(self) -> None:
+        with self.assertRaises(ValueError):
+            self.files.column('foo')
+
+
+class TestFilter(TestDataFilenameCollection):
+    def test_select_keeps_masked_files(self) -> None:
+        selected = self.files.select(self.files.column('orbit') == 3454)
+        self.assertEqual(self.paths[2:4], list(selected.column('path')))
+
+    def test_match_uses_patterns_and_orbit_range(self) -> None:
+        matched = self.files.match(segment='apo*', channel='muv',
+                                   orbit_start=3453, orbit_end=3455)
+        self.assertEqual([self.paths[1], self.paths[2]],
+                         [f.path for f in matched.filenames])
+        self.assertTrue(matched.all_muv())
+
+    def test_file_without_orbit_survives_level_match(self) -> None:
+        files = DataFilenameCollection(
+            [make_path('apoapse', 3453, 'muv', '071910'),
+             '/data/mvn_iuv_l1b_cruisecal2-mode080-muv_20140521T120029_v13_'
+             'r01.fits'], check_paths=False)
+        self.assertEqual(2, len(files.match(level='l1b')))
+        self.assertEqual(1, len(files.match(level='l1b', orbit_end=4000)))
+
+    def test_unmatched_filter_gives_empty_collection(self) -> None:
+        self.assertEqual(0, len(self.files.match(channel='ech')))
+
+    def test_selected_files_are_contained(self) -> None:
+        selected = self.files.select(self.files.column('orbit') == 3454)
+        self.assertIn(DataFilename(self.paths[2], check_path=False), selected)
+        self.assertNotIn(DataFilename(self.paths[0], check_path=False),
+                         selected)
+
+
+class TestGroupBy(TestDataFilenameCollection):
+    def test_groups_are_keyed_by_values(self) -> None:
+        groups = self.files.group_by('orbit', 'channel')
+        self.assertEqual([(3453, 'fuv'), (3453, 'muv'), (3454, 'muv'),
+                          (3455, 'fuv')], list(groups))
+        self.assertEqual(2, groups[3454, 'muv'].n_files)
+
+
+class TestSetOperations(TestDataFilenameCollection):
+    def setUp(self) -> None:
+        super().setUp()
+        self.muv = self.files.match(channel='muv')
+        self.apoapse = self.files.match(segment='apoapse')
+
+    def test_intersection(self) -> None:
+        self.assertEqual([self.paths[1], self.paths[2]],
+                         list((self.muv & self.apoapse).column('path')))
+
+    def test_difference(self) -> None:
+        self.assertEqual([self.paths[3]],
+                         list((self.muv - self.apoapse).column('path')))
+
+    def test_union_keeps_latest_revision(self) -> None:
+        newer = DataFilenameCollection(
+            [make_path('apoapse', 3453, 'muv', '071910', 'r02')],
+            check_paths=False)
+        union = self.muv | newer
+        self.assertEqual(3, union.n_files)
+        self.assertIn('r02', union.filenames[0].filename)
+
+
+class TestLatestVersions(TestCase):
+    def setUp(self) -> None:
+        self.old = make_path('apoapse', 3453, 'muv', '071910', 'r01')
+        self.new = make_path('apoapse', 3453, 'muv', '071910', 'r02')
+        self.stage = make_path('apoapse', 3453, 'muv', '071910', 's02')
+        # Same timestamp but a different observation
+        self.fuv = make_path('apoapse', 3453, 'fuv', '071910', 'r01')
+
+    def latest(self, paths: list[str], **kwargs) -> list[str]:
+        return list(DataFilenameCollection(paths, check_paths=False,
+                                           **kwargs).column('path'))
+
+    def test_highest_revision_is_kept(self) -> None:
+        self.assertEqual([self.fuv, self.new],
+                         self.latest([self.new, self.old, self.fuv]))
+
+    def test_release_is_preferred_over_stage(self) -> None:
+        self.assertEqual([self.new], self.latest([self.stage, self.new]))
+
+    def test_higher_version_beats_higher_revision(self) -> None:
+        newer = self.old.replace('v13_r01', 'v14_r00')
+        self.assertEqual([newer], self.latest([self.new, newer]))
+
+    def test_all_versions_can_be_kept(self) -> None:
+        self.assertEqual(4, len(self.latest(
+            [self.old, self.new, self.stage, self.fuv],
+            keep_all_versions=True)))
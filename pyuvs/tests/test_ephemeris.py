@@ -0,0 +1,72 @@
+import tempfile
+from unittest import TestCase, mock
+import numpy as np
+import spiceypy as spice
+from pyuvs.ephemeris import ephemeris
+from pyuvs.orbit import OrbitalGeometry
+from pyuvs.tests.test_geometry import furnish_test_kernels
+
+
+def pointwise_ephemeris(et: float) -> tuple:
+    """Compute the ephemeris at one time the way OrbitalGeometry used to,
+    with scalar SPICE calls.
+
+    """
+    spoint, _, srfvec = spice.subpnt('Intercept: ellipsoid', 'Mars', et,
+                                     'IAU_MARS', 'NONE', 'MAVEN')
+    _, _, sun_srfvec = spice.subpnt('Intercept: ellipsoid', 'Mars', et,
+                                    'IAU_MARS', 'NONE', 'SUN')
+    sspoint, _, _ = spice.subslr('Intercept: ellipsoid', 'Mars', et,
+                                 'IAU_MARS', 'NONE', 'MAVEN')
+    _, colatitude, longitude = spice.recsph(spoint)
+    _, solar_colatitude, solar_longitude = spice.recsph(sspoint)
+    return (et, 90 - np.degrees(colatitude), np.degrees(longitude),
+            np.linalg.norm(srfvec),
+            np.degrees(spice.lspcn('Mars', et, 'NONE')),
+            90 - np.degrees(solar_colatitude), np.degrees(solar_longitude),
+            np.linalg.norm(sun_srfvec))
+
+
+class TestEphemeris(TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.directory = tempfile.TemporaryDirectory()
+        furnish_test_kernels(cls.directory.name)
+        cls.et = np.array([[0, 1500, 3000], [4500, 6000, 1500]])
+        cls.ephemeris = ephemeris(cls.et)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        spice.kclear()
+        cls.directory.cleanup()
+
+    def test_fields_match_pointwise_spice(self) -> None:
+        expected = np.array([[pointwise_ephemeris(f) for f in row]
+                             for row in self.et])
+        fields = [f for f in self.ephemeris._fields
+                  if f != 'spacecraft_position']
+        for index, field in enumerate(fields):
+            np.testing.assert_allclose(expected[..., index],
+                                       getattr(self.ephemeris, field),
+                                       rtol=1e-9, atol=1e-6, err_msg=field)
+
+    def test_spacecraft_position_has_trailing_axis(self) -> None:
+        self.assertEqual((2, 3, 3), self.ephemeris.spacecraft_position.shape)
+        np.testing.assert_allclose(
+            spice.spkpos('MAVEN', 6000., 'IAU_MARS', 'NONE', 'MARS')[0],
+            self.ephemeris.spacecraft_position[1, 1])
+
+    def test_repeated_times_are_computed_once(self) -> None:
+        with mock.patch.object(spice, 'spkpos', wraps=spice.spkpos) as spkpos:
+            ephemeris(np.full(10, 1500.))
+        for call in spkpos.call_args_list:
+            self.assertEqual(1, np.size(call.args[1]))
+
+    def test_float_gives_scalars(self) -> None:
+        self.assertEqual((), np.shape(ephemeris(1500.).solar_longitude))
+        self.assertEqual((3,), ephemeris(1500.).spacecraft_position.shape)
+
+    def test_spice_positions_accepts_arrays(self) -> None:
+        positions = OrbitalGeometry().spice_positions(self.et)
+        np.testing.assert_array_equal(self.ephemeris.subsolar_longitude,
+                                      positions[6])
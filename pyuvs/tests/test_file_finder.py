@@ -0,0 +1,97 @@
+import asyncio
+import os
+import re
+import tempfile
+from unittest import TestCase
+from pyuvs.files import AsyncFileFinder, FileFinder
+
+
+class TestFileFinder(TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.root = self.directory.name
+        names = ['mvn_iuv_l1b_apoapse-orbit03499-muv_20160708T071910_v13_r01.fits.gz',
+                 'mvn_iuv_l1b_apoapse-orbit03500-muv_20160708T071911_v13_r01.fits.gz',
+                 'mvn_iuv_l1b_apoapse-orbit03500-fuv_20160708T071912_v13_r01.fits.gz',
+                 'mvn_iuv_l1b_periapse-orbit03500-muv_20160708T071913_v13_r01.fits.gz',
+                 'mvn_iuv_l1b_apoapse-orbit03501-muv_20160708T071914_v13_r01.fits.gz',
+                 'mvn_iuv_l1b_apoapse-orbit03600-muv_20160708T071915_v13_r01.fits.gz',
+                 'mvn_iuv_l1b_apoapse-orbit03600-muv_20160708T071916_v13_r01.txt']
+        for name in names:
+            orbit = re.search(r'orbit(\d{3})', name).group(1)
+            block = os.path.join(self.root, f'orbit{orbit}00')
+            os.makedirs(block, exist_ok=True)
+            open(os.path.join(block, name), 'w').close()
+        self.finder = FileFinder(self.root)
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    @staticmethod
+    def names(files) -> list[str]:
+        return [f.filename for f in files.filenames]
+
+
+class TestMultiOrbitFiles(TestFileFinder):
+    def test_files_match_single_orbit_search(self) -> None:
+        orbits = [3499, 3500, 3501, 3600]
+        expected = [f for orbit in orbits for f in
+                    self.names(self.finder.soschob(orbit, 'apoapse', 'muv'))]
+        self.assertEqual(expected, self.names(self.finder.multi_orbit_files(
+            orbits, 'apoapse', 'muv')))
+
+    def test_threaded_scan_matches_sequential_scan(self) -> None:
+        self.assertEqual(
+            self.names(self.finder.orbit_range_files(3400, 3700, '*', '*')),
+            self.names(self.finder.orbit_range_files(3400, 3700, '*', '*',
+                                                     n_threads=4)))
+
+    def test_unrequested_orbits_in_block_are_excluded(self) -> None:
+        files = self.finder.multi_orbit_files([3500], 'apoapse', '*')
+        self.assertEqual(2, files.n_files)
+
+    def test_missing_block_is_skipped(self) -> None:
+        files = self.finder.orbit_range_files(3000, 3501, 'apoapse', 'muv')
+        self.assertEqual(2, files.n_files)
+
+
+class TestIterMultiOrbitFiles(TestFileFinder):
+    def test_files_match_collection(self) -> None:
+        self.assertEqual(
+            self.names(self.finder.orbit_range_files(3400, 3700, '*', '*')),
+            [f.filename for f in self.finder.iter_orbit_range_files(
+                3400, 3700, '*', '*', n_threads=2)])
+
+    def test_blocks_are_yielded_in_order(self) -> None:
+        orbits = [f.orbit for f in self.finder.iter_multi_orbit_files(
+            [3600, 3499, 3500], 'apoapse', 'muv', n_threads=3)]
+        self.assertEqual([3600, 3499, 3500], orbits)
+
+    def test_stopping_early_does_not_raise(self) -> None:
+        files = self.finder.iter_orbit_range_files(3400, 3700, '*', '*')
+        self.assertEqual(3499, next(files).orbit)
+        files.close()
+
+
+class TestAsyncFileFinder(TestFileFinder):
+    def test_files_match_file_finder(self) -> None:
+        finder = AsyncFileFinder(self.root, max_in_flight=2)
+        self.assertEqual(
+            self.names(self.finder.orbit_range_files(3400, 3700, '*', '*')),
+            self.names(asyncio.run(
+                finder.orbit_range_files(3400, 3700, '*', '*'))))
+
+    def test_iteration_matches_file_finder(self) -> None:
+        async def names() -> list[str]:
+            finder = AsyncFileFinder(self.root)
+            return [f.filename async for f in finder.iter_multi_orbit_files(
+                [3499, 3500, 3600], 'apoapse', 'muv')]
+
+        self.assertEqual(
+            self.names(self.finder.multi_orbit_files(
+                [3499, 3500, 3600], 'apoapse', 'muv')),
+            asyncio.run(names()))
+
+    def test_nonpositive_limit_raises_value_error(self) -> None:
+        with self.assertRaises(ValueError):
+            AsyncFileFinder(self.root, max_in_flight=0)
@@ -0,0 +1,48 @@
+from unittest import TestCase
+import numpy as np
+from pyuvs.anc.flatfield import Flatfield, FlatfieldWavelengths
+from pyuvs.l1b.flatfield import MUVFlatfield
+
+
+def interpolate_pointwise(n_positions: int, wavelengths: np.ndarray) \
+        -> np.ndarray:
+    flatfield = np.asarray(Flatfield())
+    original_wavelengths = np.asarray(FlatfieldWavelengths())
+    original_n_positions = flatfield.shape[0]
+    trimmed = np.array([[np.interp(w, original_wavelengths, flatfield[pos])
+                         for w in wavelengths]
+                        for pos in range(original_n_positions)])
+    new_positions = np.linspace(0, original_n_positions, num=n_positions)
+    original_positions = np.linspace(0, original_n_positions,
+                                     num=original_n_positions)
+    return np.array([[np.interp(pos, original_positions, trimmed[:, wav])
+                      for wav in range(trimmed.shape[-1])]
+                     for pos in new_positions])
+
+
+class TestInterpolateToNewScheme(TestCase):
+    def test_regrid_matches_pointwise_interpolation(self) -> None:
+        # Some of these wavelengths are outside the flatfield's wavelengths
+        for n_positions, wavelengths in [(50, np.linspace(180, 320, 40)),
+                                         (133, np.linspace(205, 306, 19)),
+                                         (7, np.array([210., 250.]))]:
+            flatfield = MUVFlatfield()
+            flatfield.interpolate_to_new_scheme(n_positions, wavelengths)
+            np.testing.assert_allclose(
+                interpolate_pointwise(n_positions, wavelengths),
+                flatfield.val, rtol=1e-12)
+
+    def test_same_scheme_shares_regridded_flatfield(self) -> None:
+        first, second = MUVFlatfield(), MUVFlatfield()
+        first.interpolate_to_new_scheme(50, np.linspace(200, 300, 40))
+        second.interpolate_to_new_scheme(50, np.linspace(200, 300, 40))
+        self.assertIs(first.val, second.val)
+        self.assertFalse(first.val.flags.writeable)
+
+    def test_repeated_regrids_start_from_original_flatfield(self) -> None:
+        flatfield = MUVFlatfield()
+        flatfield.interpolate_to_new_scheme(20, np.linspace(200, 300, 10))
+        flatfield.interpolate_to_new_scheme(50, np.linspace(200, 300, 40))
+        np.testing.assert_allclose(
+            interpolate_pointwise(50, np.linspace(200, 300, 40)),
+            flatfield.val, rtol=1e-12)
@@ -0,0 +1,221 @@
+import os
+import tempfile
+from unittest import TestCase, mock
+import numpy as np
+import spiceypy as spice
+from spiceypy.utils.exceptions import NotFoundError
+from pyuvs import geometry
+from pyuvs.geometry import adaptive_pixel_geometry, ellipsoid_intercept, \
+    pixel_geometry
+
+
+mars_pck = '''
+\\begindata
+BODY499_RADII = ( 3396.19 3396.19 3376.20 )
+BODY499_POLE_RA = ( 317.68143 -0.1061 0. )
+BODY499_POLE_DEC = ( 52.88650 -0.0609 0. )
+BODY499_PM = ( 176.630 350.89198226 0. )
+\\begintext
+'''
+
+
+def furnish_test_kernels(directory: str) -> None:
+    """Furnish kernels with Mars on a circular orbit around a fixed Sun and
+    MAVEN on a circular polar orbit around Mars.
+
+    """
+    for kernel in write_test_kernels(directory):
+        spice.furnsh(kernel)
+
+
+def write_test_kernels(directory: str) -> list[str]:
+    pck = os.path.join(directory, 'mars.tpc')
+    with open(pck, 'w') as file:
+        file.write(mars_pck)
+
+    start, step, n_states = -3600., 60., 241
+    epochs = start + step * np.arange(n_states)
+    mars_angle = 2 * np.pi * epochs / (687 * 86400)
+    mars_radius, mars_speed = 2.28e8, 24.1
+    mars_states = np.column_stack(
+        [mars_radius * np.cos(mars_angle), mars_radius * np.sin(mars_angle),
+         np.zeros(n_states), -mars_speed * np.sin(mars_angle),
+         mars_speed * np.cos(mars_angle), np.zeros(n_states)])
+    maven_angle = 2 * np.pi * epochs / 28000
+    maven_radius = 9500
+    maven_speed = 2 * np.pi * maven_radius / 28000
+    maven_states = np.column_stack(
+        [maven_radius * np.cos(maven_angle), np.zeros(n_states),
+         maven_radius * np.sin(maven_angle),
+         -maven_speed * np.sin(maven_angle), np.zeros(n_states),
+         maven_speed * np.cos(maven_angle)])
+
+    spk = os.path.join(directory, 'test.bsp')
+    handle = spice.spkopn(spk, 'test', 0)
+    end = epochs[-1]
+    spice.spkw08(handle, 10, 0, 'J2000', start, end, 'sun', 7, n_states,
+                 np.zeros((n_states, 6)), start, step)
+    spice.spkw08(handle, 499, 10, 'J2000', start, end, 'mars', 7, n_states,
+                 mars_states, start, step)
+    spice.spkw08(handle, -202, 499, 'J2000', start, end, 'maven', 7,
+                 n_states, maven_states, start, step)
+    spice.spkcls(handle)
+    return [pck, spk]
+
+
+def pointwise_geometry(et: float, pixel_vector: np.ndarray) -> tuple:
+    """Compute the geometry of one pixel the way the quicklooks used to, with
+    one set of SPICE calls per pixel.
+
+    """
+    try:
+        spoint, _, _ = spice.sincpt('Ellipsoid', 'Mars', et, 'IAU_Mars',
+                                    'LT+S', 'MAVEN', 'IAU_Mars', pixel_vector)
+        _, _, phase, solar, emission = spice.ilumin(
+            'Ellipsoid', 'Mars', et, 'IAU_Mars', 'LT+S', 'MAVEN', spoint)
+    except NotFoundError:
+        return (np.nan,) * 6
+    _, colatitude, longitude = spice.recsph(spoint)
+    if longitude < 0:
+        longitude += 2 * np.pi
+    hr, mn, sc, _, _ = spice.et2lst(et, 499, longitude, 'planetocentric',
+                                    timlen=256, ampmlen=256)
+    return (np.degrees(np.pi / 2 - colatitude), np.degrees(longitude),
+            hr + mn / 60 + sc / 3600, np.degrees(solar),
+            np.degrees(emission), np.degrees(phase))
+
+
+class TestEllipsoidIntercept(TestCase):
+    def setUp(self) -> None:
+        self.radii = np.array([2., 2, 1])
+
+    def test_intercept_is_on_near_side(self) -> None:
+        intercept = ellipsoid_intercept(np.array([0., 0, 5]),
+                                        np.array([0., 0, -3]), self.radii)
+        np.testing.assert_array_equal([0, 0, 1], intercept)
+
+    def test_missing_rays_are_nan(self) -> None:
+        intercept = ellipsoid_intercept(
+            np.array([0., 0, 5]), np.array([[1., 0, 0], [0, 0, 1]]),
+            self.radii)
+        self.assertTrue(np.all(np.isnan(intercept)))
+
+
+class TestPixelGeometry(TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.directory = tempfile.TemporaryDirectory()
+        furnish_test_kernels(cls.directory.name)
+
+        # Fan the pixels across Mars, and past both of its limbs
+        cls.et = np.linspace(0, 3000, 6)
+        mars = spice.spkpos('MARS', cls.et, 'IAU_MARS', 'LT+S', 'MAVEN')[0]
+        center = mars / np.linalg.norm(mars, axis=-1, keepdims=True)
+        across = np.cross(center, [0, 0, 1])
+        across /= np.linalg.norm(across, axis=-1, keepdims=True)
+        offsets = np.tan(np.radians(np.linspace(-30, 30, 25)))
+        cls.pixel_vector = center[:, np.newaxis, :] + \
+            offsets[np.newaxis, :, np.newaxis] * across[:, np.newaxis, :]
+        cls.geometry = pixel_geometry(cls.et, cls.pixel_vector)
+        cls.expected = np.array(
+            [[pointwise_geometry(et, vector) for vector in vectors]
+             for et, vectors in zip(cls.et, cls.pixel_vector)])
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        spice.kclear()
+        cls.directory.cleanup()
+
+    def test_pixels_off_mars_are_nan(self) -> None:
+        on_mars = np.isfinite(self.expected[..., 0])
+        self.assertTrue(np.any(on_mars))
+        self.assertFalse(np.all(on_mars))
+        for field in self.geometry:
+            np.testing.assert_array_equal(on_mars, np.isfinite(field))
+
+    def test_angles_match_pointwise_spice(self) -> None:
+        for index in [0, 1, 3, 4, 5]:
+            np.testing.assert_allclose(self.expected[..., index],
+                                       self.geometry[index], atol=1e-3)
+
+    def test_local_time_matches_pointwise_spice(self) -> None:
+        # SPICE truncates the local time to whole seconds
+        np.testing.assert_allclose(self.expected[..., 2],
+                                   self.geometry.local_time, atol=1 / 3600)
+
+    def test_inertial_pixel_vectors_are_rotated(self) -> None:
+        light_time = spice.spkpos('MARS', self.et, 'IAU_MARS', 'LT+S',
+                                  'MAVEN')[1]
+        rotation = np.array([spice.pxfrm2('IAU_MARS', 'J2000', f - g, f)
+                             for f, g in zip(self.et, light_time)])
+        inertial = np.einsum('nij,npj->npi', rotation, self.pixel_vector)
+        geometry = pixel_geometry(self.et, inertial, frame='J2000')
+        np.testing.assert_allclose(self.geometry.latitude, geometry.latitude,
+                                   atol=1e-3)
+
+    def test_rotating_frame_is_taken_at_observation_time(self) -> None:
+        # Spin IAU_JUPITER fast enough that the light time matters
+        spice.pdpool('BODY599_POLE_RA', [0., 0., 0.])
+        spice.pdpool('BODY599_POLE_DEC', [90., 0., 0.])
+        spice.pdpool('BODY599_PM', [0., 3.6e6, 0.])
+        light_time = spice.spkpos('MARS', self.et, 'IAU_MARS', 'LT+S',
+                                  'MAVEN')[1]
+        rotation = np.array([spice.pxfrm2('IAU_MARS', 'IAU_JUPITER', f - g, f)
+                             for f, g in zip(self.et, light_time)])
+        spinning = np.einsum('nij,npj->npi', rotation, self.pixel_vector)
+        geometry = pixel_geometry(self.et, spinning, frame='IAU_JUPITER')
+        np.testing.assert_allclose(self.geometry.latitude, geometry.latitude,
+                                   atol=1e-3)
+
+
+class TestAdaptivePixelGeometry(TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.directory = tempfile.TemporaryDirectory()
+        furnish_test_kernels(cls.directory.name)
+
+        # Sweep a slit with IUVS's high-resolution pixel scale across the limb
+        cls.et = np.linspace(0, 3000, 400)
+        mars = spice.spkpos('MARS', cls.et, 'IAU_MARS', 'LT+S', 'MAVEN')[0]
+        center = mars / np.linalg.norm(mars, axis=-1, keepdims=True)
+        along = np.cross(center, [0, 0, 1])
+        along /= np.linalg.norm(along, axis=-1, keepdims=True)
+        across = np.cross(along, center)
+        offsets = np.tan(np.radians(np.linspace(-5.3, 5.3, 200)))
+        sweep = np.tan(np.radians(np.linspace(-22, -2, 400)))
+        cls.pixel_vector = center[:, np.newaxis, :] + \
+            offsets[np.newaxis, :, np.newaxis] * along[:, np.newaxis, :] + \
+            sweep[:, np.newaxis, np.newaxis] * across[:, np.newaxis, :]
+        cls.expected = pixel_geometry(cls.et, cls.pixel_vector)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        spice.kclear()
+        cls.directory.cleanup()
+
+    def test_geometry_matches_exact_geometry(self) -> None:
+        adaptive = adaptive_pixel_geometry(self.et, self.pixel_vector)
+        on_mars = np.isfinite(self.expected.latitude)
+        self.assertTrue(np.any(on_mars))
+        self.assertFalse(np.all(on_mars))
+        for name, expected, field in zip(adaptive._fields, self.expected,
+                                         adaptive):
+            np.testing.assert_array_equal(on_mars, np.isfinite(field))
+            period = {'longitude': 360, 'local_time': 24}.get(name, np.inf)
+            error = np.abs(expected - field)[on_mars]
+            self.assertLess(np.max(np.minimum(error, period - error)), 0.01,
+                            name)
+
+    def test_fewer_pixels_are_solved_exactly(self) -> None:
+        with mock.patch.object(geometry, 'ellipsoid_intercept',
+                               wraps=geometry.ellipsoid_intercept) as solve:
+            adaptive_pixel_geometry(self.et, self.pixel_vector)
+        n_solved = sum(np.prod(f.args[1].shape[:-1])
+                       for f in solve.call_args_list)
+        self.assertLess(n_solved, 0.5 * self.et.shape[0] *
+                        self.pixel_vector.shape[1])
+
+    def test_narrow_grids_are_solved_exactly(self) -> None:
+        adaptive = adaptive_pixel_geometry(self.et, self.pixel_vector[:, :1])
+        np.testing.assert_array_equal(self.expected.latitude[:, :1],
+                                      adaptive.latitude)
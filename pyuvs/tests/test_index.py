@@ -0,0 +1,91 @@
+import os
+import tempfile
+import time
+from unittest import TestCase, mock
+from pyuvs.index import FileIndex
+from pyuvs.tests.test_metadata import make_l1b_file
+
+
+class TestFileIndex(TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.root = os.path.join(self.directory.name, 'data')
+        self.block = os.path.join(self.root, 'orbit03400')
+        os.makedirs(self.block)
+        self.paths = [
+            self.add_file('apoapse', 3453, '071910', [30, 40], 700),
+            self.add_file('apoapse', 3453, '071911', [31, 45], 900),
+            self.add_file('apoapse', 3454, '071910', [30, 40], 900),
+            self.add_file('periapse', 3453, '071910', [30, 40], 900)]
+        self.index = FileIndex(self.root,
+                               os.path.join(self.directory.name, 'index.db'))
+        self.index.refresh()
+
+    def tearDown(self) -> None:
+        self.index.close()
+        self.directory.cleanup()
+
+    def add_file(self, segment: str, orbit: int, time_code: str,
+                 mirror_angles: list[float], mcp_volt: float,
+                 revision: str = 'r01') -> str:
+        path = os.path.join(self.block,
+                            f'mvn_iuv_l1b_{segment}-orbit{orbit:05}-muv_'
+                            f'20160708T{time_code}_v13_{revision}.fits')
+        make_l1b_file(path, mirror_angles, mcp_volt)
+        return path
+
+    def touch_block(self) -> None:
+        # Make sure the directory modification time visibly changes
+        mtime = os.stat(self.block).st_mtime + 10
+        os.utime(self.block, (time.time(), mtime))
+
+
+class TestQuery(TestFileIndex):
+    def test_orbit_range_and_patterns_select_files(self) -> None:
+        self.assertEqual(self.paths[:2],
+                         self.index.paths(3453, 3454, segment='apoapse'))
+
+    def test_classification_selects_files(self) -> None:
+        self.assertEqual([self.paths[0]], self.index.paths(dayside=True))
+
+    def test_query_makes_collection(self) -> None:
+        files = self.index.query(3453, 3455, segment='apoapse')
+        self.assertEqual(3, files.n_files)
+
+    def test_query_does_not_check_paths(self) -> None:
+        with mock.patch('os.path.exists', side_effect=AssertionError), \
+                mock.patch('pathlib.Path.exists', side_effect=AssertionError):
+            self.assertEqual(3, self.index.query(3453, 3455,
+                                                 segment='apoapse').n_files)
+
+    def test_swath_numbers_are_indexed(self) -> None:
+        self.assertEqual([0, 1, 0], self.index.swath_numbers(self.paths[:3]))
+
+
+class TestRefresh(TestFileIndex):
+    def test_unchanged_tree_rescans_nothing(self) -> None:
+        self.assertEqual(0, self.index.refresh())
+
+    def test_new_file_is_found(self) -> None:
+        path = self.add_file('apoapse', 3453, '071912', [46, 50], 900)
+        self.touch_block()
+        self.assertEqual(1, self.index.refresh())
+        self.assertIn(path, self.index.paths(3453, 3454))
+        self.assertEqual([0, 1, 1], self.index.swath_numbers(
+            self.paths[:2] + [path]))
+
+    def test_release_is_numbered_over_stage(self) -> None:
+        # The stage copy sorts after the release as text, but is older
+        release = self.add_file('apoapse', 3453, '071912', [46, 50], 900)
+        stage = self.add_file('apoapse', 3453, '071912', [46, 50], 900,
+                              revision='s01')
+        self.touch_block()
+        self.index.refresh()
+        self.assertEqual([1, None], self.index.swath_numbers(
+            [release, stage]))
+
+    def test_removed_file_is_dropped(self) -> None:
+        os.remove(self.paths[0])
+        self.touch_block()
+        self.index.refresh()
+        self.assertNotIn(self.paths[0], self.index.paths())
@@ -0,0 +1,165 @@
+import gzip
+import os
+import shutil
+import tempfile
+from unittest import TestCase, mock
+from astropy.io import fits
+import numpy as np
+from pyuvs.files import DataFilename, DataFilenameCollection
+from pyuvs.l1b import data
+from pyuvs.l1b.data import DataClassifier, DataCollectionClassifier
+from pyuvs.l1b.data_contents import L1bDataContents
+from pyuvs.l1b.metadata import read_l1b_summary
+
+
+def make_l1b_file(path: str, mirror_angles: np.ndarray,
+                  mcp_volt: float = 700, latitude: float = 0,
+                  et: np.ndarray = None,
+                  pixel_vector: np.ndarray = None) -> None:
+    """Write a synthetic L1b file with every HDU that pyuvs reads.
+
+    The file has one integration per mirror angle. By default the
+    integrations are 1 second apart from et 0 and every pixel looks along the
+    z-axis. pixel_vector has shape (n_integrations, 3, n_positions, 5).
+
+    """
+    n_integrations = len(mirror_angles)
+    if et is None:
+        et = np.arange(n_integrations, dtype=float)
+    if pixel_vector is None:
+        pixel_vector = np.zeros((n_integrations, 3, 4, 5))
+        pixel_vector[:, 2] = 1
+    n_positions = pixel_vector.shape[2]
+    rng = np.random.default_rng(0)
+
+    primary = fits.PrimaryHDU(np.zeros((n_integrations, n_positions, 6),
+                                       dtype='>f4'))
+    integration = fits.BinTableHDU.from_columns(
+        [fits.Column(name='et', format='D', array=et),
+         fits.Column(name='mirror_deg', format='E', array=mirror_angles)],
+        name='integration')
+    spacecraft = fits.BinTableHDU.from_columns(
+        [fits.Column(name='vx_instrument_inertial', format='3D',
+                     array=rng.normal(size=(n_integrations, 3))),
+         fits.Column(name='v_spacecraft_rate_inertial', format='3D',
+                     array=rng.normal(size=(n_integrations, 3)))],
+        name='spacecraftgeometry')
+    pixel = fits.BinTableHDU.from_columns(
+        [fits.Column(name='pixel_corner_lat', format=f'{5 * n_positions}D',
+                     dim=f'(5,{n_positions})',
+                     array=np.full((n_integrations, n_positions, 5),
+                                   latitude)),
+         fits.Column(name='pixel_vec', format=f'{15 * n_positions}D',
+                     dim=f'(5,{n_positions},3)', array=pixel_vector)],
+        name='pixelgeometry')
+    observation = fits.BinTableHDU.from_columns(
+        [fits.Column(name='mcp_volt', format='E', array=[mcp_volt])],
+        name='observation')
+    fits.HDUList([primary, integration, spacecraft, pixel,
+                  observation]).writeto(path)
+
+
+class TestReadL1bSummary(TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.relay_path = self.make_path('20160708T071910')
+        make_l1b_file(self.relay_path,
+                      np.array([30.2508544921875, 45, 59.6502685546875]),
+                      900, np.nan)
+        self.dayside_path = self.make_path('20160708T071911')
+        make_l1b_file(self.dayside_path, np.array([50.]), 700, 10)
+        with open(self.dayside_path, 'rb') as file, \
+                gzip.open(f'{self.dayside_path}.gz', 'wb') as gzipped_file:
+            shutil.copyfileobj(file, gzipped_file)
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def make_path(self, timestamp: str) -> str:
+        return os.path.join(self.directory.name,
+                            f'mvn_iuv_l1b_apoapse-orbit03453-muv_{timestamp}_'
+                            f'v13_r01.fits')
+
+    def assert_summary_matches_classifier(self, path: str) -> None:
+        summary = read_l1b_summary(DataFilename(path))
+        with L1bDataContents(DataFilename(path)) as contents:
+            classifier = DataClassifier(contents)
+            for method in ['beta_flip', 'dayside', 'geometry', 'relay',
+                           'single_integration']:
+                self.assertEqual(getattr(classifier, method)(),
+                                 getattr(summary, method)())
+
+    def test_relay_summary_matches_classifier(self) -> None:
+        self.assert_summary_matches_classifier(self.relay_path)
+
+    def test_dayside_summary_matches_classifier(self) -> None:
+        self.assert_summary_matches_classifier(self.dayside_path)
+
+    def test_gzipped_summary_matches_classifier(self) -> None:
+        self.assert_summary_matches_classifier(f'{self.dayside_path}.gz')
+
+    def test_summary_has_mirror_scan_extent(self) -> None:
+        summary = read_l1b_summary(DataFilename(self.relay_path))
+        self.assertEqual(3, summary.n_integrations)
+        self.assertEqual(30.2508544921875, summary.first_mirror_angle)
+        self.assertEqual(59.6502685546875, summary.last_mirror_angle)
+
+    def test_missing_hdu_raises_value_error(self) -> None:
+        with fits.open(self.dayside_path) as hdulist:
+            fits.HDUList(hdulist[:3]).writeto(self.relay_path,
+                                              overwrite=True)
+        with self.assertRaises(ValueError):
+            read_l1b_summary(DataFilename(self.relay_path))
+
+    def test_empty_table_raises_value_error(self) -> None:
+        with fits.open(self.dayside_path) as hdulist:
+            observation = fits.BinTableHDU.from_columns(
+                [fits.Column(name='mcp_volt', format='E', array=[])],
+                name='observation')
+            fits.HDUList(hdulist[:4] + [observation]).writeto(
+                self.relay_path, overwrite=True)
+        with self.assertRaises(ValueError):
+            read_l1b_summary(DataFilename(self.relay_path))
+
+
+class TestDataCollectionClassifier(TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        # Two swaths: the mirror restarts below where the second file ended
+        scans = [(np.linspace(30, 40, 3), 700), (np.linspace(40, 50, 3), 900),
+                 (np.linspace(31, 45, 3), 900), (np.linspace(45, 60, 3), 900)]
+        paths = []
+        for index, (mirror_angles, mcp_volt) in enumerate(scans):
+            path = os.path.join(self.directory.name,
+                                f'mvn_iuv_l1b_apoapse-orbit03453-muv_'
+                                f'20160708T07191{index}_v13_r01.fits')
+            make_l1b_file(path, mirror_angles, mcp_volt, 10)
+            paths.append(path)
+        self.files = DataFilenameCollection(paths)
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_swath_number_matches_mirror_scans(self) -> None:
+        self.assertEqual([0, 0, 1, 1],
+                         DataCollectionClassifier(self.files).swath_number())
+
+    def test_classifications_have_one_value_per_file(self) -> None:
+        classifier = DataCollectionClassifier(self.files)
+        self.assertEqual([True, False, False, False], classifier.dayside())
+        self.assertTrue(classifier.all_geometry())
+        self.assertFalse(classifier.any_relay())
+
+    def test_each_file_is_read_once(self) -> None:
+        with mock.patch.object(data, 'read_l1b_summary',
+                               wraps=data.read_l1b_summary) as reader:
+            DataCollectionClassifier(self.files).swath_number()
+            DataCollectionClassifier(self.files).dayside()
+            DataCollectionClassifier(self.files).geometry()
+        self.assertEqual(4, reader.call_count)
+
+    def test_any_stops_at_first_match(self) -> None:
+        with mock.patch.object(data, 'read_l1b_summary',
+                               wraps=data.read_l1b_summary) as reader:
+            self.assertTrue(DataCollectionClassifier(self.files).any_dayside())
+        self.assertEqual(1, reader.call_count)
@@ -0,0 +1,234 @@
+import importlib.util
+import os
+import tempfile
+from unittest import TestCase, skipIf
+import numpy as np
+from pyuvs.constants import kR, pixel_omega
+from pyuvs.l1b.mlr import BatchedMLRFitter, CalibrationCurve, MLRFitter, \
+    OrbitMLRRetrieval, TemplateMatrix, _retrieve_file, \
+    detector_calibration_curve, nightside_muv_template_matrix
+
+
+class TestBatchedMLRFitter(TestCase):
+    def setUp(self) -> None:
+        rng = np.random.default_rng(1234)
+        self.n_integrations = 4
+        self.n_positions = 3
+        self.n_wavelengths = 30
+        self.templates = rng.random((3, self.n_wavelengths))
+        self.template_names = ['a', 'b', 'c']
+        coefficients = rng.random((self.n_integrations, self.n_positions, 3))
+        self.spectra = coefficients @ self.templates + 0.1 + \
+            rng.normal(scale=0.05, size=(self.n_integrations,
+                                         self.n_positions, self.n_wavelengths))
+        self.uncertainty = rng.random(self.spectra.shape) + 0.5
+        self.calibration = rng.random((self.n_positions,
+                                       self.n_wavelengths)) + 1
+        self.matrix = TemplateMatrix(self.templates, self.template_names)
+        self.fit = BatchedMLRFitter(self.spectra, self.uncertainty,
+                                    self.matrix)
+
+
+class TestBatchedMLRFitterShapes(TestBatchedMLRFitter):
+    def test_coefficients_have_one_value_per_feature(self) -> None:
+        self.assertEqual((self.n_integrations, self.n_positions, 4),
+                         self.fit.fit_coefficients.shape)
+
+    def test_residuals_match_spectra_shape(self) -> None:
+        self.assertEqual(self.spectra.shape, self.fit.fit_residuals.shape)
+
+    def test_template_names_start_with_constant(self) -> None:
+        self.assertEqual(['constant', 'a', 'b', 'c'],
+                         list(self.fit.template_names))
+
+    def test_integrated_intensity_excludes_constant(self) -> None:
+        intensity = self.fit.get_integrated_intensity(self.calibration, 2)
+        self.assertEqual((self.n_integrations, self.n_positions, 3),
+                         intensity.shape)
+
+    def test_mismatched_uncertainty_raises_value_error(self) -> None:
+        with self.assertRaises(ValueError):
+            BatchedMLRFitter(self.spectra, self.uncertainty[..., :-1],
+                             self.matrix)
+
+
+class TestBatchedMLRFitterBadPixels(TestBatchedMLRFitter):
+    def test_non_finite_spectrum_gives_nan_without_affecting_others(self) \
+            -> None:
+        spectra = np.copy(self.spectra)
+        spectra[1, 2, 5] = np.nan
+        fit = BatchedMLRFitter(spectra, self.uncertainty, self.matrix)
+        self.assertTrue(np.all(np.isnan(fit.fit_coefficients[1, 2])))
+        np.testing.assert_allclose(self.fit.fit_coefficients[0],
+                                   fit.fit_coefficients[0])
+
+
+class TestBatchedMLRFitterUniformUncertainty(TestBatchedMLRFitter):
+    def setUp(self) -> None:
+        super().setUp()
+        self.uniform = np.copy(self.uncertainty)
+        self.uniform[0] = 0.7
+        self.uniform_fit = BatchedMLRFitter(self.spectra, self.uniform,
+                                            self.matrix)
+
+    def test_coefficients_match_least_squares(self) -> None:
+        design = self.matrix.design
+        for j in range(self.n_positions):
+            expected = np.linalg.lstsq(design, self.spectra[0, j],
+                                       rcond=None)[0]
+            np.testing.assert_allclose(
+                expected, self.uniform_fit.fit_coefficients[0, j])
+
+    def test_uncertainties_match_ordinary_least_squares(self) -> None:
+        design = self.matrix.design
+        residuals = self.uniform_fit.fit_residuals[0]
+        scale = np.sum(residuals ** 2, axis=-1) / \
+            (self.n_wavelengths - design.shape[1])
+        expected = np.sqrt(np.diag(np.linalg.inv(design.T @ design)) *
+                           scale[:, np.newaxis])
+        np.testing.assert_allclose(expected,
+                                   self.uniform_fit.fit_uncertainties[0])
+
+    def test_weighted_spectra_are_unaffected(self) -> None:
+        np.testing.assert_allclose(self.fit.fit_coefficients[1:],
+                                   self.uniform_fit.fit_coefficients[1:])
+        np.testing.assert_allclose(self.fit.fit_uncertainties[1:],
+                                   self.uniform_fit.fit_uncertainties[1:])
+
+
+@skipIf(importlib.util.find_spec('statsmodels') is None,
+        'statsmodels is needed for the reference fit.')
+class TestBatchedMLRFitterMatchesReference(TestBatchedMLRFitter):
+    def test_every_pixel_matches_statsmodels(self) -> None:
+        for i in range(self.n_integrations):
+            for j in range(self.n_positions):
+                reference = MLRFitter(self.spectra[i, j],
+                                      self.uncertainty[i, j], self.templates,
+                                      self.template_names)
+                np.testing.assert_allclose(reference.fit_coefficients,
+                                           self.fit.fit_coefficients[i, j])
+                np.testing.assert_allclose(reference.fit_uncertainties,
+                                           self.fit.fit_uncertainties[i, j])
+                np.testing.assert_allclose(reference.fit_residuals,
+                                           self.fit.fit_residuals[i, j],
+                                           atol=1e-12)
+                np.testing.assert_allclose(reference.fit_rsquared,
+                                           self.fit.fit_rsquared[i, j])
+                np.testing.assert_allclose(
+                    reference.get_integrated_intensity(self.calibration[j], 2),
+                    self.fit.get_integrated_intensity(self.calibration, 2)[i, j])
+
+
+class TestTemplateMatrix(TestCase):
+    def setUp(self) -> None:
+        self.templates = np.random.default_rng(1234).random((3, 30))
+        self.matrix = TemplateMatrix(self.templates, ['a', 'b', 'c'])
+
+    def test_design_starts_with_constant(self) -> None:
+        np.testing.assert_equal(1, self.matrix.design[:, 0])
+        np.testing.assert_equal(self.templates.T, self.matrix.design[:, 1:])
+
+    def test_gram_factors_give_unweighted_gram_matrix(self) -> None:
+        gram = np.ones((1, 30)) @ self.matrix.gram_factors
+        np.testing.assert_allclose(self.matrix.design.T @ self.matrix.design,
+                                   gram.reshape(4, 4))
+
+    def test_pseudo_inverse_inverts_design(self) -> None:
+        np.testing.assert_allclose(
+            np.eye(4), self.matrix.pseudo_inverse @ self.matrix.design,
+            atol=1e-12)
+
+    def test_normalized_covariance_inverts_gram_matrix(self) -> None:
+        gram = self.matrix.design.T @ self.matrix.design
+        np.testing.assert_allclose(
+            np.eye(4), self.matrix.normalized_covariance @ gram, atol=1e-10)
+
+    def test_arrays_are_read_only(self) -> None:
+        with self.assertRaises(ValueError):
+            self.matrix.design[0, 0] = 2
+
+    def test_mismatched_names_raises_value_error(self) -> None:
+        with self.assertRaises(ValueError):
+            TemplateMatrix(self.templates, ['a', 'b'])
+
+
+class TestNightsideMUVTemplateMatrix(TestCase):
+    def test_same_binning_shares_matrix(self) -> None:
+        self.assertIs(nightside_muv_template_matrix(4, 0, 20, 0.65),
+                      nightside_muv_template_matrix(4, 0, 20, 0.65))
+
+    def test_templates_are_sliced_to_data(self) -> None:
+        matrix = nightside_muv_template_matrix(4, 40, 20, 0.65)
+        self.assertEqual((7, 20), matrix.templates.shape)
+
+    def test_rebinned_templates_are_normalized(self) -> None:
+        matrix = nightside_muv_template_matrix(4, 0, 255, 0.65)
+        np.testing.assert_allclose(
+            1, np.sum(matrix.templates * 0.65, axis=-1))
+
+
+class TestDetectorCalibrationCurve(TestCase):
+    def setUp(self) -> None:
+        self.settings = {'channel': 'muv', 'spatial_bin_width': 16,
+                         'detector_gain': 400.0, 'integration_time': 4.2,
+                         'wavelength_width': 0.65,
+                         'wavelengths': np.linspace(180, 300, 60).reshape(3, 20)
+                         + np.arange(3)[:, None]}
+        self.sensitivity = {'wavelength': np.linspace(170, 320, 50),
+                            'sensitivity': np.linspace(0.1, 0.5, 50)}
+
+    def test_curve_matches_interpolating_each_position(self) -> None:
+        curve = CalibrationCurve(self.settings, self.sensitivity)
+        effective_area = np.array(
+            [np.interp(f, self.sensitivity['wavelength'],
+                       self.sensitivity['sensitivity'])
+             for f in self.settings['wavelengths']])
+        np.testing.assert_allclose(
+            0.65 * 400 * 4.2 * kR * effective_area * pixel_omega * 16,
+            curve.detector_calibration)
+
+    def test_same_settings_share_curve(self) -> None:
+        settings = dict(self.settings)
+        settings['wavelengths'] = np.copy(settings['wavelengths'])
+        self.assertIs(detector_calibration_curve(self.settings),
+                      detector_calibration_curve(settings))
+
+    def test_curve_has_shape_of_wavelengths(self) -> None:
+        self.assertEqual((3, 20),
+                         detector_calibration_curve(self.settings).shape)
+
+
+class TestOrbitMLRRetrieval(TestCase):
+    def setUp(self) -> None:
+        products = ('aurora_radiance', 'aurora_uncertainty',
+                    'no_nightglow_radiance', 'no_nightglow_uncertainty')
+        self.retrievals = [{f: np.ones((3, 5), dtype=np.float32)
+                            for f in products},
+                           {f: np.ones((2, 4), dtype=np.float32)
+                            for f in products}]
+        self.retrieval = OrbitMLRRetrieval(3453, ['a', 'b'], self.retrievals)
+
+    def test_files_are_stacked_along_integrations(self) -> None:
+        self.assertEqual((5, 5), self.retrieval.aurora_radiance.shape)
+
+    def test_narrower_files_are_padded_with_nan(self) -> None:
+        self.assertTrue(np.all(np.isnan(
+            self.retrieval.no_nightglow_radiance[3:, 4])))
+        self.assertFalse(np.any(np.isnan(
+            self.retrieval.no_nightglow_radiance[:3])))
+
+    def test_file_index_maps_integrations_to_files(self) -> None:
+        np.testing.assert_equal([0, 0, 0, 1, 1], self.retrieval.file_index)
+
+
+class TestRetrieveFile(TestCase):
+    def test_corrupt_file_is_reported(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'mvn_iuv_l1b_apoapse-orbit03453-'
+                                           'muv_20160708T071912_v13_r01.fits')
+            with open(path, 'wb') as file:
+                file.write(b'not a fits file')
+            result_path, products, error = _retrieve_file(path)
+        self.assertEqual(path, result_path)
+        self.assertEqual({}, products)
+        self.assertNotEqual('', error)
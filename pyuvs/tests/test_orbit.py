@@ -0,0 +1,199 @@
+from datetime import datetime
+import os
+import tempfile
+from unittest import TestCase, mock
+import warnings
+import numpy as np
+import spiceypy as spice
+from pyuvs import orbit
+from pyuvs.orbit import OrbitalGeometry, OrbitTable
+from pyuvs.tests.test_geometry import furnish_test_kernels, mars_pck
+
+
+leapseconds = '''
+\\begindata
+DELTET/DELTA_T_A = 32.184
+DELTET/K = 1.657D-3
+DELTET/EB = 1.671D-2
+DELTET/M = ( 6.239996D0 1.99096871D-7 )
+DELTET/DELTA_AT = ( 32, @1999-JAN-1 )
+\\begintext
+'''
+
+# The elements of an eccentric MAVEN orbit with periapsis at et 0
+maven_elements = [3896., 0.4225, 1.3, 0.5, 0.3, 0., 0., 42828.37]
+maven_period = 2 * np.pi * np.sqrt((3896. / (1 - 0.4225)) ** 3 / 42828.37)
+
+
+def furnish_eccentric_orbit_kernels(directory: str) -> None:
+    """Furnish kernels with Mars on a circular orbit around a fixed Sun and
+    MAVEN on an eccentric orbit around Mars, with periapsis at et 0.
+
+    """
+    for name, text in [('naif.tls', leapseconds), ('mars.tpc', mars_pck)]:
+        with open(os.path.join(directory, name), 'w') as file:
+            file.write(text)
+        spice.furnsh(os.path.join(directory, name))
+
+    start, step, n_states = -600., 60., 2011
+    epochs = start + step * np.arange(n_states)
+    mars_angle = 2 * np.pi * epochs / (687 * 86400)
+    mars_states = np.column_stack(
+        [2.28e8 * np.cos(mars_angle), 2.28e8 * np.sin(mars_angle),
+         np.zeros(n_states), -24.1 * np.sin(mars_angle),
+         24.1 * np.cos(mars_angle), np.zeros(n_states)])
+    maven_states = np.array([spice.conics(maven_elements, f) for f in epochs])
+
+    spk = os.path.join(directory, 'eccentric.bsp')
+    handle = spice.spkopn(spk, 'test', 0)
+    end = epochs[-1]
+    spice.spkw08(handle, 10, 0, 'J2000', start, end, 'sun', 7, n_states,
+                 np.zeros((n_states, 6)), start, step)
+    spice.spkw08(handle, 499, 10, 'J2000', start, end, 'mars', 7, n_states,
+                 mars_states, start, step)
+    spice.spkw08(handle, -202, 499, 'J2000', start, end, 'maven', 7,
+                 n_states, maven_states, start, step)
+    spice.spkcls(handle)
+    spice.furnsh(spk)
+
+
+def et_to_datetime(et: float) -> datetime:
+    return spice.et2datetime(et).replace(tzinfo=None)
+
+
+class TestGetOrbitPositions(TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.directory = tempfile.TemporaryDirectory()
+        furnish_test_kernels(cls.directory.name)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        spice.kclear()
+        cls.directory.cleanup()
+
+    def get_orbit_positions(self, periapse_et: np.ndarray,
+                            apoapse_et: np.ndarray) -> np.ndarray:
+        apses = {'periapse': (np.arange(1, len(periapse_et) + 1), periapse_et),
+                 'apoapse': (np.arange(1, len(apoapse_et) + 1), apoapse_et)}
+        with mock.patch.object(OrbitalGeometry, 'find_maven_apsis_et',
+                               side_effect=lambda **kw: apses[kw['apsis']]):
+            return OrbitalGeometry().get_orbit_positions()
+
+    def test_positions_match_spice_positions(self) -> None:
+        periapse_et = np.array([2000., 5000., 8000.])
+        apoapse_et = periapse_et + 1500
+        positions = self.get_orbit_positions(periapse_et, apoapse_et)
+        fields = ['et', 'subsc_lat', 'subsc_lon', 'subsc_alt',
+                  'solar_longitude', 'subsolar_lat', 'subsolar_lon',
+                  'mars_sun_dist']
+        geometry = OrbitalGeometry()
+        for i, times in enumerate(zip(periapse_et - 1284, periapse_et,
+                                      apoapse_et)):
+            for j, et in enumerate(times):
+                expected = geometry.spice_positions(et)
+                for field, value in zip(fields, expected):
+                    self.assertAlmostEqual(value, positions[field][i, j],
+                                           msg=field)
+        np.testing.assert_array_equal([1, 2, 3], positions['orbit_number'])
+
+    def test_missing_apoapsis_is_nan(self) -> None:
+        positions = self.get_orbit_positions(np.array([2000., 5000.]),
+                                             np.array([3500.]))
+        self.assertEqual((2, 3), positions['subsc_alt'].shape)
+        self.assertTrue(np.isnan(positions['subsc_alt'][1, 2]))
+        self.assertTrue(np.all(np.isfinite(positions['subsc_alt'][:, :2])))
+
+    def test_apoapsis_before_first_periapsis_is_dropped(self) -> None:
+        positions = self.get_orbit_positions(np.array([2000., 5000.]),
+                                             np.array([500., 3500., 6500.]))
+        np.testing.assert_array_equal([3500, 6500], positions['et'][:, 2])
+
+
+class TestOrbitTable(TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.kernels = tempfile.TemporaryDirectory()
+        furnish_eccentric_orbit_kernels(cls.kernels.name)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        spice.kclear()
+        cls.kernels.cleanup()
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'orbits.npz')
+        patch = mock.patch.object(orbit, '_orbit_insertion_et', 100.)
+        patch.start()
+        self.addCleanup(patch.stop)
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_apses_are_assigned_to_orbits(self) -> None:
+        table = OrbitTable(self.path)
+        self.assertEqual(3, table.update(et_to_datetime(60000)))
+        np.testing.assert_array_equal([1, 2, 3],
+                                      table.positions['orbit_number'])
+        # The apoapsis before the first periapsis is not part of an orbit
+        np.testing.assert_allclose(
+            np.array([[1, 1.5], [2, 2.5], [3, 3.5]]) * maven_period,
+            table.positions['et'][:, 1:], atol=0.1)
+
+    def test_incremental_updates_match_one_update(self) -> None:
+        expected = OrbitTable(self.path)
+        expected.update(et_to_datetime(60000))
+
+        table = OrbitTable(os.path.join(self.directory.name, 'new.npz'))
+        table.update(et_to_datetime(20000))
+        self.assertTrue(np.isnan(table.positions['subsc_alt'][0, 2]))
+        find_apses = OrbitalGeometry.find_maven_apsis_et
+        with mock.patch.object(OrbitalGeometry, 'find_maven_apsis_et',
+                               autospec=True, side_effect=find_apses) as find:
+            self.assertEqual(2, table.update(et_to_datetime(60000)))
+        for call in find.call_args_list:
+            self.assertGreater(call.kwargs['start_et'], maven_period)
+        for field in expected.positions.dtype.names:
+            np.testing.assert_allclose(expected.positions[field],
+                                       table.positions[field], rtol=1e-6)
+
+    def test_table_matches_orbit_positions(self) -> None:
+        # The search starts just after the periapsis at et 0, so it finds an
+        # apoapsis before the first periapsis
+        table = OrbitTable(self.path)
+        table.update(et_to_datetime(60000))
+        expected = OrbitalGeometry().get_orbit_positions(
+            et_to_datetime(60000))
+        for field in expected.dtype.names:
+            np.testing.assert_array_equal(expected[field],
+                                          table.positions[field])
+
+    def test_table_is_saved(self) -> None:
+        OrbitTable(self.path).update(et_to_datetime(40000))
+        table = OrbitTable(self.path)
+        self.assertEqual(2, table.n_orbits)
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')
+            self.assertEqual(0, table.update(et_to_datetime(40000)))
+
+    def test_lookup_by_orbit_number(self) -> None:
+        table = OrbitTable(self.path)
+        table.update(et_to_datetime(60000))
+        np.testing.assert_array_equal(table.positions[[2, 0]],
+                                      table.orbit_positions([3, 1]))
+        with self.assertRaises(ValueError):
+            table.orbit_positions(4)
+
+    def test_lookup_by_et(self) -> None:
+        table = OrbitTable(self.path)
+        self.assertEqual(-1, table.orbit_at(20000))
+        table.update(et_to_datetime(60000))
+        np.testing.assert_array_equal(
+            [-1, 1, 1, 2, 3],
+            table.orbit_at(np.array([0, maven_period - 1000, maven_period,
+                                     2.5 * maven_period, 59000])))
+
+    def test_int_path_raises_type_error(self) -> None:
+        with self.assertRaises(TypeError):
+            OrbitTable(1)
@@ -0,0 +1,195 @@
+import glob
+import multiprocessing
+import os
+import tempfile
+from unittest import TestCase, mock, skipUnless
+import numpy as np
+import spiceypy as spice
+from pyuvs.files import DataFilename
+from pyuvs.graphics import quicklook_better
+from pyuvs.graphics.quicklook_better import HighResolutionGeometryCreator, \
+    SwathGeometryCache
+from pyuvs.l1b.data_contents import L1bDataContents
+from pyuvs.spice import Spice
+from pyuvs.tests.test_geometry import write_test_kernels
+from pyuvs.tests.test_metadata import make_l1b_file
+
+
+class KernelDirectorySpice(Spice):
+    """Load every kernel in a directory, in place of the IUVS kernel tree.
+
+    """
+    @staticmethod
+    def load_spice(spice_directory: str) -> None:
+        spice.kclear()
+        for kernel in sorted(glob.glob(os.path.join(spice_directory, '*'))):
+            spice.furnsh(kernel)
+
+
+def mars_pixel_vectors(et: np.ndarray, n_positions: int) -> np.ndarray:
+    # Point the pixels across Mars, sweeping the slit with time
+    n_integrations = len(et)
+    mars = spice.spkpos('MARS', et, 'IAU_MARS', 'LT+S', 'MAVEN')[0]
+    center = mars / np.linalg.norm(mars, axis=-1, keepdims=True)
+    along = np.cross(center, [0, 0, 1])
+    along /= np.linalg.norm(along, axis=-1, keepdims=True)
+    across = np.cross(along, center)
+    edges = np.tan(np.radians(np.linspace(-25, 25, n_positions + 1)))
+    sweep = np.linspace(-0.3, 0.3, n_integrations)
+    pixel_vector = np.zeros((n_integrations, 3, n_positions, 5))
+    for corner, (edge, offset) in enumerate(
+            [(0, -0.01), (0, 0.01), (1, -0.01), (1, 0.01)]):
+        pixel_vector[:, :, :, corner] = np.moveaxis(
+            center[:, np.newaxis, :] +
+            edges[np.newaxis, edge:n_positions + edge, np.newaxis] *
+            along[:, np.newaxis, :] +
+            (sweep[:, np.newaxis, np.newaxis] + offset) *
+            across[:, np.newaxis, :], -1, 1)
+    return pixel_vector
+
+
+class TestSwathGeometry(TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.kernels = os.path.join(self.directory.name, 'kernels')
+        os.mkdir(self.kernels)
+        write_test_kernels(self.kernels)
+        patch = mock.patch.object(quicklook_better, 'Spice',
+                                  KernelDirectorySpice)
+        patch.start()
+        self.addCleanup(patch.stop)
+
+        KernelDirectorySpice.load_spice(self.kernels)
+        self.files = []
+        for index in range(3):
+            path = os.path.join(self.directory.name,
+                                f'mvn_iuv_l1b_apoapse-orbit03453-muv_'
+                                f'20160708T07191{index}_v13_r01.fits')
+            et = np.linspace(0, 600, 8) + 1000 * index
+            make_l1b_file(path, np.linspace(30, 60, 8), et=et,
+                          pixel_vector=mars_pixel_vectors(et, 4))
+            self.files.append(DataFilename(path))
+        # The maps only need to have the right shape to be sampled
+        self.geography_map = np.arange(1800 * 3600, dtype=np.float32)\
+            .reshape((1800, 3600, 1))
+
+    def tearDown(self) -> None:
+        spice.kclear()
+        self.directory.cleanup()
+
+    def make_creator(self, n_workers: int, **kwargs) \
+            -> HighResolutionGeometryCreator:
+        return HighResolutionGeometryCreator(
+            self.kernels, self.geography_map, self.geography_map, 20, False,
+            n_workers=n_workers, **kwargs)
+
+
+@skipUnless(multiprocessing.get_start_method() == 'fork',
+            'Workers only see the patched SPICE loader when they are forked')
+class TestSwathGeometries(TestSwathGeometry):
+    def test_workers_match_single_file_geometry(self) -> None:
+        geometries = self.make_creator(2).swath_geometries(self.files)
+        creator = self.make_creator(1)
+        for filename, geometry in zip(self.files, geometries):
+            with L1bDataContents(filename) as file:
+                expected = creator.swath_geometry(file)
+            for name in ['latitude', 'local_time', 'solar_zenith_angle',
+                         'geography_map', 'x', 'cy']:
+                np.testing.assert_allclose(getattr(expected, name),
+                                           getattr(geometry, name),
+                                           rtol=1e-6)
+                self.assertEqual(np.float32, getattr(geometry, name).dtype)
+        self.assertTrue(np.any(np.isfinite(geometries[0].latitude)))
+
+    def test_single_process_matches_workers(self) -> None:
+        sequential = self.make_creator(1).swath_geometries(self.files)
+        parallel = self.make_creator(2).swath_geometries(self.files)
+        for expected, geometry in zip(sequential, parallel):
+            np.testing.assert_array_equal(expected.emission_angle,
+                                          geometry.emission_angle)
+
+
+class TestDefaultWorkers(TestSwathGeometry):
+    def test_geometry_is_computed_in_this_process(self) -> None:
+        creator = HighResolutionGeometryCreator(
+            self.kernels, self.geography_map, self.geography_map, 20, False)
+        with mock.patch.object(quicklook_better, 'Pool',
+                               side_effect=AssertionError):
+            geometries = creator.swath_geometries(self.files)
+        self.assertEqual(len(self.files), len(geometries))
+
+
+class TestSwathGeometryCache(TestSwathGeometry):
+    def setUp(self) -> None:
+        super().setUp()
+        self.cache_directory = os.path.join(self.directory.name, 'cache')
+
+    def test_cached_geometry_matches_computed_geometry(self) -> None:
+        computed = self.make_creator(
+            1, cache_directory=self.cache_directory).swath_geometries(
+            self.files)
+        with mock.patch.object(quicklook_better,
+                               '_single_precision_swath_geometry') as compute:
+            cached = self.make_creator(
+                1, cache_directory=self.cache_directory).swath_geometries(
+                self.files)
+            compute.assert_not_called()
+        for expected, geometry in zip(computed, cached):
+            for name in ['latitude', 'phase_angle', 'geography_map', 'y']:
+                np.testing.assert_array_equal(getattr(expected, name),
+                                              getattr(geometry, name))
+                self.assertEqual(np.float32, getattr(geometry, name).dtype)
+
+    def test_byte_maps_are_stored_as_bytes(self) -> None:
+        self.geography_map = (self.geography_map % 256).astype(np.uint8)
+        computed = self.make_creator(
+            1, cache_directory=self.cache_directory).swath_geometries(
+            self.files[:1])[0]
+        cache = SwathGeometryCache(self.cache_directory, self.geography_map,
+                                   self.geography_map, 20, False)
+        entry = np.load(glob.glob(os.path.join(
+            self.cache_directory, 'swath_geometry', '*', '*.npz'))[0])
+        self.assertEqual(np.uint8, entry['geography_map'].dtype)
+        np.testing.assert_array_equal(
+            computed.geography_map, cache.load(self.files[0]).geography_map)
+
+    def test_different_settings_miss_the_cache(self) -> None:
+        cache = SwathGeometryCache(self.cache_directory, self.geography_map,
+                                   self.geography_map, 20, False)
+        flipped = SwathGeometryCache(self.cache_directory,
+                                     self.geography_map, self.geography_map,
+                                     20, True)
+        self.make_creator(1, cache_directory=self.cache_directory)\
+            .swath_geometries(self.files[:1])
+        self.assertIsNotNone(cache.load(self.files[0]))
+        self.assertIsNone(flipped.load(self.files[0]))
+
+    def test_different_kernels_miss_the_cache(self) -> None:
+        cache = SwathGeometryCache(self.cache_directory, self.geography_map,
+                                   self.geography_map, 20, False)
+        spice.unload(os.path.join(self.kernels, 'mars.tpc'))
+        unloaded = SwathGeometryCache(self.cache_directory,
+                                      self.geography_map,
+                                      self.geography_map, 20, False)
+        self.assertNotEqual(cache.key(self.files[0]),
+                            unloaded.key(self.files[0]))
+
+
+class TestAdaptiveSwathGeometry(TestSwathGeometry):
+    def test_adaptive_geometry_matches_exact_geometry(self) -> None:
+        exact = self.make_creator(1).swath_geometries(self.files)
+        adaptive = self.make_creator(1, adaptive=True).swath_geometries(
+            self.files)
+        for expected, geometry in zip(exact, adaptive):
+            np.testing.assert_allclose(expected.emission_angle,
+                                       geometry.emission_angle, atol=0.01)
+
+    def test_adaptive_geometry_is_cached_separately(self) -> None:
+        directory = os.path.join(self.directory.name, 'cache')
+        exact = SwathGeometryCache(directory, self.geography_map,
+                                   self.geography_map, 20, False)
+        adaptive = SwathGeometryCache(directory, self.geography_map,
+                                      self.geography_map, 20, False,
+                                      adaptive=True)
+        self.assertNotEqual(exact.key(self.files[0]),
+                            adaptive.key(self.files[0]))